@@ -1,35 +1,70 @@
 from flask import Flask, render_template, request, jsonify
 import pandas as pd
-import requests
 import numpy as np
-# import list of nba teams
-from nba_api.stats.static import teams
-# import endpoints to retrieve team info
-from nba_api.stats.endpoints import teaminfocommon, commonteamroster, boxscoresummaryv2
-# import list of NBA players
-from nba_api.stats.static import players
-# import endpoints to retrieve player stats
-from nba_api.stats.endpoints import commonplayerinfo, playergamelog
+# import the shared team registry (lookups + precomputed logo filenames)
+from team_registry import get_team_by_abbr, get_team_by_full_name, build_logo_filename
+# import cached wrappers around the nba_api endpoints (team info, rosters, player info, game logs)
+from nba_api_cache import get_common_player_info, get_player_game_log, get_team_info_common, get_common_team_roster, get_nba_api_cache_stats
 # import datetime
 from datetime import timezone, datetime, UTC
-# import zoneinfo
+# import zoneinfo for eastern dates
 from zoneinfo import ZoneInfo
+# import bisect to search sorted tip-off times
+from bisect import bisect_left
 from sklearn.linear_model import LogisticRegression
-from scipy.stats import norm
+# import the bulk player directory (team + position for every player)
+from player_directory import get_players_page, PLAYERS_PAGE_SIZE
+# import the player name search index
+from player_search import search_players
+# import the model registry (versioned, persisted model artifacts)
+from model_registry import get_latest_model, get_or_train_model, hash_training_data
+# import the shared thread pool for parallel upstream fetches
+from fetch_pool import fetch_in_parallel
+# import the shared in-memory game log
+from game_log_store import (
+    get_game_log, preload_game_log, get_team_games,
+    get_last_n_matchup_games, get_latest_game_date,
+)
+# import the season partitioned history store (only the seasons a page needs are read)
+from history_store import has_history, read_team_history
+# import the vectorized player prop engine
+from prop_engine import PROP_STATS, build_stat_matrix, price_props
+# import the league-wide player game log table ((player, opponent) lookups without upstream calls)
+from player_game_logs import has_player_game_logs, get_player_last_n_vs_opponent_logs, preload_player_game_logs
+# import the single-flight layer (identical concurrent requests share one computation)
+from single_flight import single_flight, get_single_flight_stats
+# import the response cache (per route ttl, ETag / 304, dropped when a team's games or the model change)
+from response_cache import cached_response, get_response_cache_stats
+# import the upstream client counters for the stats route
+from upstream_client import get_upstream_client_stats
+# import the cached nba cdn schedule
+from schedule_cache import get_schedule_index, schedule_cache_stats
+# import the blend that turns model, head-to-head, home court and rest into percentages
+from prediction_blend import blend_weights, convert_rest_difference_to_bump, blend_home_away_probabilities
+# import the precomputed rolling form / rest / head-to-head table
+from team_form import (
+    FORM_STATS, get_team_form_table, get_team_form, get_head_to_head_win_rate, get_rest_days,
+    get_latest_team_forms, get_latest_head_to_head,
+)
 
 # creates the flask app
 app = Flask(__name__)
 
+# parse the game log csv (and the player game log table, if built) once at startup instead of on every request
+preload_game_log()
+preload_player_game_logs()
+
 # print(df.columns)
-# this keeps the trained model memory so we dont retrain every click
-model_cache = {"clf": None}
+# name the team win model is published under in the model registry
+TEAM_WIN_MODEL = "team_win"
+# this keeps the hash of the training data for the game log currently loaded
+training_data_hash = {"df": None, "hash": None}
 
 # this function will get the player averages for ppg, tpg and apg for their current team
 def get_player_average(player_id):
     try:
         # find out players current team using id and abbr
-        info = commonplayerinfo.CommonPlayerInfo(player_id=player_id)
-        df_info = info.get_data_frames()[0]
+        df_info = get_common_player_info(player_id)[0]
 
         # extracts players current team id and abbr from profile info
         team_id = df_info.at[0, 'TEAM_ID']
@@ -45,18 +80,12 @@ def get_player_average(player_id):
         # this list will hold the dataframes from each season
         frames = []
 
-        # loop through each season
-        for s in seasons:
-            try:
-                # fetch players game log
-                gamelog = playergamelog.PlayerGameLog(player_id=player_id, season=s)
-                df_gamelog = gamelog.get_data_frames()[0]
-
-                # appends it if data exists
-                if df_gamelog is not None and not df_gamelog.empty:
-                    frames.append(df_gamelog)
-            except Exception:
-                continue
+        # fetch every season's game log at once, results come back in season order
+        fetched = fetch_in_parallel(lambda s: get_player_game_log(player_id, season=s)[0], [(s,) for s in seasons])
+        for df_gamelog, error in fetched:
+            # skip seasons that failed, append the rest if data exists
+            if error is None and df_gamelog is not None and not df_gamelog.empty:
+                frames.append(df_gamelog)
         
         # if no game logs were collected, return empty value
         if not frames:
@@ -93,7 +122,7 @@ def get_player_average(player_id):
 # this function will get the players team abbreviations for use when displaying upcoming games
 def get_player_team_abbreviation(player_id: int) -> str:
     try:
-        df = commonplayerinfo.CommonPlayerInfo(player_id=player_id).get_data_frames()[0]
+        df = get_common_player_info(player_id)[0]
         abbr = str(df.at[0, "TEAM_ABBREVIATION"]).strip()
         return abbr if abbr and abbr != "None" else ""
     except Exception:
@@ -110,41 +139,43 @@ def extract_opp_from_matchup(matchup: str) -> str:
     parts = matchup.strip().split()
     return parts[-1].upper() if parts else ""
 
+# the seasons and season types searched for a player's games vs an opponent
+PLAYER_VS_SEASONS = ["2024-25", "2023-24", "2022-23"]
+PLAYER_VS_SEASON_TYPES = ("Playoffs", "Regular Season")
+
+# this function returns the (player_id, season, season type) game log fetches a player's vs-opponent lookup needs
+def player_vs_opponent_tasks(player_id: int) -> list:
+    return [(player_id, season, st) for season in PLAYER_VS_SEASONS for st in PLAYER_VS_SEASON_TYPES]
+
+# this function fetches one player game log for the vs-opponent lookup (keeps the season type so we can show it)
+def fetch_player_vs_opponent_log(player_id: int, season: str, st: str):
+    df = get_player_game_log(player_id, season=season, season_type_all_star=st)[0]
+    if df is not None and not df.empty and "SEASON_TYPE" not in df.columns:
+        df = df.copy()
+        df["SEASON_TYPE"] = st
+    return df
+
 # this function will extract the players performance against the specified opponent for the last 5 matches
 def get_player_last_n_vs_opponent(player_id: int, opponent_abbr: str, n: int = 5):
-    seasons_try = ["2024-25", "2023-24", "2022-23"]
-    season_types = ("Playoffs", "Regular Season")
+    # indexed lookup in the league-wide table when it has been built (no upstream calls)
+    logs = get_player_last_n_vs_opponent_logs(player_id, opponent_abbr, n)
+    if logs is not None:
+        return format_vs_opponent_rows(logs)
+
+    # collect game logs across a couple seasons & both season types, all fetched at once
+    tasks = player_vs_opponent_tasks(player_id)
+    fetched = fetch_in_parallel(fetch_player_vs_opponent_log, tasks)
+    return select_last_n_vs_opponent(tasks, fetched, opponent_abbr, n)
+
+# this function turns fetched game logs into the last n games vs the opponent (rows for the template)
+def select_last_n_vs_opponent(tasks: list, fetched: list, opponent_abbr: str, n: int = 5):
     dfs = []
-
-    # collect game logs across a couple seasons & both season types
-    for season in seasons_try:
-        for st in season_types:
-            try:
-                gl = playergamelog.PlayerGameLog(
-                    player_id=player_id,
-                    season=season,
-                    season_type_all_star=st
-                )
-                df = gl.get_data_frames()[0]
-                if df is not None and not df.empty:
-                    # ensure we keep season type so we can show it in the table
-                    if "SEASON_TYPE" not in df.columns:
-                        df = df.copy()
-                        df["SEASON_TYPE"] = st
-                    dfs.append(df)
-                    tmp_all = pd.concat(dfs, ignore_index=True)
-                    opp_series = tmp_all["MATCHUP"].apply(extract_opp_from_matchup)
-                    if (opp_series == str(opponent_abbr).upper()).sum() >= n:
-                        raise StopIteration  # jump to except to exit both loops
-            except StopIteration:
-                break
-            except Exception as e:
-                print(f"[DEBUG] get_player_last_n_vs_opponent: error {season} {st} -> {e}")
-        else:
-            # inner loop didn't break -> continue outer
+    for (_, season, st), (df, error) in zip(tasks, fetched):
+        if error is not None:
+            print(f"[DEBUG] get_player_last_n_vs_opponent: error {season} {st} -> {error}")
             continue
-        # inner loop broke with StopIteration
-        break
+        if df is not None and not df.empty:
+            dfs.append(df)
 
     if not dfs:
         return []  # no data
@@ -171,11 +202,16 @@ def get_player_last_n_vs_opponent(player_id: int, opponent_abbr: str, n: int = 5
 
     # sort newest -> oldest and keep last N meetings vs that opponent
     vs_df = vs_df.sort_values("GAME_DATE_PARSED", ascending=False, na_position="last").head(n)
+    return format_vs_opponent_rows(vs_df)
+
+# this function shapes PlayerGameLog style rows (newest first) into the dicts the player game template shows
+def format_vs_opponent_rows(vs_df: pd.DataFrame) -> list:
+    vs_df = vs_df.copy()
 
     # format shooting % to 0–100 scale (like you do elsewhere)
     for col in ("FG_PCT", "FG3_PCT", "FT_PCT"):
         if col in vs_df.columns:
-            vs_df[col] = (vs_df[col] * 100).round(1).astype(float)
+            vs_df[col] = (vs_df[col].astype(float) * 100).round(1)
 
     # shape into list of dicts your template can loop over
     rows = []
@@ -212,30 +248,14 @@ def get_team_last_n_vs_opponent_from_csv(
     from the TEAM's perspective, using your aggregated CSV.
     Each row includes: Game Date, Matchup, Season Type, Points, Rebounds, Assists, Turnovers, Win.
     """
+    # shared game log (dates already parsed, abbreviations already uppercase)
     try:
-        df = pd.read_csv(csv_path)
+        df = get_game_log(csv_path)
     except Exception:
         return []
 
-    # normalize columns we rely on
-    for col in ["TEAM ABBR", "OPP ABBR", "GAME DATE"]:
-        if col not in df.columns:
-            return []
-
-    # coerce dates once (avoids SettingWithCopy warnings downstream)
-    df = df.copy()
-    df["GAME DATE"] = pd.to_datetime(df["GAME DATE"], errors="coerce")
-
-    # your CSV sometimes has SEASON_TYPE or "Season Type"—standardize to SEASON_TYPE
-    if "SEASON_TYPE" not in df.columns and "Season Type" in df.columns:
-        df["SEASON_TYPE"] = df["Season Type"]
-
-    # filter to this team vs this opponent
-    mask = (
-        df["TEAM ABBR"].astype(str).str.upper().eq(team_abbr.upper())
-        & df["OPP ABBR"].astype(str).str.upper().eq(opp_abbr.upper())
-    )
-    sub = df.loc[mask].sort_values("GAME DATE", ascending=False).head(n)
+    # last n games of this team vs this opponent (index lookup, newest first)
+    sub = get_last_n_matchup_games(df, team_abbr, opp_abbr, n)
 
     # build rows for template
     rows = []
@@ -262,32 +282,8 @@ def get_team_last_n_vs_opponent_from_csv(
 
 # this function will get the 2025-26 schedule for the selected team
 def get_upcoming_games(team_abbr: str, n: int = 5):
-    # url for the nba's json schedule file
-    url = "https://cdn.nba.com/static/json/staticData/scheduleLeagueV2.json"
     # makes sure abbreviation is uppercase
     team_abbr = (team_abbr or "").upper()
-    # creates timezone object for eastern time
-    ET = ZoneInfo("America/New_York")  
-
-    # this helper function takes any value and ensures its a clean string
-    def clean(val):
-        # if its not a string, return ""
-        if not isinstance(val, str):
-            return ""
-        # if its TBD, (TBD) or empty, return "" otherwise return stripped string
-        v = val.strip()
-        return "" if v in {"", "TBD", "(TBD)"} else v
-
-    # fetches json scheudle from the nba
-    try:
-        # uses user agent so nba.com doesn't reject the request, will time out if it takes more than 6 seconds
-        resp = requests.get(url, headers={"User-Agent": "Mozilla/5.0"}, timeout=6)
-        data = resp.json()
-        # game_dates will list all game blocks in upcoming season
-        game_dates = data.get("leagueSchedule", {}).get("gameDates", [])
-    except Exception as e:
-        print("[DEBUG] schedule fetch failed:", e)
-        return []
 
     # here we define the season window
     # july 1, 2025 00:00:00 to june 30, 2026 23:59:59
@@ -295,183 +291,35 @@ def get_upcoming_games(team_abbr: str, n: int = 5):
     season_end   = datetime(2026, 6, 30, 23, 59, 59, tzinfo=timezone.utc)
     now_utc = datetime.now(timezone.utc) # stores utc to filter out past games
 
+    # the schedule index already has this team's games parsed and sorted by tip off (utc)
+    index = get_schedule_index(timeout=6)
+    team_games = index["by_team"].get(team_abbr, [])
+    team_whens = index["team_whens"].get(team_abbr, [])
+
+    # binary search for the first game that is in the season window and hasn't happened yet
+    start = bisect_left(team_whens, max(season_start, now_utc))
+
     # create an empty list where we will store upcoming games for selected team
     results = []
-    # loops over each gameDate block in the json
-    for gd in game_dates:
-        # then loops over each actual game
-        for g in gd.get("games", []):
-            # safely pulls team abbr for the home and away teams
-            home_tri = ((g.get("homeTeam") or {}).get("teamTricode")) or ""
-            away_tri = ((g.get("awayTeam") or {}).get("teamTricode")) or ""
-            # makes sure they are uppercase
-            home = home_tri.upper() if isinstance(home_tri, str) else ""
-            away = away_tri.upper() if isinstance(away_tri, str) else ""
-            # skips game if home/away abbr are missing or selected team abbr is not playing
-            if not home or not away or team_abbr not in (home, away):
-                continue
-            
-            # gets the scheduled tip off time from json
-            dt_str = g.get("gameDateTimeUTC")
-            # if its not a string, skip
-            if not isinstance(dt_str, str):
-                continue
-            # convert from iso string to python datetime in utc
-            try:
-                dt_utc = datetime.fromisoformat(dt_str.replace("Z", "+00:00"))
-            except Exception:
-                continue
+    for g in team_games[start:]:
+        # stop once we leave the 2025-26 season window or have n games
+        if g["when"] > season_end or len(results) >= n:
+            break
+        results.append({**g["upcoming"], "is_home": (team_abbr == g["upcoming"]["home_abbr"])})
 
-            # skip games that are outside of 2025-26 season window or already happened
-            if not (season_start <= dt_utc <= season_end) or dt_utc < now_utc:
-                continue
-            
-            # converts from utc to eastern time
-            dt_et = dt_utc.astimezone(ET)
-            # formats date to "Month Day, Year"
-            date_et_str = dt_et.strftime("%B %d, %Y")
-
-            # figures out the type of game
-            label = clean(g.get("gameLabel"))
-            # if gameLabel is read properly we return it
-            if label:
-                game_type = label
-            # if its missing, fall back to gameId prefix or display unknown
-            else:
-                gid = str(g.get("gameId", ""))
-                prefix = gid[:3]
-                game_type = {
-                    "001": "Preseason",
-                    "002": "Regular Season",
-                    "003": "All-Star",
-                    "004": "Playoffs",
-                    "005": "Play-In",
-                }.get(prefix, "Unknown")
-
-            # get the games tip off time and arena, if missing display (TBD)
-            time_et = clean(g.get("gameStatusText")) or "(TBD)"
-            arena   = clean(g.get("arenaName")) or "(TBD)"
-
-            # get the games week number and side cup if available
-            week_name = clean(g.get("weekName"))            
-            game_sub  = clean(g.get("gameSubLabel"))        
-
-            # build descriptive label for notes (week)
-            label_for_notes = label or game_type
-            # if both label and subLabel exist, combine
-            #otherwise, if only label display only label or if none then ""
-            label_part = f"{label_for_notes} : {game_sub}" if (label_for_notes and game_sub) \
-                         else (label_for_notes if label_for_notes else "")
-
-            # combines week name and label_part into one string separated by comma
-            notes_parts = []
-            if week_name:
-                notes_parts.append(week_name)
-            if label_part:
-                notes_parts.append(label_part)
-            notes = ", ".join(notes_parts)
-
-            # build our results dictionary for this game with everything we need
-            results.append({
-                "game_id": str(g.get("gameId", "")),
-                "date": date_et_str,          
-                "time_et": time_et,           
-                "home_abbr": home,
-                "away_abbr": away,
-                "is_home": (team_abbr == home),
-                "game_type": game_type,       
-                "arena": arena,               
-                "notes": notes,               
-                "when": dt_utc,               
-            })
-
-    # sorts all of the team's games chronologically (by when utc datetime)
-    results.sort(key=lambda x: x["when"])
-    # takes only the first n games, removes the hidden when field and returns cleaned list
-    return [{k: v for k, v in r.items() if k != "when"} for r in results[:n]]
+    return results
 
 # this function will find a selected game in the 2025-26 schedule
 def find_game_in_schedule(game_id: str, timeout: float = 6.0):
-    # url for the nba's json schedule file
-    url = "https://cdn.nba.com/static/json/staticData/scheduleLeagueV2.json"
-    # creates timezone object for eastern time
-    ET = ZoneInfo("America/New_York") 
-
-    # fetches json scheudle from the nba
-    try:
-        # uses user agent so nba.com doesn't reject the request, will time out if it takes more than 6 seconds
-        resp = requests.get(url, headers={"User-Agent": "Mozilla/5.0"}, timeout=6)
-        data = resp.json()
-        # game_dates will list all game blocks in upcoming season
-        game_dates = data.get("leagueSchedule", {}).get("gameDates", [])
-    except Exception as e:
-        print("[DEBUG] schedule fetch failed:", e)
-        return []
-
-    # loops over each gameDate block in the json
-    for gd in game_dates:
-        # then loops over each actual game
-        for g in gd.get("games", []):
-            # if current game's gameId doesn't match the one we are looking for, skip it
-            if str(g.get("gameId", "")) != str(game_id):
-                continue
-
-            # extract homeTeam and awayTeam blocks from json or {} if missing
-            home = (g.get("homeTeam") or {})
-            away = (g.get("awayTeam") or {})
-
-            # builds full name of teams by combining city and name
-            home_full = f"{(home.get('teamCity') or '').strip()} {(home.get('teamName') or '').strip()}".strip()
-            away_full = f"{(away.get('teamCity')  or '').strip()} {(away.get('teamName')  or '').strip()}".strip()
-
-            # gets the scheduled tip off time from json
-            dt_et_str = ""
-            dt_utc_str = g.get("gameDateTimeUTC")
-            if isinstance(dt_utc_str, str) and dt_utc_str:
-                # convert from iso string to python datetime in utc and formats date
-                try:
-                    dt_utc = datetime.fromisoformat(dt_utc_str.replace("Z", "+00:00"))
-                    dt_et_str = dt_utc.astimezone(ET).strftime("%B %d, %Y")
-                except Exception:
-                    pass
-
-            # extract match type and week/game info
-            game_label = (g.get("gameLabel") or "").strip()        
-            game_sub   = (g.get("gameSubLabel") or "").strip()     
-            week_name  = (g.get("weekName") or "").strip()    
-
-            # builds week/game info text      
-            label_part = f"{game_label} : {game_sub}" if (game_label and game_sub) else game_label
-            notes = ", ".join([x for x in (week_name, label_part) if x])
-
-            # returns dictionary with relevant info for this game
-            return {
-                "home_full": home_full or (home.get("teamTricode") or "Home Team"),
-                "away_full": away_full or (away.get("teamTricode") or "Away Team"),
-                "home_abbr": (home.get("teamTricode") or "").upper(),
-                "away_abbr": (away.get("teamTricode") or "").upper(),
-                "arena": (g.get("arenaName") or "").strip(),
-                "date_et": dt_et_str,                         
-                "time_et_text": (g.get("gameStatusText").upper() or "").strip(),  
-                "label": game_label,
-                "sub_label": game_sub,
-                "notes": notes,
-            }
-
-    return {}
+    # constant time lookup in the schedule index
+    game = get_schedule_index(timeout=timeout)["by_id"].get(str(game_id))
+    # returns dictionary with relevant info for this game
+    return dict(game["meta"]) if game else {}
 
 # this function will load the csv into a dataframe and build a small training matrix
 def load_training_df_and_features():
-    # load our stats data 
-    df = pd.read_csv('nba_games_2023_to_2025.csv')
-
-    # ensure the GAME DATE column is datetime (we use it for sorting/rest days)
-    if not np.issubdtype(df["GAME DATE"].dtype, np.datetime64):
-        df["GAME DATE"] = pd.to_datetime(df["GAME DATE"], errors="coerce")
-
-    # convert text "Home"/"Away" to a simple numeric flag (Home=1, Away=0)
-    home_away_map = {"Home": 1, "Away": 0}
-    df["HOME_FLAG"] = df["HOME/AWAY"].map(home_away_map).fillna(0).astype(int)
+    # shared game log (GAME DATE parsed and HOME_FLAG built once at load time)
+    df = get_game_log()
 
     # features (X) and label (y)
     X = df[["POINTS", "REBOUNDS", "ASSISTS", "TURNOVERS", "HOME_FLAG"]].copy()
@@ -483,40 +331,57 @@ def load_training_df_and_features():
     y = y[mask]
     return df, X, y
 
-# this function will either train the small logistic regression model once or reuse it
-def train_or_get_cache_model():
-    # if we already have a trained model stored in model_cache, reuse it
-    if model_cache["clf"] is not None:
-        return model_cache["clf"]
-    
+# this keeps the per-team tables the slate predictor builds from the game log currently loaded
+slate_feature_cache = {"df": None, "tables": None}
+
+# this function returns a fingerprint of the current training data (recomputed only when the game log reloads)
+def get_training_data_hash() -> str:
+    df = get_game_log()
+    if training_data_hash["df"] is not df:
+        _, X, y = load_training_df_and_features()
+        training_data_hash["hash"] = hash_training_data(X, y)
+        training_data_hash["df"] = df
+    return training_data_hash["hash"]
+
+# this function will train the small logistic regression model and report how it scores on its training rows
+def train_team_win_model(X: pd.DataFrame, y: pd.Series):
+    # train new logistic regression model with up to 1000 iterations
+    clf = LogisticRegression(max_iter=1000)
+    clf.fit(X, y)
+    metrics = {
+        "training_accuracy": float((clf.predict(X) == y).mean()),
+        "training_rows": int(len(X)),
+    }
+    return clf, list(X.columns), metrics
+
+# this function returns the published model artifact, training and publishing one if the data changed
+def get_team_win_artifact():
+    # if the latest published model was trained on the current data, reuse it (one os.stat per call)
+    data_hash = get_training_data_hash()
+    artifact = get_latest_model(TEAM_WIN_MODEL)
+    if artifact is not None and artifact["data_hash"] == data_hash:
+        return artifact
+
     # otherwise load training data (features X, labels y)
     _, X, y = load_training_df_and_features()
     if len(X) < 100:
-        model_cache["clf"] = None
-        return None
-    
-    # train new logistic regression model with up to 1000 iterations
-    clf = LogisticRegression(max_iter=1000)
-    clf.fit(X,y)
-    # save it into the cache so next call can reuse it
-    model_cache["clf"] = clf
-    return clf
-
-# this function will compute averages over its last n games, return small dict with exact features
-def compute_last_n_game_averages_for_team(team_df: pd.DataFrame, n: int = 10):
-    # if the team df is empty, return none
-    if team_df.empty:
         return None
-    
-    # sort by game date descending and take the last n games
-    recent = team_df.sort_values("GAME DATE", ascending=False).head(n)
-    # return dictionary of mean values for each stat
-    return {
-        "POINTS": recent["POINTS"].mean(),
-        "REBOUNDS": recent["REBOUNDS"].mean(),
-        "ASSISTS": recent["ASSISTS"].mean(),
-        "TURNOVERS": recent["TURNOVERS"].mean(),
-    }
+    return get_or_train_model(TEAM_WIN_MODEL, data_hash, lambda: train_team_win_model(X, y))
+
+# this function will either train the small logistic regression model once or reuse it
+def train_or_get_cache_model():
+    artifact = get_team_win_artifact()
+    return artifact["model"] if artifact else None
+
+# this function returns the published team win model version (cached predictions are dropped when it changes)
+def get_team_win_model_version():
+    artifact = get_latest_model(TEAM_WIN_MODEL)
+    return artifact["version"] if artifact else None
+
+# this function returns the home and away abbreviations of a scheduled game (empty if it isn't in the schedule)
+def get_game_team_abbrs(game_id):
+    meta = find_game_in_schedule(game_id)
+    return [abbr for abbr in (meta.get("home_abbr"), meta.get("away_abbr")) if abbr]
 
 # this function converts avgs + home/away flag into models expected feature order
 def build_feature_vector_from_averages(averages, is_home_flag: int):
@@ -528,42 +393,17 @@ def build_feature_vector_from_averages(averages, is_home_flag: int):
         "HOME_FLAG": is_home_flag
     }])
 
-# this function looks at the last head-to-head games between the two teams
-def compute_head_to_head_win_rate_home_perspective(df: pd.DataFrame, home_abbr: str, away_abbr: str, meetings_to_look: int = 6) -> float:
-    # filter games where team = home_abbr and app = away_abbr
-    mask = (df["TEAM ABBR"].str.upper() == home_abbr.upper()) & (df["OPP ABBR"].str.upper() == away_abbr.upper())
-    h2h = df.loc[mask].sort_values("GAME DATE", ascending=False).head(meetings_to_look)
-
-    # if no recent games found, default to 50%
-    if h2h.empty:
-        return 0.5
-    # otherwise return the average of the win column
-    return float(h2h["WIN"].mean())
-
-# this function returns the home court advantage value
-def get_home_court_baseline_bump() -> float:
-    return 0.05 
-
-# this function returns how many full days before today the team last played
-def days_since_last_game_for_team(df: pd.DataFrame, team_abbr: str, as_of_date: pd.Timestamp) -> int:
-    # finds all games before as_of_date for the given team
-    played = df[(df["TEAM ABBR"].str.upper() == team_abbr.upper()) & (df["GAME DATE"] < as_of_date)]
-
-    # if no previous games, return 0 rest days
-    if played.empty:
-        return 0
-    
-    # find the lastest game date, normalize to midnight
-    last_game_day = played["GAME DATE"].max().normalize()
-    # subtract from as_of_date to count days of rest
-    return int((as_of_date.normalize() - last_game_day).days)
-
-# this function converts rest-days into a small probability bump for the home team
-def convert_rest_difference_to_bump(home_minus_away_days: int) -> float:
-    # clamp the value between -3 and +3 days
-    rd = max(-3, min(3, home_minus_away_days))
-    # each extra rest day add a 2% bump
-    return 0.02 * rd
+# load the published model (or train and publish one) at startup so the first prediction doesn't pay for it
+try:
+    get_team_win_artifact()
+except Exception as e:
+    print(f"[DEBUG] could not load team win model at startup -> {e}")
+
+# build the rolling form table at startup too, so predictions only look rows up
+try:
+    get_team_form_table(get_game_log())
+except Exception as e:
+    print(f"[DEBUG] could not build team form table at startup -> {e}")
 
 # route for the homepage
 @app.route('/')
@@ -577,11 +417,12 @@ def predict_page():
 
 # route for the players statistics page
 @app.route('/player_stats/<int:player_id>')
+@cached_response()
+@single_flight
 def players_stats_page(player_id):
     try:
         # get player info from the nba api
-        info = commonplayerinfo.CommonPlayerInfo(player_id=player_id)
-        df = info.get_data_frames()[0]
+        df = get_common_player_info(player_id)[0]
         player_name = df.at[0, 'DISPLAY_FIRST_LAST']
         team_name   = df.at[0, 'TEAM_NAME'] or "Free Agent"
         jersey      = df.at[0, 'JERSEY'] or "N/A"
@@ -645,30 +486,31 @@ def players_stats_page(player_id):
         seasons = ["2024-25", "2023-24"]
         dfs = [] # dataframes collected here
 
-        # this for loop will iterate through each season in seasons
-        for season in seasons:
-            # this for loop will iterate through the type of season
-            for season_type in ("Playoffs", "Regular Season"):
-                try:
-                    # asks api for players log for the given season and type
-                    gl = playergamelog.PlayerGameLog(
-                        player_id=player_id,
-                        season=season,
-                        season_type_all_star=season_type
-                    )
-
-                    # the first dataframe returned has the logs
-                    df = gl.get_data_frames()[0]
-
-                    # if we got actual data we save it
-                    if df is not None and not df.empty:
-                        # add season type column if it doesnt exist (so we know if it was playoffs or regular)
-                        if "SEASON_TYPE" not in df.columns:
-                            df = df.copy()
-                            df["SEASON_TYPE"] = season_type
-                        dfs.append(df)
-                except Exception as e:
-                    print(f"[DEBUG] Error fetching {season} {season_type}: {e}")
+        # every season and season type, fetched side by side on the shared pool
+        tasks = [(season, season_type) for season in seasons for season_type in ("Playoffs", "Regular Season")]
+        fetched = fetch_in_parallel(
+            # the first dataframe returned has the logs (served from the nba_api cache when fresh)
+            lambda season, season_type: get_player_game_log(
+                player_id,
+                season=season,
+                season_type_all_star=season_type
+            )[0],
+            tasks,
+        )
+
+        # results come back in the same order as tasks
+        for (season, season_type), (df, error) in zip(tasks, fetched):
+            if error is not None:
+                print(f"[DEBUG] Error fetching {season} {season_type}: {error}")
+                continue
+
+            # if we got actual data we save it
+            if df is not None and not df.empty:
+                # add season type column if it doesnt exist (so we know if it was playoffs or regular)
+                if "SEASON_TYPE" not in df.columns:
+                    df = df.copy()
+                    df["SEASON_TYPE"] = season_type
+                dfs.append(df)
 
         # any game logs collected we combine into one dataframe
         if dfs:
@@ -682,8 +524,7 @@ def players_stats_page(player_id):
 
         # if nothing worked above, we try calling without specifying season type
         try:
-            gl = playergamelog.PlayerGameLog(player_id=player_id)
-            df = gl.get_data_frames()[0]
+            df = get_player_game_log(player_id)[0]
             if df is not None and not df.empty:
                 return df
         except Exception:
@@ -775,7 +616,7 @@ def players_stats_page(player_id):
 def player_game_page(player_id, game_id):
     # get player name from API
     try:
-        info = commonplayerinfo.CommonPlayerInfo(player_id=player_id).get_data_frames()[0]
+        info = get_common_player_info(player_id)[0]
         player_name = str(info.at[0, "DISPLAY_FIRST_LAST"]).strip()
     except Exception:
         player_name = "Unknown Player"
@@ -787,18 +628,14 @@ def player_game_page(player_id, game_id):
     if not meta:
         return f"<h1>Game {game_id} not found in schedule</h1>"
     
-    # this function turns team name into images/team_name_logo.png
-    def build_logo_filename(team_name: str) -> str:
-        return f"images/{team_name.lower().replace(' ', '_')}_logo.png"
-
     home_name = meta["home_full"]
     away_name = meta["away_full"]
 
     home_logo = build_logo_filename(home_name)
     away_logo = build_logo_filename(away_name)
 
-    # player team + opponent team abbr
-    player_team_abbr = get_player_team_abbreviation(player_id)
+    # player team + opponent team abbr (already looked up above)
+    player_team_abbr = team_abbr
     home_abbr = meta.get("home_abbr", "")
     away_abbr = meta.get("away_abbr", "")
     opponent_abbr = away_abbr if (player_team_abbr and player_team_abbr == home_abbr) else home_abbr
@@ -828,97 +665,152 @@ def player_game_page(player_id, game_id):
         player_last5_vs_opponent=last5_vs_opp,
     )
 
-# route for predicting a player's performance vs opponent (PTS, 3PM, REB, AST, TOV, FTM)
-@app.route("/api/player_predict/<int:player_id>/<game_id>")
-def api_player_predict(player_id, game_id):
-    # get game meta (opponent info)
-    meta = find_game_in_schedule(game_id)
-    if not meta:
-        return jsonify({"error": "game not found"}), 404
+# most props one batch request may price
+MAX_PROP_BATCH = 500
+# most distinct players one batch may price without the league-wide table (each one costs 7 upstream calls)
+MAX_PROP_BATCH_PLAYERS_WITHOUT_TABLE = 20
 
-    # determine opponent abbreviation
-    player_team_abbr = get_player_team_abbreviation(player_id)
+# this function returns the opponent of a player's team in a scheduled game
+def get_player_opponent_abbr(player_team_abbr: str, meta: dict) -> str:
     home_abbr = meta.get("home_abbr", "")
     away_abbr = meta.get("away_abbr", "")
-    opponent_abbr = away_abbr if (player_team_abbr and player_team_abbr == home_abbr) else home_abbr
+    return away_abbr if (player_team_abbr and player_team_abbr == home_abbr) else home_abbr
+
+# this function reads {stat: [lines]} or {stat: "20.5,25.5"} into float lists (raises ValueError on a bad line)
+def parse_prop_lines(raw) -> dict:
+    lines = {}
+    for stat, value in (raw or {}).items():
+        stat = str(stat).upper()
+        if stat not in PROP_STATS:
+            continue
+        values = value.split(",") if isinstance(value, str) else value
+        lines[stat] = [float(v) for v in values if str(v).strip() != ""]
+    return lines or None
 
-    # get last 5 games for this player vs this opponent
-    last5 = get_player_last_n_vs_opponent(player_id, opponent_abbr, n=5)
-    if not last5:
-        return jsonify({
-            "player_id": player_id,
-            "game_id": game_id,
-            "opponent": opponent_abbr,
-            "features": {},
-            "reason": "No recent games vs opponent"
-        })
+# this function prices props for many (player, game) pairs: every game log is fetched in one parallel batch
+# and every line for every player is priced in one array call
+def predict_player_props(props: list) -> list:
+    """
+    props is a list of {"player_id": int, "game_id": str, "lines": {stat: [lines]} or None}.
+    Returns one result per prop in the same order, shaped like /api/player_predict.
+    """
+    metas = {game_id: find_game_in_schedule(game_id) for game_id in {p["game_id"] for p in props}}
 
-    # features we want to predict
-    feature_map = {
-        "PTS": [10, 15, 20],   # thresholds for points
-        "3PM": [2, 3, 4],      # 3-pointers made
-        "REB": [5, 7, 10],     # rebounds
-        "AST": [3, 5, 7],      # assists
-        "TOV": [2, 3, 5],      # turnovers
+    # every player's team, then every player's game logs, each as one parallel batch
+    player_ids = list(dict.fromkeys(p["player_id"] for p in props))
+    team_abbrs = {
+        pid: (abbr or "")
+        for pid, (abbr, _) in zip(player_ids, fetch_in_parallel(get_player_team_abbreviation, [(pid,) for pid in player_ids]))
     }
+    # without the league-wide table, every player's game logs come from the api
+    use_table = has_player_game_logs()
+    tasks = {} if use_table else {pid: player_vs_opponent_tasks(pid) for pid in player_ids}
+    flat_tasks = [task for pid in tasks for task in tasks[pid]]
+    flat_fetched = fetch_in_parallel(fetch_player_vs_opponent_log, flat_tasks)
+    fetched = {}
+    for pid in tasks:
+        fetched[pid], flat_fetched = flat_fetched[:len(tasks[pid])], flat_fetched[len(tasks[pid]):]
+
+    results = [None] * len(props)
+    priced = []
+    for i, prop in enumerate(props):
+        pid, game_id = prop["player_id"], prop["game_id"]
+        meta = metas[game_id]
+        if not meta:
+            results[i] = {"player_id": pid, "game_id": game_id, "error": "game not found"}
+            continue
 
-    results = {}
-
-    # loop over each feature and compute probabilities
-    for feature, thresholds in feature_map.items():
-        try:
-            values = [float(row.get(feature, 0)) for row in last5 if row.get(feature) not in ("", None)]
-        except Exception:
-            values = []
-
-        if not values:
-            results[feature] = [{"condition": "N/A", "prob": "No data"}]
+        opponent_abbr = get_player_opponent_abbr(team_abbrs[pid], meta)
+        # get last 5 games for this player vs this opponent
+        if use_table:
+            last5 = format_vs_opponent_rows(get_player_last_n_vs_opponent_logs(pid, opponent_abbr, n=5))
+        else:
+            last5 = select_last_n_vs_opponent(tasks[pid], fetched[pid], opponent_abbr, n=5)
+        results[i] = {"player_id": pid, "game_id": game_id, "opponent": opponent_abbr}
+        if not last5:
+            results[i].update({"features": {}, "reason": "No recent games vs opponent"})
             continue
+        priced.append((i, build_stat_matrix(last5), prop.get("lines")))
 
-        avg = np.mean(values)
-        std = np.std(values) if np.std(values) > 0 else 1.0
+    # one array operation over every player, stat and line
+    features = price_props([m for _, m, _ in priced], [lines for _, _, lines in priced])
+    for (i, _, _), player_features in zip(priced, features):
+        results[i]["features"] = player_features
+    return results
 
-        feature_probs = []
-        for t in thresholds:
-            # probability over threshold = 1 - CDF(t)
-            p_over = 1 - norm.cdf(t, loc=avg, scale=std)
-            p_under = 1 - p_over
+# route for predicting a player's performance vs opponent (PTS, 3PM, REB, AST, TOV)
+# optional lines per stat in the query string, ex. ?PTS=20.5,25.5&REB=8.5 (other stats use the defaults)
+@app.route("/api/player_predict/<int:player_id>/<game_id>")
+@cached_response()
+@single_flight
+def api_player_predict(player_id, game_id):
+    try:
+        lines = parse_prop_lines({stat: request.args[stat] for stat in PROP_STATS if stat in request.args})
+    except ValueError:
+        return jsonify({"error": "lines must be numbers"}), 400
+
+    result = predict_player_props([{"player_id": player_id, "game_id": game_id, "lines": lines}])[0]
+    if "error" in result:
+        return jsonify({"error": result["error"]}), 404
+    return jsonify(result)
+
+# route for pricing many props in one call (a whole roster or a whole slate)
+# body: {"props": [{"player_id": 2544, "game_id": "0022500001", "lines": {"PTS": [24.5]}}, ...]}
+#   or: {"game_id": "0022500001", "player_ids": [2544, 201939], "lines": {"PTS": [24.5]}}
+@app.route("/api/player_predict_batch", methods=["POST"])
+def api_player_predict_batch():
+    body = request.get_json(silent=True) or {}
+    try:
+        if "props" in body:
+            props = [
+                {"player_id": int(p["player_id"]), "game_id": str(p["game_id"]), "lines": parse_prop_lines(p.get("lines"))}
+                for p in body["props"]
+            ]
+        else:
+            lines = parse_prop_lines(body.get("lines"))
+            props = [{"player_id": int(pid), "game_id": str(body["game_id"]), "lines": lines} for pid in body.get("player_ids", [])]
+    except (KeyError, TypeError, ValueError, AttributeError):
+        return jsonify({"error": "expected props: [{player_id, game_id, lines}] or game_id + player_ids"}), 400
+
+    if len(props) > MAX_PROP_BATCH:
+        return jsonify({"error": f"at most {MAX_PROP_BATCH} props per request"}), 400
+    # without the table every player's logs come from stats.nba.com, so keep big batches from flooding it
+    players = len({p["player_id"] for p in props})
+    if players > MAX_PROP_BATCH_PLAYERS_WITHOUT_TABLE and not has_player_game_logs():
+        return jsonify({
+            "error": f"at most {MAX_PROP_BATCH_PLAYERS_WITHOUT_TABLE} players per request until the player game log table is built "
+                     "(python player_game_logs.py build)"
+        }), 400
+    return jsonify({"count": len(props), "results": predict_player_props(props)})
 
-            feature_probs.append({"condition": f"Over {t}", "prob": round(100 * p_over, 1)})
-            feature_probs.append({"condition": f"Under {t}", "prob": round(100 * p_under, 1)})
+# this function returns a team's last 20 games (newest first) and its 2024-25 games
+# (from the partitioned history store when it has been built, otherwise from the shared game log)
+def get_team_page_games(team_abbr):
+    if has_history():
+        return read_team_history(team_abbr, last_n=20), read_team_history(team_abbr, seasons=["2024-25"])
 
-        results[feature] = feature_probs
-
-    return jsonify({
-        "player_id": player_id,
-        "game_id": game_id,
-        "opponent": opponent_abbr,
-        "features": results
-    })
+    # every game for this team, oldest first (index lookup instead of a full scan)
+    team_games = get_team_games(get_game_log(), team_abbr)
+    return team_games.iloc[::-1].head(20), team_games
 
 # route for the teams statistics page
 @app.route('/team/<team_abbr>')
+@cached_response(teams=lambda team_abbr: [team_abbr.upper()])
 def team_stats(team_abbr):
-    # load our stats data 
-    df = pd.read_csv('nba_games_2023_to_2025.csv')
-
-    df['GAME DATE'] = pd.to_datetime(df['GAME DATE'], errors='coerce')
-
-    team_games = df.loc[df['TEAM ABBR'].str.upper() == team_abbr.upper()].copy()
-
-    # get static team metadata
-    nba_teams = teams.get_teams()
-    team_info = next((t for t in nba_teams if t['abbreviation'] == team_abbr.upper()), None)
+    # get static team metadata (unknown teams stop here, before any game data is read)
+    team_info = get_team_by_abbr(team_abbr)
 
     if not team_info:
-        return f"<h1>Could not find metadata for team: {team_abbr}</h1>"
+        return f"<h1>Could not find metadata for team: {team_abbr}</h1>", 404
+
+    # the last 20 games (newest first) and the 2024-25 season's games for this team
+    recent_games, season_games = get_team_page_games(team_abbr)
 
     team_id = team_info['id']
     team_name = team_info['full_name']
 
     # get detailed team info from API
-    team_details = teaminfocommon.TeamInfoCommon(team_id=team_id)
-    team_data = team_details.get_data_frames()[0]
+    team_data = get_team_info_common(team_id)[0]
 
     # extract city, conference, division, ranks
     team_city = team_data.loc[0, 'TEAM_CITY']
@@ -927,20 +819,13 @@ def team_stats(team_abbr):
     conf_rank = team_data.loc[0, 'CONF_RANK']
     div_rank = team_data.loc[0, 'DIV_RANK']
 
-    # this function turns team name into images/team_name_logo.png
-    def build_logo_filename(team_name: str) -> str:
-        return f"images/{team_name.lower().replace(' ', '_')}_logo.png"
+    logo_filename = team_info['logo_filename']
 
-    logo_filename = build_logo_filename(team_name)
-
-    if team_games.empty:
-        return f"<h1>No data found for team: {team_abbr}</h1>"
-
-    # get the last 20 games (by date)
-    recent_games = team_games.sort_values(by='GAME DATE', ascending=False).head(20)
+    if recent_games.empty:
+        return f"<h1>No data found for team: {team_abbr}</h1>", 404
 
     # extract the team name from the first matching row
-    team_name = team_games.iloc[0]['TEAM NAME']
+    team_name = recent_games.iloc[0]['TEAM NAME']
 
     # calculate averages
     avg_points = recent_games['POINTS'].mean()
@@ -969,9 +854,9 @@ def team_stats(team_abbr):
     season_start = pd.Timestamp("2024-10-22")
     season_end   = pd.Timestamp("2025-06-30")
 
-    games_2024_25 = team_games[
-        (team_games['GAME DATE'] >= season_start) &
-        (team_games['GAME DATE'] <= season_end)
+    games_2024_25 = season_games[
+        (season_games['GAME DATE'] >= season_start) &
+        (season_games['GAME DATE'] <= season_end)
     ]
 
     wins_2024_25 = games_2024_25['WIN'].sum()
@@ -981,7 +866,7 @@ def team_stats(team_abbr):
     # here we will extract the roster information
     season_str = "2024-25"
     try: 
-        latest_date = pd.to_datetime(team_games['GAME DATE']).max()
+        latest_date = recent_games['GAME DATE'].max()
         if pd.notna(latest_date):
             y = latest_date.year
             season_str = f"{y}-{str(y+1)[-2:]}" if latest_date.month >= 7 else f"{y-1}-{str(y)[-2:]}"
@@ -989,7 +874,7 @@ def team_stats(team_abbr):
         pass
 
     try:
-        roster_df = commonteamroster.CommonTeamRoster(team_id=team_id, season=season_str).get_data_frames()[0]
+        roster_df = get_common_team_roster(team_id, season_str)[0]
     except Exception:
         roster_df = pd.DataFrame()
     
@@ -1049,6 +934,8 @@ def team_stats(team_abbr):
 
 # route for the team prediction functionality
 @app.route("/api/predict/<game_id>")
+@cached_response(teams=get_game_team_abbrs, model_version=get_team_win_model_version)
+@single_flight
 def api_predict(game_id):
     # find who plays + when, from your schedule helper
     meta = find_game_in_schedule(game_id)
@@ -1062,11 +949,11 @@ def api_predict(game_id):
     home_abbr = meta.get("home_abbr", "")
     away_abbr = meta.get("away_abbr", "")
 
-    # load csv and train model if needed
-    df, X_train, y_train = load_training_df_and_features()
-    clf = train_or_get_cache_model()
+    # shared game log + published model; accuracy was measured once when the model was trained
+    df = get_game_log()
+    artifact = get_team_win_artifact()
     # if there is not enough data, return neutral 50/50 with reason
-    if clf is None:
+    if artifact is None:
         return jsonify({
             "game_id": game_id,
             "prediction": f"{home_name} vs {away_name}",
@@ -1076,14 +963,12 @@ def api_predict(game_id):
             "accuracy": None,
             "explain": {"reason": "not enough training data"}
         })
+    clf = artifact["model"]
+    training_accuracy = artifact["metrics"]["training_accuracy"]
 
-    # compute each team’s recent form (last 10 games)
-    # filter big df down to rows for each team
-    df_home = df[df["TEAM NAME"].str.lower() == home_name.lower()]
-    df_away = df[df["TEAM NAME"].str.lower() == away_name.lower()]
-    # turn those last 10 rows into averages for each stats
-    avgs_home = compute_last_n_game_averages_for_team(df_home, n=10)
-    avgs_away = compute_last_n_game_averages_for_team(df_away, n=10)
+    # each team’s recent form (last n game averages, 10 by default), looked up from the precomputed form table
+    avgs_home = get_team_form(df, home_name)
+    avgs_away = get_team_form(df, away_name)
 
     # if one team doesn't have any recent games in the csv, fall back to 50/50 with reason
     if not avgs_home or not avgs_away:
@@ -1093,7 +978,7 @@ def api_predict(game_id):
             "home_name": home_name,
             "away_name": away_name,
             "probabilities": {"home": 50.0, "away": 50.0},
-            "accuracy": float((clf.predict(X_train) == y_train).mean()),
+            "accuracy": training_accuracy,
             "explain": {"reason": "insufficient recent games for one team"}
         })
 
@@ -1105,19 +990,12 @@ def api_predict(game_id):
     p_home_win = float(clf.predict_proba(x_home)[0, 1])
     p_away_win = float(clf.predict_proba(x_away)[0, 1])
 
-    # head-to-head home team’s win rate vs this opponent over last 6 meetings
-    h2h_home_win_rate = compute_head_to_head_win_rate_home_perspective(
-        df,
-        # use abbreviations from schedule, if missing fall back to team rows we just filtered
-        home_abbr or (df_home["TEAM ABBR"].iloc[0] if not df_home.empty else ""),
-        away_abbr or (df_away["TEAM ABBR"].iloc[0] if not df_away.empty else ""),
-        meetings_to_look=6
-    )
-    # away rate is the complement
-    h2h_away_win_rate = 1.0 - h2h_home_win_rate
+    # use abbreviations from schedule, if missing fall back to the team's latest game log row
+    home_abbr = home_abbr or avgs_home["TEAM ABBR"]
+    away_abbr = away_abbr or avgs_away["TEAM ABBR"]
 
-    # constant home-court baseline (tiny tilt toward home team)
-    home_court = get_home_court_baseline_bump()
+    # head-to-head home team’s win rate vs this opponent over the last meetings (6 by default)
+    h2h_home_win_rate = get_head_to_head_win_rate(df, home_abbr, away_abbr)
 
     # rest-day bump: parse ET date; if parsing fails, fall back to latest CSV date
     try:
@@ -1125,45 +1003,20 @@ def api_predict(game_id):
     except Exception:
         as_of_date = None
     if pd.isna(as_of_date):
-        as_of_date = df["GAME DATE"].max()
+        as_of_date = get_latest_game_date(df)
 
     # compute full days since each team's previous game (positive difference favors home team)
-    home_days_rest = days_since_last_game_for_team(df, home_abbr or (df_home["TEAM ABBR"].iloc[0] if not df_home.empty else ""), as_of_date)
-    away_days_rest = days_since_last_game_for_team(df, away_abbr or (df_away["TEAM ABBR"].iloc[0] if not df_away.empty else ""), as_of_date)
+    home_days_rest = get_rest_days(df, home_abbr, as_of_date)
+    away_days_rest = get_rest_days(df, away_abbr, as_of_date)
     rest_diff = home_days_rest - away_days_rest                         # positive means HOME is more rested
     rest_bump = convert_rest_difference_to_bump(rest_diff)              # small signed bump in [-0.06, +0.06]
 
-    # blend everything together (weights are easy to adjust)
-    weight_model    = 0.80  # main signal: the small logistic regression
-    weight_h2h      = 0.15  # recent head-to-head
-    weight_homec    = 0.05  # constant home-court baseline
-    weight_rest     = 0.05  # rest days effect
-
-    blended_home = (
-        weight_model * p_home_win +             # model probability for home
-        weight_h2h   * h2h_home_win_rate +      # recent h2h for home
-        weight_homec * (0.5 + home_court) +     # turn 5% edge into 55/45 source
-        weight_rest  * (0.5 + rest_bump)        # rest bump as another small source
-    )
-    blended_away = (
-        weight_model * p_away_win +             # model probability for away
-        weight_h2h   * h2h_away_win_rate +      # recent h2h for away (complement)
-        weight_homec * (0.5 - home_court) +     # opposite of home source
-        weight_rest  * (0.5 - rest_bump)        # opposite of rest source
-    )
-
-    # normalize to exactly two buckets that sum to 100%
-    total = blended_home + blended_away
-    if total <= 0:
-        # safety fallback, shouldn't happen
-        home_pct = away_pct = 50.0
-    else:
-        home_pct = 100.0 * blended_home / total
-        away_pct = 100.0 * blended_away / total
+    # blend everything together and normalize to two buckets that sum to 100%
+    home_pct, away_pct = blend_home_away_probabilities(p_home_win, p_away_win, h2h_home_win_rate, rest_bump)
+    home_pct, away_pct = float(home_pct), float(away_pct)
 
-    # pick a label + simple training accuracy (we can replace with validation later)
+    # pick a label (training accuracy comes from the model's stored metrics)
     predicted_label = f"{home_name} wins" if home_pct >= away_pct else f"{away_name} wins"
-    training_accuracy = float((clf.predict(X_train) == y_train).mean())
 
     # respone with json the front end expects
     return jsonify({
@@ -1179,25 +1032,151 @@ def api_predict(game_id):
             "away_rest_days": int(away_days_rest),
             "rest_diff": int(rest_diff),
             "rest_bump": round(rest_bump, 3),
-            "weights": {
-                "model": weight_model,
-                "h2h": weight_h2h,
-                "home_court": weight_homec,
-                "rest": weight_rest
-            }
+            "weights": dict(blend_weights)
         }
     })
 
+# this function builds (and caches per game log) the team tables the slate predictor needs
+def get_slate_feature_tables(df: pd.DataFrame) -> dict:
+    if slate_feature_cache["df"] is df:
+        return slate_feature_cache["tables"]
+
+    # latest form and head-to-head rows come straight from the precomputed form table
+    forms = get_latest_team_forms(df)
+    tables = {
+        # last n game averages per team name
+        "form": forms[FORM_STATS],
+        # abbreviation per team name, used when the schedule is missing one
+        "abbr": forms["TEAM ABBR"],
+        # home perspective win rate over the last meetings (6 by default) for every (team, opponent) pair
+        "h2h": get_latest_head_to_head(df),
+        # every (team, game date) sorted by date for as-of rest day lookups
+        "team_dates": df[["TEAM ABBR", "GAME DATE"]].astype({"TEAM ABBR": str}).dropna().sort_values("GAME DATE", kind="stable"),
+    }
+    slate_feature_cache["tables"] = tables
+    slate_feature_cache["df"] = df
+    return tables
+
+# this function predicts many schedule games at once, returning the same fields as api_predict for each
+def predict_games_vectorized(games: list) -> list:
+    if not games:
+        return []
+
+    df = get_game_log()
+    artifact = get_team_win_artifact()
+    meta = pd.DataFrame([{**g["meta"], "game_id": g["game_id"]} for g in games])
+    home_names = meta["home_full"].tolist()
+    away_names = meta["away_full"].tolist()
+
+    # neutral 50/50 rows, same shape api_predict returns when it can't predict
+    def neutral(i, accuracy, reason):
+        return {
+            "game_id": meta.at[i, "game_id"],
+            "prediction": f"{home_names[i]} vs {away_names[i]}",
+            "home_name": home_names[i],
+            "away_name": away_names[i],
+            "probabilities": {"home": 50.0, "away": 50.0},
+            "accuracy": accuracy,
+            "explain": {"reason": reason},
+        }
+
+    if artifact is None:
+        return [neutral(i, None, "not enough training data") for i in range(len(meta))]
+    clf = artifact["model"]
+    training_accuracy = artifact["metrics"]["training_accuracy"]
+
+    tables = get_slate_feature_tables(df)
+    home_keys = meta["home_full"].str.strip().str.lower()
+    away_keys = meta["away_full"].str.strip().str.lower()
+
+    # recent form for every home and away team (NaN if a team has no games)
+    home_form = tables["form"].reindex(home_keys.values)
+    away_form = tables["form"].reindex(away_keys.values)
+    has_form = home_form.notna().all(axis=1).to_numpy() & away_form.notna().all(axis=1).to_numpy()
+
+    # abbreviations from the schedule, falling back to the game log
+    home_abbrs = meta["home_abbr"].where(meta["home_abbr"] != "", tables["abbr"].reindex(home_keys.values).fillna("").values)
+    away_abbrs = meta["away_abbr"].where(meta["away_abbr"] != "", tables["abbr"].reindex(away_keys.values).fillna("").values)
+
+    # one predict_proba call for every home row and every away row
+    X = pd.concat([
+        home_form.assign(HOME_FLAG=1),
+        away_form.assign(HOME_FLAG=0),
+    ], ignore_index=True)[artifact["features"]].fillna(0)
+    proba = clf.predict_proba(X)[:, 1]
+    p_home_win = proba[:len(meta)]
+    p_away_win = proba[len(meta):]
+
+    # head-to-head home win rate over the last meetings (50% if they never met)
+    h2h_keys = pd.MultiIndex.from_arrays([home_abbrs.values, away_abbrs.values])
+    h2h_home = tables["h2h"].reindex(h2h_keys).fillna(0.5).to_numpy(dtype=float)
+
+    # rest days: each team's last game strictly before the game's eastern date
+    as_of = pd.to_datetime(meta["date_et"], format="%B %d, %Y", errors="coerce").fillna(get_latest_game_date(df))
+    rest_days = {}
+    for side, abbrs in (("home", home_abbrs), ("away", away_abbrs)):
+        left = pd.DataFrame({"ROW": np.arange(len(meta)), "TEAM ABBR": abbrs.values, "AS_OF": as_of.values}).sort_values("AS_OF")
+        merged = pd.merge_asof(
+            left, tables["team_dates"].rename(columns={"GAME DATE": "LAST GAME"}),
+            left_on="AS_OF", right_on="LAST GAME", by="TEAM ABBR", allow_exact_matches=False,
+        ).sort_values("ROW")
+        days = (merged["AS_OF"].dt.normalize() - merged["LAST GAME"].dt.normalize()).dt.days
+        rest_days[side] = days.fillna(0).astype(int).to_numpy()
+    rest_diff = rest_days["home"] - rest_days["away"]
+    rest_bump = convert_rest_difference_to_bump(rest_diff)
+
+    # blend everything for all games at once
+    home_pct, away_pct = blend_home_away_probabilities(p_home_win, p_away_win, h2h_home, rest_bump)
+
+    results = []
+    for i in range(len(meta)):
+        if not has_form[i]:
+            results.append(neutral(i, training_accuracy, "insufficient recent games for one team"))
+            continue
+        results.append({
+            "game_id": meta.at[i, "game_id"],
+            "prediction": f"{home_names[i]} wins" if home_pct[i] >= away_pct[i] else f"{away_names[i]} wins",
+            "home_name": home_names[i],
+            "away_name": away_names[i],
+            "probabilities": {"home": round(float(home_pct[i]), 2), "away": round(float(away_pct[i]), 2)},
+            "accuracy": round(training_accuracy, 4),
+            "explain": {
+                "h2h_home": round(float(h2h_home[i]), 3),
+                "home_rest_days": int(rest_days["home"][i]),
+                "away_rest_days": int(rest_days["away"][i]),
+                "rest_diff": int(rest_diff[i]),
+                "rest_bump": round(float(rest_bump[i]), 3),
+                "weights": dict(blend_weights),
+            },
+        })
+    return results
+
+# route for predicting every game on a date (?date=YYYY-MM-DD, eastern) or the rest of the season (?scope=season)
+@app.route("/api/predict_slate")
+def api_predict_slate():
+    index = get_schedule_index(timeout=6)
+
+    if request.args.get("scope") == "season":
+        # every game from now until the end of the 2025-26 season window
+        season_end = datetime(2026, 6, 30, 23, 59, 59, tzinfo=timezone.utc)
+        start = bisect_left(index["all_whens"], datetime.now(timezone.utc))
+        games = [g for g in index["all_games"][start:] if g["when"] <= season_end]
+        slate = "season"
+    else:
+        # one eastern date, today by default
+        slate = request.args.get("date") or datetime.now(ZoneInfo("America/New_York")).strftime("%Y-%m-%d")
+        games = index["by_date"].get(slate, [])
+
+    return jsonify({"slate": slate, "count": len(games), "games": predict_games_vectorized(games)})
+
 # route for the game page
 @app.route("/game/<game_id>")
+@cached_response(teams=get_game_team_abbrs)
+@single_flight
 def game_page(game_id):
     meta = find_game_in_schedule(game_id)
     if not meta:
-        return f"<h1>No schedule data found for game {game_id}</h1>"
-
-    # logo helper
-    def build_logo_filename(team_name: str) -> str:
-        return f"images/{team_name.lower().replace(' ', '_')}_logo.png"
+        return f"<h1>No schedule data found for game {game_id}</h1>", 404
 
     home_name = meta.get("home_full", "Home Team")
     away_name = meta.get("away_full", "Away Team")
@@ -1205,15 +1184,11 @@ def game_page(game_id):
     home_abbr = meta.get("home_abbr", "")
     away_abbr = meta.get("away_abbr", "")
 
-    if not home_abbr or not away_abbr:
-        try:
-            name_to_abbr = {t["full_name"]: t["abbreviation"] for t in teams.get_teams()}
-            if not home_abbr:
-                home_abbr = name_to_abbr.get(home_name, "")
-            if not away_abbr:
-                away_abbr = name_to_abbr.get(away_name, "")
-        except Exception:
-            pass
+    # fall back to the team registry if the schedule is missing an abbreviation
+    if not home_abbr:
+        home_abbr = (get_team_by_full_name(home_name) or {}).get("abbreviation", "")
+    if not away_abbr:
+        away_abbr = (get_team_by_full_name(away_name) or {}).get("abbreviation", "")
 
     home_logo = build_logo_filename(home_name)
     away_logo = build_logo_filename(away_name)
@@ -1247,49 +1222,8 @@ def players_page():
     # read input from the search bar
     query = (request.args.get('q') or "").strip()
 
-    # calls api to return list of all active nba players
-    all_players = players.get_active_players()
-
-    # if there is a search, filter by name otherwise use all
-    if query:
-        filtered = [p for p in all_players if query.lower() in p['full_name'].lower()]
-    else:
-        filtered = all_players
-
-    # first 5 players (takes longer to load with more)
-    selected_players = filtered[:5] 
-
-    # initialize empty list to store player data
-    player_data = []
-
-    # loops through each selected player to fetch info
-    for player in selected_players:
-        player_id = player['id'] # get id
-        full_name = player['full_name'] # get full name
-
-        # try block in case api fails
-        try:
-            # get player profile info
-            info = commonplayerinfo.CommonPlayerInfo(player_id=player_id)
-            # retrieves first dataframe
-            df = info.get_data_frames()[0]
-
-            # extract team name and position
-            team_name = df.at[0, 'TEAM_NAME']
-            position = df.at[0, 'POSITION']
-        
-        # in case there's an error, display msg
-        except Exception as e:
-            team_name = "N/A"
-            position = "N/A"
-
-        # otherwise add player data into list
-        player_data.append({
-            'id': player_id,
-            'full_name': full_name,
-            'team_name': team_name,
-            'position': position
-        })
+    # first page of players, team and position come from the in-memory player directory
+    player_data = get_players_page(query, offset=0, limit=PLAYERS_PAGE_SIZE)
 
     return render_template('players.html', players=player_data, query=query)
 
@@ -1302,50 +1236,40 @@ def load_more_players():
     # read input from the search bar
     query = (request.args.get('q') or "").strip()
 
-    # get all current NBA players
-    all_players = players.get_active_players()
-
-    # if there is a search, filter by name otherwise use all
-    if query:
-        filtered = [p for p in all_players if query.lower() in p['full_name'].lower()]
-    else:
-        filtered = all_players
-
-    # get the next 5 players
-    selected_players = filtered[offset:offset + 5]
-
-    player_data = []
-
-    for player in selected_players:
-        player_id = player['id']
-        full_name = player['full_name']
-
-        try:
-            # get extra info like team and position
-            info = commonplayerinfo.CommonPlayerInfo(player_id=player_id)
-            df = info.get_data_frames()[0]
-            team_name = df.at[0, 'TEAM_NAME']
-            position = df.at[0, 'POSITION']
-        except Exception:
-            team_name = "N/A"
-            position = "N/A"
-
-        # add to our list of player info
-        player_data.append({
-            'id': player_id,
-            'full_name': full_name,
-            'team_name': team_name,
-            'position': position
-        })
+    # get the next page of players
+    player_data = get_players_page(query, offset=offset, limit=PLAYERS_PAGE_SIZE)
 
     # send the list of players back to JavaScript
     return jsonify(player_data)
 
+# route for the player search typeahead
+@app.route('/api/players/search')
+def api_players_search():
+    # read input from the search bar and how many suggestions to send back
+    query = (request.args.get('q') or "").strip()
+    # a bad limit falls back to 10, anything else is kept between 1 and a page
+    limit = max(1, min(request.args.get('limit', 10, type=int), PLAYERS_PAGE_SIZE))
+
+    # ranked matches straight from the search index (no upstream calls)
+    matches = search_players(query, offset=0, limit=limit) if query else []
+    return jsonify([{"id": p["id"], "full_name": p["full_name"]} for p in matches])
+
 # route for the teams page
 @app.route('/teams')
 def teams_page():
     return render_template('teams.html')  # this will look in the templates/ folder
 
+# route for the response cache, single-flight, upstream client and nba_api cache counters (to measure them under load)
+@app.route('/api/route_stats')
+def api_route_stats():
+    return jsonify({
+        "response_cache": get_response_cache_stats(),
+        "single_flight": get_single_flight_stats(),
+        "upstream": get_upstream_client_stats(),
+        "nba_api_cache": get_nba_api_cache_stats(),
+        "schedule_cache": dict(schedule_cache_stats),
+    })
+
 # run the application
 if __name__ == '__main__':
     app.run(debug=True)
\ No newline at end of file
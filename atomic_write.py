@@ -0,0 +1,40 @@
+# import os for temp paths, fsync and atomic renames
+import os
+# import threading so two threads of one process never share a temp file
+import threading
+
+# this function returns a temp file name next to path that no other process or thread is writing to
+def temp_path_for(path: str) -> str:
+    return f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+
+# this function writes a file by writing a temp file first and renaming it over the target
+def atomic_write(path: str, write_fn) -> None:
+    """
+    write_fn(tmp_path) writes the whole file; readers see either the old file
+    or the new one, never a half-written one. The temp file is removed if
+    anything fails.
+    """
+    tmp_path = temp_path_for(path)
+    try:
+        write_fn(tmp_path)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+# this function atomically writes a text file (flushed to disk before the rename)
+def atomic_write_text(path: str, text: str) -> None:
+    def write(tmp_path):
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(text)
+            f.flush()
+            os.fsync(f.fileno())
+    atomic_write(path, write)
+
+# this function atomically writes a dataframe as parquet or csv (picked from the file extension)
+def atomic_write_frame(df, path: str) -> None:
+    if path.endswith(".parquet"):
+        atomic_write(path, lambda p: df.to_parquet(p, index=False))
+    else:
+        atomic_write(path, lambda p: df.to_csv(p, index=False))
@@ -0,0 +1,234 @@
+# import sys to read an optional csv path from the command line
+import sys
+# import time to report how long the replay and sweeps take
+import time
+# import itertools to build a weight grid for the sweep demo
+import itertools
+# import copy to keep each refit's model
+import copy
+# import numpy for the vectorized scoring
+import numpy as np
+# import pandas to work with tabular data
+import pandas as pd
+# import the model the web app uses
+from sklearn.linear_model import LogisticRegression
+# import the shared game log loader and its index
+from game_log_store import get_game_log, get_game_log_index
+# import the partitioned history store for full scans
+from history_store import read_history
+# import the rolling form table (values are "as of the end of each game")
+from team_form import build_team_form_table, FORM_GAMES, H2H_MEETINGS, FORM_STATS
+# import the same blend api_predict uses
+from prediction_blend import blend_weights, convert_rest_difference_to_bump, blend_home_away_probabilities
+
+# the csv the backtest replays (five seasons, no SEASON_TYPE column)
+BACKTEST_CSV = "nba_games_2020_to_2025.csv"
+# refit the model every this many days, on every game played before the refit day
+REFIT_DAYS = 7
+# same minimum as the web app: no model until there are this many training rows
+MIN_TRAIN_ROWS = 100
+# the columns the win model is trained on (same as load_training_df_and_features in app.py)
+MODEL_FEATURES = FORM_STATS + ["HOME_FLAG"]
+
+# this function returns the row each position's group had just before it (-1 for the first one)
+def _previous_positions(groups: dict, size: int) -> np.ndarray:
+    previous = np.full(size, -1, dtype=np.intp)
+    for positions in groups.values():
+        previous[positions[1:]] = positions[:-1]
+    return previous
+
+# this function pairs each home row with its away row and attaches only what was known before tip-off
+def build_pregame_games(df: pd.DataFrame, n: int = FORM_GAMES, meetings: int = H2H_MEETINGS) -> pd.DataFrame:
+    """
+    One row per game, sorted by date. Form is the team's last n games before
+    this one, h2h is the home team's win rate over its last `meetings` games
+    against this opponent before this one, and rest days count the days since
+    each team's previous game. Rows for a team with no earlier games have
+    HAS_FORM False (api_predict answers 50/50 for those).
+    """
+    index = get_game_log_index(df)
+    table = build_team_form_table(df, n, meetings)
+
+    # the form table holds values after each game, so step back one game in each group
+    prev_game = _previous_positions(index["by_name"], len(df))
+    prev_meeting = _previous_positions(index["by_matchup"], len(df))
+    form = np.where((prev_game >= 0)[:, None], table["form"][prev_game], np.nan)
+    h2h = np.where(prev_meeting >= 0, table["h2h"][prev_meeting], 0.5)
+
+    rows = pd.DataFrame({
+        "GAME DATE": index["dates"],
+        "TEAM ABBR": df["TEAM ABBR"].to_numpy(),
+        "OPP ABBR": df["OPP ABBR"].to_numpy(),
+        "HOME_FLAG": df["HOME_FLAG"].to_numpy(),
+        "WIN": df["WIN"].to_numpy(),
+        "H2H": h2h,
+        "REST": table["rest_days"],
+        **{stat: form[:, i] for i, stat in enumerate(FORM_STATS)},
+    })
+
+    # csvs without SEASON_TYPE only tell us who played who on which date, so pair on that
+    home = rows[rows["HOME_FLAG"] == 1]
+    away = rows[rows["HOME_FLAG"] == 0].drop(columns=["HOME_FLAG", "H2H", "WIN"])
+    games = home.merge(
+        away,
+        left_on=["GAME DATE", "TEAM ABBR", "OPP ABBR"],
+        right_on=["GAME DATE", "OPP ABBR", "TEAM ABBR"],
+        suffixes=("", "_AWAY"),
+    )
+    games = games.rename(columns={stat: f"{stat}_HOME" for stat in FORM_STATS + ["REST"]})
+    games = games.drop(columns=["HOME_FLAG", "OPP ABBR", "OPP ABBR_AWAY"]).rename(columns={
+        "TEAM ABBR": "HOME ABBR", "TEAM ABBR_AWAY": "AWAY ABBR", "WIN": "HOME_WIN", "H2H": "H2H_HOME",
+    })
+    games = games.sort_values("GAME DATE", kind="stable").reset_index(drop=True)
+
+    # seasons roll over in july (same rule as current_season_str)
+    dates = games["GAME DATE"].dt
+    start_year = dates.year - (dates.month < 7)
+    games["SEASON"] = start_year.astype(str) + "-" + (start_year + 1).astype(str).str[-2:]
+    games["HAS_FORM"] = games[[f"{s}_HOME" for s in FORM_STATS] + [f"{s}_AWAY" for s in FORM_STATS]].notna().all(axis=1)
+    return games
+
+# this function refits the win model once per block of game days, on games played before the block only
+def fit_walk_forward_models(df: pd.DataFrame, game_dates: np.ndarray, refit_days: int = REFIT_DAYS, min_train_rows: int = MIN_TRAIN_ROWS) -> list:
+    """
+    Returns [(start, stop, model)] where games[start:stop] are the games that
+    model predicts. Each refit warm-starts from the previous coefficients.
+    The models only depend on the game log and the game dates, so they can be
+    reused for every form window / head-to-head setting.
+    """
+    # training rows exactly like the web app (box scores -> WIN), sorted by date
+    train = df[MODEL_FEATURES + ["WIN", "GAME DATE"]].dropna().sort_values("GAME DATE", kind="stable")
+    train_dates = train["GAME DATE"].to_numpy()
+    X_all = train[MODEL_FEATURES]
+    y_all = train["WIN"].astype(int)
+
+    models = []
+    clf = LogisticRegression(max_iter=1000, warm_start=True)
+    step = np.timedelta64(refit_days, "D")
+    cut = game_dates[0] if len(game_dates) else None
+    while cut is not None and cut <= game_dates[-1]:
+        # the block of games this refit predicts, and every training row before it
+        start = np.searchsorted(game_dates, cut, side="left")
+        stop = np.searchsorted(game_dates, cut + step, side="left")
+        seen = np.searchsorted(train_dates, cut, side="left")
+        if stop > start and seen >= min_train_rows:
+            clf.fit(X_all.iloc[:seen], y_all.iloc[:seen])
+            models.append((int(start), int(stop), copy.deepcopy(clf)))
+        # jump straight to the next game day instead of walking empty weeks (off-season)
+        nxt = cut + step
+        cut = game_dates[stop] if stop < len(game_dates) and game_dates[stop] > nxt else nxt
+    return models
+
+# this function adds each side's model win probability for every game, using the walk-forward models
+def add_walk_forward_model_probabilities(df: pd.DataFrame, games: pd.DataFrame, refit_days: int = REFIT_DAYS, min_train_rows: int = MIN_TRAIN_ROWS, models: list = None) -> pd.DataFrame:
+    """
+    Adds P_HOME/P_AWAY (the model's win probability for each side's pre-game
+    form) and PREDICTED, False for games before the first refit with enough
+    history. Pass models from fit_walk_forward_models to skip refitting.
+    """
+    if models is None:
+        models = fit_walk_forward_models(df, games["GAME DATE"].to_numpy(), refit_days, min_train_rows)
+
+    home_X = games[[f"{s}_HOME" for s in FORM_STATS]].set_axis(FORM_STATS, axis=1).assign(HOME_FLAG=1)[MODEL_FEATURES]
+    away_X = games[[f"{s}_AWAY" for s in FORM_STATS]].set_axis(FORM_STATS, axis=1).assign(HOME_FLAG=0)[MODEL_FEATURES]
+    has_form = games["HAS_FORM"].to_numpy()
+    p_home = np.full(len(games), np.nan)
+    p_away = np.full(len(games), np.nan)
+    predicted = np.zeros(len(games), dtype=bool)
+
+    for start, stop, clf in models:
+        predicted[start:stop] = True
+        rows = np.arange(start, stop)[has_form[start:stop]]
+        if len(rows):
+            # one predict_proba call per block for both sides
+            proba = clf.predict_proba(pd.concat([home_X.iloc[rows], away_X.iloc[rows]], ignore_index=True))[:, 1]
+            p_home[rows] = proba[:len(rows)]
+            p_away[rows] = proba[len(rows):]
+
+    games = games.copy()
+    games["P_HOME"] = p_home
+    games["P_AWAY"] = p_away
+    # every game a model existed for (games without form still count, as the 50/50 api_predict gives them)
+    games["PREDICTED"] = predicted
+    return games
+
+# this function returns the blended home win probability (0-1) for every game
+def blend_games(games: pd.DataFrame, weights: dict = None, rest_bump_per_day: float = None) -> np.ndarray:
+    rest_diff = games["REST_HOME"].to_numpy().astype(int) - games["REST_AWAY"].to_numpy().astype(int)
+    rest_bump = convert_rest_difference_to_bump(rest_diff, rest_bump_per_day)
+    home_pct, _ = blend_home_away_probabilities(
+        np.nan_to_num(games["P_HOME"].to_numpy(), nan=0.5),
+        np.nan_to_num(games["P_AWAY"].to_numpy(), nan=0.5),
+        games["H2H_HOME"].to_numpy(),
+        rest_bump,
+        weights,
+    )
+    return np.where(games["HAS_FORM"].to_numpy(), home_pct, 50.0) / 100.0
+
+# this function scores probabilities against outcomes
+def score_probabilities(p: np.ndarray, y: np.ndarray) -> dict:
+    clipped = np.clip(p, 1e-15, 1 - 1e-15)
+    return {
+        "games": int(len(y)),
+        # api_predict picks the home team when home_pct >= away_pct
+        "accuracy": float(np.mean((p >= 0.5) == (y == 1))) if len(y) else float("nan"),
+        "log_loss": float(-np.mean(y * np.log(clipped) + (1 - y) * np.log(1 - clipped))) if len(y) else float("nan"),
+        "brier": float(np.mean((p - y) ** 2)) if len(y) else float("nan"),
+    }
+
+# this function reports accuracy, log-loss and brier score per season (plus "all") for one set of weights
+def evaluate_blend(games: pd.DataFrame, weights: dict = None, rest_bump_per_day: float = None) -> pd.DataFrame:
+    scored = games[games["PREDICTED"]]
+    p = blend_games(scored, weights, rest_bump_per_day)
+    y = scored["HOME_WIN"].to_numpy(dtype=float)
+    seasons = scored["SEASON"].to_numpy()
+
+    report = {season: score_probabilities(p[seasons == season], y[seasons == season]) for season in np.unique(seasons)}
+    report["all"] = score_probabilities(p, y)
+    return pd.DataFrame.from_dict(report, orient="index")
+
+# this function scores many weight sets at once (each chunk of sets is broadcast over every game in one pass)
+def sweep_blend_weights(games: pd.DataFrame, weight_sets: list, rest_bump_per_day: float = None, chunk_size: int = 256) -> pd.DataFrame:
+    scored = games[games["PREDICTED"]]
+    y = scored["HOME_WIN"].to_numpy(dtype=float)
+    accuracy, log_loss, brier = [], [], []
+    for i in range(0, len(weight_sets), chunk_size):
+        chunk = weight_sets[i:i + chunk_size]
+        stacked = {key: np.array([w[key] for w in chunk], dtype=float)[:, None] for key in blend_weights}
+        p = blend_games(scored, stacked, rest_bump_per_day)
+        clipped = np.clip(p, 1e-15, 1 - 1e-15)
+        accuracy.append(np.mean((p >= 0.5) == (y == 1), axis=1))
+        log_loss.append(-np.mean(y * np.log(clipped) + (1 - y) * np.log(1 - clipped), axis=1))
+        brier.append(np.mean((p - y) ** 2, axis=1))
+
+    results = pd.DataFrame(weight_sets)
+    results["accuracy"] = np.concatenate(accuracy) if accuracy else []
+    results["log_loss"] = np.concatenate(log_loss) if log_loss else []
+    results["brier"] = np.concatenate(brier) if brier else []
+    return results.sort_values("log_loss", kind="stable").reset_index(drop=True)
+
+# this function runs the whole walk-forward replay for a csv and returns the per game table
+def run_backtest(csv_path: str = BACKTEST_CSV, n: int = FORM_GAMES, meetings: int = H2H_MEETINGS, refit_days: int = REFIT_DAYS) -> pd.DataFrame:
+    # "history" replays every regular season in the partitioned history store instead of one csv
+    df = read_history(season_types=["Regular Season"]) if csv_path == "history" else get_game_log(csv_path)
+    return add_walk_forward_model_probabilities(df, build_pregame_games(df, n, meetings), refit_days)
+
+if __name__ == "__main__":
+    # a csv path, or "history" for the partitioned history store
+    csv_path = sys.argv[1] if len(sys.argv) > 1 else BACKTEST_CSV
+
+    start = time.perf_counter()
+    games = run_backtest(csv_path)
+    print(f"walk-forward replay of {len(games)} games: {time.perf_counter() - start:.2f}s")
+    print(evaluate_blend(games).round(4).to_string())
+
+    # every weight combination on a 0.05 grid
+    grid = np.round(np.arange(0, 1.0001, 0.05), 2)
+    weight_sets = [
+        {"model": m, "h2h": h, "home_court": c, "rest": r}
+        for m, h, c, r in itertools.product(grid, grid[:9], grid[:5], grid[:5])
+    ]
+    start = time.perf_counter()
+    sweep = sweep_blend_weights(games, weight_sets)
+    print(f"\nswept {len(weight_sets)} weight sets over {int(games['PREDICTED'].sum())} games: {time.perf_counter() - start:.2f}s")
+    print(sweep.head(5).round(4).to_string())
@@ -2,24 +2,19 @@
 import pandas as pd
 # import game finder to find specific games between two teams
 from nba_api.stats.endpoints import leaguegamefinder
-# import list of nba teams
-from nba_api.stats.static import teams
+# import the shared team registry
+from team_registry import find_team
 from sklearn.model_selection import train_test_split
 from sklearn.linear_model import LogisticRegression
 from sklearn.metrics import accuracy_score
+# import the model registry so we only retrain when the data changes
+from model_registry import get_or_train_model, hash_training_data
 
 # this function will find the teams name
 def find_team_info(team_name):
-    # search for teams matching the given input
-    all_teams = teams.get_teams()
-
-    # iterate through all team names
-    for team in all_teams:
-        # if the team name inputted matches the team name found, return the team name
-        if team_name.lower() in team['full_name'].lower():
-            return team
-    # otherwise return none
-    return None
+    # look the team up in the shared registry (full name, nickname, abbreviation or partial name)
+    # returns none if nothing matches
+    return find_team(team_name)
 
 # this function returns the last 5 games for each inputted team separartely
 def get_recent_games(team_id, num_games = 5):
@@ -126,20 +121,27 @@ X = df[['Points', 'Rebounds', 'Assists', 'Turnovers']]
 # our target: what we want model to predict
 y = df['WIN']
 
-# ***** SPLIT DATA FOR TRAINING/TESTING ***** #
-# 80% will be used to train the model, 20% will be used to test it
-X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42)
-
-# ***** CREATE/TRAIN THE MODEL ***** #
-# allows enough iterations to train
-model = LogisticRegression(max_iter=1000)
-# train the model
-model.fit(X_train, y_train)
-
-# ***** CHECK MODEL ACCURACY ***** #
-predictions = model.predict(X_test)
-accuracy = accuracy_score(y_test, predictions)
-print(f"\nmodel accuracy: {accuracy:.2f}")
+# this function trains the model and checks its accuracy
+def train_model():
+    # ***** SPLIT DATA FOR TRAINING/TESTING ***** #
+    # 80% will be used to train the model, 20% will be used to test it
+    X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42)
+
+    # ***** CREATE/TRAIN THE MODEL ***** #
+    # allows enough iterations to train
+    model = LogisticRegression(max_iter=1000)
+    # train the model
+    model.fit(X_train, y_train)
+
+    # ***** CHECK MODEL ACCURACY ***** #
+    predictions = model.predict(X_test)
+    accuracy = accuracy_score(y_test, predictions)
+    return model, X.columns, {"test_accuracy": float(accuracy)}
+
+# reuse the published model if these games were already trained on, otherwise train and publish
+artifact = get_or_train_model("matchup_stats", hash_training_data(X, y), train_model)
+model = artifact["model"]
+print(f"\nmodel accuracy: {artifact['metrics']['test_accuracy']:.2f} (model {artifact['version']})")
 
 # ***** PREDICT MATCHUP ***** #
 # prompt user to input team abbreviations
@@ -1,110 +1,250 @@
+# import os for env config, file checks and fsync
+import os
+# import json for the ingest state file and recorded api fixtures
+import json
+# import argparse for the full / incremental command line modes
+import argparse
 # import game finder to find specific games between two teams
 from nba_api.stats.endpoints import leaguegamefinder
+# import numpy for the vectorized column derivation
+import numpy as np
 # import pandas to work with tabular data
 import pandas as pd
-
-# this function will add the data for the inputted season
-def get_games_for_season(season):
-    # we want both regular season and playoffs
-    all_types = ['Regular Season', 'Playoffs']
+# import the upstream client, whose stats.nba.com concurrency cap + rate limit the web app shares
+from upstream_client import call
+# import the current season helper
+from nba_api_cache import current_season_str, STATS_NBA_HOST
+# import the typed columnar copy readers prefer over the csv
+from game_history import write_columnar
+# import the season partitioned history store, kept in step with the csv
+from history_store import has_history, write_history
+# import the league-wide player table so an ingest can refresh the season in progress
+from player_game_logs import has_player_game_logs, refresh_player_game_logs
+# import the shared atomic writer for the csv, fixtures and state file
+from atomic_write import atomic_write_text
+
+# the csv the web app reads, and where incremental runs remember how far they got
+GAMES_CSV = "nba_games_2023_to_2025.csv"
+INGEST_STATE_PATH = os.environ.get("INGEST_STATE_PATH", "data_collector_state.json")
+# how long one LeagueGameFinder call may take (seconds, a full season is a big response)
+COLLECTOR_API_TIMEOUT = 60
+
+# we want both regular season and playoffs
+SEASON_TYPES = ['Regular Season', 'Playoffs']
+
+# the columns we write, in order
+OUTPUT_COLUMNS = [
+    'TEAM ID', 'TEAM NAME', 'TEAM ABBR', 'OPP ABBR', 'GAME DATE', 'HOME/AWAY',
+    'POINTS', 'REBOUNDS', 'ASSISTS', 'TURNOVERS', 'WIN', 'SEASON_TYPE'
+]
+
+# this function asks stats.nba.com for a season's games (optionally only games on/after date_from)
+def fetch_league_games(season: str, season_type: str, date_from: pd.Timestamp = None) -> pd.DataFrame:
+    params = {"season_nullable": season, "season_type_nullable": season_type}
+    if date_from is not None:
+        # the api wants MM/DD/YYYY
+        params["date_from_nullable"] = date_from.strftime("%m/%d/%Y")
+    # through the shared upstream client, so it gets the same stats.nba.com concurrency cap + rate limit as the web routes
+    find = lambda: leaguegamefinder.LeagueGameFinder(**params, timeout=COLLECTOR_API_TIMEOUT).get_data_frames()[0]
+    return call(None, STATS_NBA_HOST, find, timeout=COLLECTOR_API_TIMEOUT + 5)
+
+# this function returns a fetcher that replays a recorded api response file instead of calling the network
+def fixture_fetcher(fixture_path: str):
+    """
+    The fixture is {"<season>|<season type>": {"headers": [...], "rowSet": [[...], ...]}},
+    the same shape LeagueGameFinder returns (see --record).
+    """
+    with open(fixture_path, "r", encoding="utf-8") as f:
+        recorded = json.load(f)
+
+    def fetch(season, season_type, date_from=None):
+        result = recorded.get(f"{season}|{season_type}")
+        if result is None:
+            return pd.DataFrame()
+        games_df = pd.DataFrame(result["rowSet"], columns=result["headers"])
+        if date_from is not None and not games_df.empty:
+            games_df = games_df[pd.to_datetime(games_df["GAME_DATE"]) >= date_from]
+        return games_df
+    return fetch
+
+# this function wraps a fetcher so every response it returns is also saved to a fixture file
+def recording_fetcher(fetch, fixture_path: str):
+    recorded = {}
+
+    def fetch_and_record(season, season_type, date_from=None):
+        games_df = fetch(season, season_type, date_from)
+        recorded[f"{season}|{season_type}"] = {
+            "headers": list(games_df.columns),
+            "rowSet": json.loads(games_df.to_json(orient="values")),
+        }
+        atomic_write_text(fixture_path, json.dumps(recorded))
+        return games_df
+    return fetch_and_record
+
+# this function turns LeagueGameFinder rows into our csv columns (no python loops)
+def build_game_log_rows(games_df: pd.DataFrame, season_type: str) -> pd.DataFrame:
+    # drop any rows with missing matchup (avoids None.split errors) and games still in progress (no W/L yet)
+    games_df = games_df.dropna(subset=['MATCHUP', 'WL'])
+    if games_df.empty:
+        return pd.DataFrame(columns=OUTPUT_COLUMNS)
+
+    # MATCHUP: "LAL vs. NYK" (home) or "LAL @ BOS" (away), opponent is always the last part
+    matchup = games_df['MATCHUP'].astype(str)
+    return pd.DataFrame({
+        'TEAM ID': games_df['TEAM_ID'].to_numpy(),
+        'TEAM NAME': games_df['TEAM_NAME'].to_numpy(),
+        'TEAM ABBR': games_df['TEAM_ABBREVIATION'].to_numpy(),
+        'OPP ABBR': matchup.str.split(" ").str[-1].to_numpy(),
+        'GAME DATE': pd.to_datetime(games_df['GAME_DATE']).to_numpy(),
+        'HOME/AWAY': np.where(matchup.str.contains("vs", regex=False), "Home", "Away"),
+        'POINTS': games_df['PTS'].to_numpy(),
+        'REBOUNDS': games_df['REB'].to_numpy(),
+        'ASSISTS': games_df['AST'].to_numpy(),
+        'TURNOVERS': games_df['TOV'].to_numpy(),
+        # 1 for win, 0 for loss
+        'WIN': (games_df['WL'] == "W").astype(int).to_numpy(),
+        # keep track of whether it was Regular Season or Playoffs
+        'SEASON_TYPE': season_type,
+    }, columns=OUTPUT_COLUMNS)
+
+# this function will add the data for the inputted season (optionally only games on/after date_from per season type)
+def get_games_for_season(season, date_from: dict = None, fetch=fetch_league_games):
     season_frames = []
-
-    for stype in all_types:
+    for stype in SEASON_TYPES:
         # get games for that season and season type
-        gamefinder = leaguegamefinder.LeagueGameFinder(season_nullable=season, season_type_nullable=stype)
-
-        # gets the first result for the teams games
-        games_df = gamefinder.get_data_frames()[0]
+        games_df = fetch(season, stype, (date_from or {}).get(stype))
 
-        # NEW: skip if this season type returned no rows
+        # skip if this season type returned no rows
         if games_df is None or games_df.empty:
             continue
+        season_frames.append(build_game_log_rows(games_df, stype))
 
-        # add column to keep track of season type (regular/playoffs)
-        games_df['SEASON_TYPE'] = stype
-
-        season_frames.append(games_df)
-
-    # combine regular + playoff games into one dataframe
+    # combine regular + playoff games into one dataframe (empty in our output shape if nothing came back)
     if len(season_frames) == 0:
-        # NEW: if nothing came back at all, return empty in your output shape
-        return pd.DataFrame(columns=[
-            'TEAM ID','TEAM NAME','TEAM ABBR','OPP ABBR','GAME DATE','HOME/AWAY',
-            'POINTS','REBOUNDS','ASSISTS','TURNOVERS','WIN','SEASON_TYPE'
+        return pd.DataFrame(columns=OUTPUT_COLUMNS)
+    return pd.concat(season_frames, ignore_index=True)
+
+# this function appends rows to the csv in one write, undoing a partial write if anything fails
+def append_rows_atomically(csv_path: str, rows: pd.DataFrame) -> None:
+    if not os.path.exists(csv_path):
+        atomic_write_text(csv_path, rows.to_csv(index=False))
+        return
+
+    # match the existing header (older csvs have no SEASON_TYPE column)
+    with open(csv_path, "r", encoding="utf-8") as f:
+        header = f.readline().strip().split(",")
+    text = rows.reindex(columns=header).to_csv(index=False, header=False)
+
+    with open(csv_path, "r+b") as f:
+        f.seek(0, os.SEEK_END)
+        size = f.tell()
+        # make sure we start on a new line
+        if size > 0:
+            f.seek(size - 1)
+            if f.read(1) != b"\n":
+                text = "\n" + text
+        try:
+            f.write(text.encode("utf-8"))
+            f.flush()
+            os.fsync(f.fileno())
+        except Exception:
+            f.truncate(size)
+            raise
+
+# this function returns the last ingested game date per season type for csv_path
+def load_ingest_state(csv_path: str, state_path: str = INGEST_STATE_PATH) -> dict:
+    if os.path.exists(state_path):
+        with open(state_path, "r", encoding="utf-8") as f:
+            state = json.load(f).get(csv_path)
+        if state:
+            return {stype: pd.Timestamp(day) for stype, day in state.items()}
+
+    # no state yet: work it out from the csv once
+    if not os.path.exists(csv_path):
+        return {}
+    df = pd.read_csv(csv_path, usecols=lambda c: c in ("GAME DATE", "SEASON_TYPE"))
+    if "SEASON_TYPE" not in df.columns:
+        return {}
+    dates = pd.to_datetime(df["GAME DATE"], errors="coerce")
+    return {stype: day for stype, day in dates.groupby(df["SEASON_TYPE"]).max().items() if pd.notna(day)}
+
+# this function saves the last ingested game date per season type for csv_path
+def save_ingest_state(csv_path: str, last_dates: dict, state_path: str = INGEST_STATE_PATH) -> None:
+    state = {}
+    if os.path.exists(state_path):
+        with open(state_path, "r", encoding="utf-8") as f:
+            state = json.load(f)
+    state[csv_path] = {stype: day.strftime("%Y-%m-%d") for stype, day in last_dates.items()}
+    atomic_write_text(state_path, json.dumps(state, indent=2))
+
+# this function fetches only games newer than the last ingest and appends the ones the csv doesn't have yet
+def ingest_new_games(csv_path: str = GAMES_CSV, season: str = None, fetch=fetch_league_games, state_path: str = INGEST_STATE_PATH, refresh_player_logs: bool = True) -> pd.DataFrame:
+    season = season or current_season_str()
+    last_dates = load_ingest_state(csv_path, state_path)
+
+    # refetch the last ingested day too, games finishing late that night may have been missing
+    new_rows = get_games_for_season(season, date_from=last_dates, fetch=fetch)
+
+    # drop rows we already have (same team, same day) and any duplicates within the fetch itself
+    new_rows = new_rows.drop_duplicates(subset=['TEAM ID', 'GAME DATE'])
+    if os.path.exists(csv_path) and not new_rows.empty:
+        existing = pd.read_csv(csv_path, usecols=['TEAM ID', 'GAME DATE'])
+        existing_keys = pd.MultiIndex.from_arrays([
+            pd.to_numeric(existing['TEAM ID'], errors="coerce").astype("Int64"),
+            pd.to_datetime(existing['GAME DATE'], errors="coerce"),
+        ])
+        new_keys = pd.MultiIndex.from_arrays([
+            pd.to_numeric(new_rows['TEAM ID'], errors="coerce").astype("Int64"),
+            pd.to_datetime(new_rows['GAME DATE']),
         ])
+        new_rows = new_rows[~new_keys.isin(existing_keys)]
+
+    if not new_rows.empty:
+        new_rows = new_rows.sort_values(['GAME DATE', 'TEAM ID'], kind="stable")
+        append_rows_atomically(csv_path, new_rows.assign(**{'GAME DATE': new_rows['GAME DATE'].dt.strftime("%Y-%m-%d")}))
+        for stype, day in new_rows.groupby('SEASON_TYPE')['GAME DATE'].max().items():
+            last_dates[stype] = max(day, last_dates.get(stype, day))
+        save_ingest_state(csv_path, last_dates, state_path)
+        # refresh the typed columnar copy so readers don't fall back to parsing the csv
+        write_columnar(csv_path)
+        # and merge the new games into the partitions they belong to (only the current season's are rewritten)
+        if has_history():
+            write_history(new_rows)
+        # and refetch the season's player games into the league-wide player table, when it has been built
+        if refresh_player_logs and has_player_game_logs():
+            try:
+                refresh_player_game_logs([season])
+            except Exception as e:
+                print(f"[DEBUG] ingest_new_games: could not refresh the player game log table -> {e}")
+    return new_rows
 
-    games_df = pd.concat(season_frames, ignore_index=True)
-
-    # NEW: drop any rows with missing matchup to avoid None.split errors
-    games_df = games_df.dropna(subset=['MATCHUP']).copy()
-
-    # converts 'GAME_DATE' column of strings to datetime objects
-    games_df['GAME_DATE'] = pd.to_datetime(games_df['GAME_DATE'])
-
-    # create new dataframe to hold only the info we want
-    output_df = pd.DataFrame()
-
-    # print(games_df.columns.tolist())
-
-    # basic team info
-    output_df['TEAM ID'] = games_df['TEAM_ID']
-    output_df['TEAM NAME'] = games_df['TEAM_NAME']
-    output_df['TEAM ABBR'] = games_df['TEAM_ABBREVIATION']
-
-    # get opponent name from matchup
-    opponent_names= []
-    for matchup in games_df['MATCHUP']:
-        # MATCHUP: "LAL vs NYK" or "LAL @ BOS"
-        # opponent is always last part
-        parts = matchup.split(" ")
-        opponent_names.append(parts[-1])
-    output_df['OPP ABBR'] = opponent_names
-
-    # add game date
-    output_df['GAME DATE'] = games_df['GAME_DATE']
-
-    # figure out if the game was home or away
-    home_away = []
-    for matchup in games_df['MATCHUP']:
-        if "vs" in matchup:
-            home_away.append("Home")
-        else:
-            home_away.append("Away")
-    output_df['HOME/AWAY'] = home_away
-
-    # add stats
-    output_df['POINTS'] = games_df['PTS']
-    output_df['REBOUNDS'] = games_df['REB']
-    output_df['ASSISTS'] = games_df['AST']
-    output_df['TURNOVERS'] = games_df['TOV']
-
-    # add win/loss column (1 for win, 0 for loss)
-    win_column = []
-    for result in games_df['WL']:
-        if result == "W":
-            win_column.append(1)
-        else:
-            win_column.append(0)
-    output_df['WIN'] = win_column
-
-    # keep track of whether it was Regular Season or Playoffs
-    output_df['SEASON_TYPE'] = games_df['SEASON_TYPE']
-
-    return output_df
-
-# test function
 if __name__ == "__main__":
-    # list of seasons from past 5 years
-    seasons = ["2023-24", "2024-25"]
-
-    all_data = pd.DataFrame()
-
-    for season in seasons:
-        print(f"fetching data for season: {season}...")
-        season_data = get_games_for_season(season)
-        all_data = pd.concat([all_data, season_data], ignore_index=True)
-    
-    # save to csv
-    all_data.to_csv("nba_games_2023_to_2025.csv", index=False)
-    print("saved to nba_games_2023_to_2025.csv")
-    print(all_data.head().to_string())
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="download nba team game logs")
+    parser.add_argument("--incremental", action="store_true", help="only fetch games newer than the last run and append them")
+    parser.add_argument("--csv", default=GAMES_CSV, help="csv to write / append to")
+    parser.add_argument("--season", nargs="*", default=["2023-24", "2024-25"], help="seasons for a full download (incremental uses the current one unless one season is given)")
+    parser.add_argument("--fixture", help="replay a recorded api response file instead of calling stats.nba.com")
+    parser.add_argument("--record", help="save every api response to this fixture file")
+    args = parser.parse_args()
+
+    fetch = fixture_fetcher(args.fixture) if args.fixture else fetch_league_games
+    if args.record:
+        fetch = recording_fetcher(fetch, args.record)
+
+    if args.incremental:
+        season = args.season[0] if len(args.season) == 1 else None
+        # a replayed fixture stays offline, so it doesn't refresh the player table either
+        added = ingest_new_games(args.csv, season=season, fetch=fetch, refresh_player_logs=not args.fixture)
+        print(f"appended {len(added)} new rows to {args.csv}")
+    else:
+        frames = []
+        for season in args.season:
+            print(f"fetching data for season: {season}...")
+            frames.append(get_games_for_season(season, fetch=fetch))
+        all_data = pd.concat(frames, ignore_index=True)
+
+        # save to csv
+        atomic_write_text(args.csv, all_data.to_csv(index=False))
+        write_columnar(args.csv)
+        print(f"saved to {args.csv} (and its columnar copy)")
+        print(all_data.head().to_string())
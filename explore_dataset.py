@@ -1,10 +1,10 @@
-# import pandas to work with tabular data
-import pandas as pd
 # import matlotlib to visualize stats
 import matplotlib.pyplot as plt
+# import the typed game log reader (reads the columnar copy of the csv when there is one)
+from game_history import read_game_history
 
 # load the dataset
-df = pd.read_csv("nba_games_2020_to_2025.csv")
+df = read_game_history("nba_games_2020_to_2025.csv")
 
 # see basic info
 print("\ndataset info:")
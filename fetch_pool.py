@@ -0,0 +1,57 @@
+# import os for env config
+import os
+# import time for the benchmark
+import time
+# import contextvars so flask's request globals are visible inside worker threads
+import contextvars
+# import a thread pool to run blocking http calls side by side
+from concurrent.futures import ThreadPoolExecutor
+
+# max worker threads shared by every request in this process
+FETCH_POOL_WORKERS = int(os.environ.get("FETCH_POOL_WORKERS", 8))
+
+# one pool for the whole process so concurrent requests can't spawn unbounded threads
+_pool = ThreadPoolExecutor(max_workers=FETCH_POOL_WORKERS, thread_name_prefix="fetch")
+
+# this function runs fn(*args) for every args tuple on the shared pool
+def fetch_in_parallel(fn, args_list):
+    """
+    Returns a list of (result, error) pairs in the same order as args_list.
+    A task that raises gets (None, exception) so callers can handle each failure
+    the same way they did in their old sequential loops.
+    """
+    futures = []
+    for args in args_list:
+        # each task runs in a copy of the caller's context (keeps flask.g / the request memo)
+        ctx = contextvars.copy_context()
+        futures.append(_pool.submit(ctx.run, fn, *args))
+
+    results = []
+    for future in futures:
+        try:
+            results.append((future.result(), None))
+        except Exception as e:
+            results.append((None, e))
+    return results
+
+# quick benchmark: a fake endpoint with artificial latency, sequential vs pooled
+if __name__ == "__main__":
+    latency = 0.3
+    seasons = ["2024-25", "2023-24", "2022-23", "2021-22", "2020-21"]
+
+    def fake_game_log(season):
+        time.sleep(latency)
+        return season
+
+    start = time.perf_counter()
+    sequential = [fake_game_log(s) for s in seasons]
+    sequential_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    pooled = [r for r, _ in fetch_in_parallel(fake_game_log, [(s,) for s in seasons])]
+    pooled_time = time.perf_counter() - start
+
+    assert pooled == sequential
+    print(f"{len(seasons)} fetches at {latency}s each")
+    print(f"sequential: {sequential_time:.2f}s")
+    print(f"pooled:     {pooled_time:.2f}s ({sequential_time / pooled_time:.1f}x faster)")
@@ -0,0 +1,104 @@
+# import os for paths and mtimes
+import os
+# import sys to pick the csv for the benchmark
+import sys
+# import time for the benchmark
+import time
+# import importlib to check whether the optional parquet engine is installed
+import importlib.util
+# import pandas to work with tabular data
+import pandas as pd
+# import the canonical game log schema every loader applies
+from game_schema import apply_game_log_schema
+# import the shared atomic writer
+from atomic_write import atomic_write_frame
+
+# parquet needs pyarrow; without it every reader falls back to the csv
+HAS_PARQUET = importlib.util.find_spec("pyarrow") is not None
+
+# this function returns the typed columnar file kept next to a csv
+def columnar_path(csv_path: str) -> str:
+    return os.path.splitext(csv_path)[0] + ".parquet"
+
+# this function writes df (already in the canonical schema) to a parquet file by writing a temp file and renaming it over the target
+def _write_parquet(df: pd.DataFrame, path: str) -> None:
+    atomic_write_frame(df, path)
+
+# this function (re)writes the columnar copy of a csv and returns the typed frame
+def write_columnar(csv_path: str) -> pd.DataFrame:
+    df = apply_game_log_schema(pd.read_csv(csv_path))
+    if HAS_PARQUET:
+        _write_parquet(df, columnar_path(csv_path))
+    return df
+
+# this function (re)builds the columnar copy when it is missing or older than the csv (for startup and the collector,
+# never the request path); returns True when a fresh copy is there afterwards
+def ensure_columnar(csv_path: str) -> bool:
+    if HAS_PARQUET and not _columnar_is_fresh(csv_path):
+        try:
+            write_columnar(csv_path)
+        except Exception as e:
+            print(f"[DEBUG] could not write columnar copy of {csv_path} -> {e}")
+    return _columnar_is_fresh(csv_path)
+
+# this function returns True when the columnar copy exists and is at least as new as the csv
+def _columnar_is_fresh(csv_path: str) -> bool:
+    path = columnar_path(csv_path)
+    if not HAS_PARQUET or not os.path.exists(path):
+        return False
+    return not os.path.exists(csv_path) or os.path.getmtime(path) >= os.path.getmtime(csv_path)
+
+# this function returns the mtime readers should watch for csv_path: always the csv's, since the columnar copy
+# only ever holds the same rows (writing it must not trigger a second reload)
+def game_history_mtime(csv_path: str) -> float:
+    if os.path.exists(csv_path):
+        return os.path.getmtime(csv_path)
+    return os.path.getmtime(columnar_path(csv_path))
+
+# this function reads a game log, preferring the typed columnar copy and only loading what the caller asks for
+def read_game_history(csv_path: str, columns: list = None, date_from=None, date_to=None) -> pd.DataFrame:
+    """
+    columns limits which columns are read (GAME DATE is always read when a
+    date range is given). date_from / date_to are inclusive. Only reads: a
+    missing or stale columnar copy falls back to the csv (ensure_columnar
+    builds it).
+    """
+    if _columnar_is_fresh(csv_path):
+        filters = []
+        if date_from is not None:
+            filters.append(("GAME DATE", ">=", pd.Timestamp(date_from)))
+        if date_to is not None:
+            filters.append(("GAME DATE", "<=", pd.Timestamp(date_to)))
+        # re-applying the schema is a no-op for files written with the current one
+        return apply_game_log_schema(pd.read_parquet(columnar_path(csv_path), columns=columns, filters=filters or None))
+
+    # no parquet engine, or no fresh columnar copy yet: parse the csv and apply the same types
+    df = apply_game_log_schema(pd.read_csv(csv_path))
+    if date_from is not None:
+        df = df[df["GAME DATE"] >= pd.Timestamp(date_from)]
+    if date_to is not None:
+        df = df[df["GAME DATE"] <= pd.Timestamp(date_to)]
+    return (df[columns] if columns is not None else df).reset_index(drop=True)
+
+if __name__ == "__main__":
+    csv_path = sys.argv[1] if len(sys.argv) > 1 else "nba_games_2020_to_2025.csv"
+    write_columnar(csv_path)
+    runs = 20
+
+    def timed(fn):
+        start = time.perf_counter()
+        for _ in range(runs):
+            result = fn()
+        return (time.perf_counter() - start) / runs * 1000, result
+
+    csv_ms, csv_df = timed(lambda: apply_game_log_schema(pd.read_csv(csv_path)))
+    raw_ms, raw_df = timed(lambda: pd.read_csv(csv_path))
+    pq_ms, pq_df = timed(lambda: read_game_history(csv_path))
+    part_ms, part_df = timed(lambda: read_game_history(csv_path, columns=["TEAM ABBR", "GAME DATE", "WIN"], date_from="2024-10-01"))
+
+    mb = lambda df: df.memory_usage(deep=True).sum() / 1e6
+    print(f"{csv_path}: {len(pq_df)} rows, csv {os.path.getsize(csv_path) / 1e6:.2f} MB on disk, parquet {os.path.getsize(columnar_path(csv_path)) / 1e6:.2f} MB")
+    print(f"read_csv only:              {raw_ms:6.1f} ms  {mb(raw_df):5.2f} MB in memory")
+    print(f"read_csv + parse/types:     {csv_ms:6.1f} ms  {mb(csv_df):5.2f} MB in memory")
+    print(f"parquet (typed):            {pq_ms:6.1f} ms  {mb(pq_df):5.2f} MB in memory")
+    print(f"parquet 3 cols, 2024-25+:   {part_ms:6.1f} ms  {mb(part_df):5.2f} MB in memory ({len(part_df)} rows)")
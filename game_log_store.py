@@ -0,0 +1,127 @@
+# import threading so two requests never parse the same file at the same time
+import threading
+# import numpy for the row position arrays
+import numpy as np
+# import pandas to work with tabular data
+import pandas as pd
+# import the typed columnar reader (parquet next to the csv, csv fallback)
+from game_history import read_game_history, game_history_mtime, ensure_columnar
+
+# the game log csv the web app reads from
+DEFAULT_GAMES_CSV = "nba_games_2023_to_2025.csv"
+
+# this keeps one parsed game log per csv path so routes stop re-reading the file
+# each entry looks like {"mtime": float, "df": DataFrame, "index": dict}
+_store = {}
+_store_lock = threading.Lock()
+
+# this function will read the game log once, typed (dates parsed, clean team codes, HOME_FLAG), from its columnar copy when it has one
+def _load_game_log(csv_path: str) -> pd.DataFrame:
+    return read_game_history(csv_path)
+
+# this function builds lookups from team abbr, team name and (team, opponent) to row positions
+def build_game_log_index(df: pd.DataFrame) -> dict:
+    """
+    Every entry is a numpy array of row positions into df sorted by GAME DATE
+    (oldest first), so last-N and head-to-head queries are just slices.
+    """
+    dates = df["GAME DATE"].to_numpy()
+    # stable sort keeps csv order for games on the same day
+    order = np.argsort(dates, kind="stable")
+    ordered = df.iloc[order]
+
+    # groupby().indices gives positions into the sorted frame, map them back to df positions
+    def group_positions(keys):
+        return {k: order[v] for k, v in ordered.groupby(keys, sort=False).indices.items()}
+
+    return {
+        "dates": dates,
+        "latest_date": pd.Timestamp(dates[order[-1]]) if len(order) else pd.NaT,
+        "by_abbr": group_positions(ordered["TEAM ABBR"]),
+        "by_name": group_positions(ordered["TEAM KEY"]),
+        "by_matchup": group_positions([ordered["TEAM ABBR"], ordered["OPP ABBR"]]),
+    }
+
+# this function returns the shared game log for csv_path, reloading it only when the file changes
+def _get_entry(csv_path: str) -> dict:
+    mtime = game_history_mtime(csv_path)
+
+    # fast path: already loaded and the file hasn't changed
+    entry = _store.get(csv_path)
+    if entry is not None and entry["mtime"] == mtime:
+        return entry
+
+    with _store_lock:
+        # another thread may have reloaded it while we waited for the lock
+        entry = _store.get(csv_path)
+        if entry is not None and entry["mtime"] == mtime:
+            return entry
+
+        df = _load_game_log(csv_path)
+        entry = {"mtime": mtime, "df": df, "index": build_game_log_index(df)}
+        _store[csv_path] = entry
+        return entry
+
+# this function returns the shared game log for csv_path
+def get_game_log(csv_path: str = DEFAULT_GAMES_CSV) -> pd.DataFrame:
+    """
+    Returns the parsed game log shared by every route. The frame is read-only:
+    callers must .copy() before adding or changing columns.
+    """
+    return _get_entry(csv_path)["df"]
+
+# this function returns the index for df, reusing the prebuilt one when df is a shared game log
+def get_game_log_index(df: pd.DataFrame) -> dict:
+    for entry in list(_store.values()):
+        if entry["df"] is df:
+            return entry["index"]
+    # not a shared frame (e.g. a filtered copy), build a throwaway index
+    return build_game_log_index(df)
+
+# this function returns every game for a team abbreviation, oldest first
+def get_team_games(df: pd.DataFrame, team_abbr: str) -> pd.DataFrame:
+    positions = get_game_log_index(df)["by_abbr"].get((team_abbr or "").upper(), [])
+    return df.iloc[positions]
+
+# this function returns every game for a full team name (case-insensitive), oldest first
+def get_team_games_by_name(df: pd.DataFrame, team_name: str) -> pd.DataFrame:
+    positions = get_game_log_index(df)["by_name"].get((team_name or "").strip().lower(), [])
+    return df.iloc[positions]
+
+# this function returns a team's last n games by full team name (case-insensitive), oldest first
+def get_last_n_team_games_by_name(df: pd.DataFrame, team_name: str, n: int) -> pd.DataFrame:
+    positions = get_game_log_index(df)["by_name"].get((team_name or "").strip().lower(), [])
+    return df.iloc[positions[-n:] if n > 0 else []]
+
+# this function returns the most recent GAME DATE in the log (NaT if empty)
+def get_latest_game_date(df: pd.DataFrame) -> pd.Timestamp:
+    return get_game_log_index(df)["latest_date"]
+
+# this function returns the last n games team_abbr played against opp_abbr, newest first
+def get_last_n_matchup_games(df: pd.DataFrame, team_abbr: str, opp_abbr: str, n: int) -> pd.DataFrame:
+    key = ((team_abbr or "").upper(), (opp_abbr or "").upper())
+    positions = get_game_log_index(df)["by_matchup"].get(key, [])
+    return df.iloc[positions[::-1][:n]]
+
+# this function returns the date of the team's last game strictly before as_of_date (or None)
+def get_last_game_date_before(df: pd.DataFrame, team_abbr: str, as_of_date: pd.Timestamp):
+    index = get_game_log_index(df)
+    positions = index["by_abbr"].get((team_abbr or "").upper())
+    if positions is None or len(positions) == 0:
+        return None
+
+    # positions are sorted by date, so binary search for the first game on/after as_of_date
+    team_dates = index["dates"][positions]
+    cut = np.searchsorted(team_dates, np.datetime64(as_of_date), side="left")
+    if cut == 0:
+        return None
+    return pd.Timestamp(team_dates[cut - 1])
+
+# this function loads the game log ahead of time so the first request doesn't pay for it
+# (and builds its columnar copy if it is missing or stale, since requests only read)
+def preload_game_log(csv_path: str = DEFAULT_GAMES_CSV) -> None:
+    try:
+        ensure_columnar(csv_path)
+        get_game_log(csv_path)
+    except Exception as e:
+        print(f"[DEBUG] preload_game_log: could not load {csv_path} -> {e}")
@@ -0,0 +1,113 @@
+# import sys to pick the csv for the memory report
+import sys
+# import pandas to work with tabular data
+import pandas as pd
+
+# the canonical column types for a team game log, applied by every loader
+# (team fields are categoricals, box-score counts int16, flags int8)
+GAME_LOG_SCHEMA = {
+    "TEAM ID": "int32",
+    "TEAM NAME": "category",
+    "TEAM KEY": "category",       # TEAM NAME stripped + lowercased once at load, for case-insensitive lookups
+    "TEAM ABBR": "category",
+    "OPP ABBR": "category",
+    "GAME DATE": "datetime64",
+    "HOME/AWAY": "category",
+    "POINTS": "int16",
+    "REBOUNDS": "int16",
+    "ASSISTS": "int16",
+    "TURNOVERS": "int16",
+    "WIN": "int8",
+    "HOME_FLAG": "int8",          # Home=1, Away=0
+    "SEASON_TYPE": "category",
+}
+
+# this function returns a categorical column whose labels went through normalize (skipping the work when they already did)
+def _normalized_category(series: pd.Series, normalize) -> pd.Series:
+    if not isinstance(series.dtype, pd.CategoricalDtype):
+        return normalize(series.astype(str)).astype("category")
+    categories = series.cat.categories
+    if normalize(pd.Series(categories)).tolist() == list(categories):
+        return series
+    return normalize(series.astype(str)).astype("category")
+
+# id columns keep every digit even with gaps (float32 would round 1610612757 and 1610612754 to the same number)
+ID_COLUMNS = ("TEAM ID",)
+
+# this function converts a numeric column to a small int type when it has gaps, since ints can't hold NaN:
+# float32 for box-score counts, the nullable int type (ex. Int32) for ids
+def _small_number(series: pd.Series, dtype: str, is_id: bool = False) -> pd.Series:
+    nullable = dtype.capitalize()
+    if series.dtype == dtype or (is_id and series.dtype == nullable):
+        return series
+    numeric = pd.to_numeric(series, errors="coerce")
+    if not numeric.isna().any():
+        return numeric.astype(dtype)
+    return numeric.astype(nullable) if is_id else numeric.astype("float32")
+
+# this function gives a game log the canonical schema (safe to run on a frame that already has it)
+def apply_game_log_schema(df: pd.DataFrame) -> pd.DataFrame:
+    df = df.copy()
+
+    # older csvs sometimes have "Season Type" instead of SEASON_TYPE, standardize it
+    if "SEASON_TYPE" not in df.columns and "Season Type" in df.columns:
+        df["SEASON_TYPE"] = df.pop("Season Type")
+
+    # a game without a result isn't a loss, drop it (same as the collector, which skips rows without WL)
+    if "WIN" in df.columns and df["WIN"].dtype != GAME_LOG_SCHEMA["WIN"]:
+        missing = pd.to_numeric(df["WIN"], errors="coerce").isna()
+        if missing.any():
+            print(f"[DEBUG] apply_game_log_schema: dropping {int(missing.sum())} rows without a WIN value")
+            df = df[~missing].reset_index(drop=True)
+
+    # parse dates once here instead of on every request
+    if "GAME DATE" in df.columns and not pd.api.types.is_datetime64_any_dtype(df["GAME DATE"]):
+        df["GAME DATE"] = pd.to_datetime(df["GAME DATE"], errors="coerce")
+
+    # team codes are always clean uppercase, and the lookup key is the lowercase team name
+    for col in ("TEAM ABBR", "OPP ABBR"):
+        if col in df.columns:
+            df[col] = _normalized_category(df[col], lambda s: s.str.strip().str.upper())
+    if "TEAM NAME" in df.columns:
+        df["TEAM NAME"] = _normalized_category(df["TEAM NAME"], lambda s: s.str.strip())
+        if "TEAM KEY" not in df.columns:
+            df["TEAM KEY"] = df["TEAM NAME"].astype(str).str.lower().astype("category")
+
+    # convert text "Home"/"Away" to a simple numeric flag (Home=1, Away=0)
+    if "HOME/AWAY" in df.columns and "HOME_FLAG" not in df.columns:
+        df["HOME_FLAG"] = df["HOME/AWAY"].map({"Home": 1, "Away": 0}).astype("float").fillna(0)
+
+    for col, dtype in GAME_LOG_SCHEMA.items():
+        if col not in df.columns or col in ("GAME DATE", "TEAM ABBR", "OPP ABBR", "TEAM NAME"):
+            continue
+        if dtype == "category":
+            if not isinstance(df[col].dtype, pd.CategoricalDtype):
+                df[col] = df[col].astype("category")
+        elif col == "WIN":
+            df[col] = pd.to_numeric(df[col], errors="coerce").astype(dtype)
+        else:
+            df[col] = _small_number(df[col], dtype, is_id=col in ID_COLUMNS)
+    return df
+
+if __name__ == "__main__":
+    csv_paths = sys.argv[1:] or ["nba_games_2023_to_2025.csv", "nba_games_2020_to_2025.csv"]
+    mb = lambda df: df.memory_usage(deep=True).sum() / 1e6
+
+    for csv_path in csv_paths:
+        # before: default read_csv dtypes plus the columns the old loader derived (object strings, int64 flags)
+        before = pd.read_csv(csv_path)
+        before["GAME DATE"] = pd.to_datetime(before["GAME DATE"], errors="coerce")
+        for col in ("TEAM ABBR", "OPP ABBR"):
+            before[col] = before[col].astype(str).str.strip().str.upper()
+        before["HOME_FLAG"] = before["HOME/AWAY"].map({"Home": 1, "Away": 0}).fillna(0).astype(int)
+        before["TEAM KEY"] = before["TEAM NAME"].astype(str).str.strip().str.lower()
+
+        after = apply_game_log_schema(pd.read_csv(csv_path))
+        print(f"{csv_path} ({len(after)} rows): {mb(before):.2f} MB -> {mb(after):.2f} MB per worker")
+        per_column = pd.DataFrame({
+            "before": before.memory_usage(deep=True, index=False) / 1e3,
+            "after": after.memory_usage(deep=True, index=False) / 1e3,
+            "dtype": after.dtypes.astype(str),
+        }).round(1)
+        print(per_column.to_string())
+        print()
@@ -0,0 +1,276 @@
+# import os for paths and mtimes
+import os
+# import sys for the command line
+import sys
+# import time for the check interval and the benchmark
+import time
+# import threading so two requests never read the same partition at the same time
+import threading
+# import pandas to work with tabular data
+import pandas as pd
+# import the canonical game log schema every loader applies
+from game_schema import apply_game_log_schema
+# import the parquet engine check shared with the single-file columnar copies
+from game_history import HAS_PARQUET
+# import the shared atomic writer
+from atomic_write import atomic_write_frame
+
+# where the partitioned history lives: <dir>/<season>/<season type>.parquet (one file per season + season type)
+GAME_HISTORY_DIR = os.environ.get("GAME_HISTORY_DIR", "game_history")
+
+# the csvs the store is built from, newest first (rows in an earlier csv win when two csvs overlap)
+HISTORY_SOURCE_CSVS = ["nba_games_2023_to_2025.csv", "nba_games_2020_to_2025.csv"]
+
+# how long the partition listing and a team read's file mtimes are trusted before they are checked again (seconds);
+# writes from this process are seen right away, writes from another process (the collector) within this long
+HISTORY_CHECK_SECONDS = float(os.environ.get("HISTORY_CHECK_SECONDS", 5))
+# most team reads kept in memory (oldest are dropped first)
+HISTORY_TEAM_READS_MAX = int(os.environ.get("HISTORY_TEAM_READS_MAX", 512))
+
+# this keeps every partition read so far (plus each team's row positions in it), reloaded only when its file changes
+# {path: {"mtime": float, "df": DataFrame, "by_abbr": {abbr: positions}}}
+_partitions = {}
+_partitions_lock = threading.Lock()
+
+# this keeps team reads the web routes repeat, valid while none of the partitions they looked at change
+# {(history_dir, abbr, last_n, seasons): {"files": ((path, mtime), ...), "checked_at": float, "df": DataFrame}}
+_team_reads = {}
+_team_reads_lock = threading.Lock()
+
+# this keeps the partition listing per store folder so requests don't walk the folders every time
+# {history_dir: {"checked_at": float, "parts": [(season, season type, path), ...]}}
+_listings = {}
+
+# this function returns the season (ex. "2024-25") a game date belongs to (seasons roll over in july)
+def season_for_date(day) -> str:
+    day = pd.Timestamp(day)
+    y = day.year if day.month >= 7 else day.year - 1
+    return f"{y}-{str(y + 1)[-2:]}"
+
+# this function returns the file one season + season type partition is stored in
+def partition_path(season: str, season_type: str, history_dir: str = GAME_HISTORY_DIR) -> str:
+    ext = ".parquet" if HAS_PARQUET else ".csv"
+    return os.path.join(history_dir, season, season_type.replace(" ", "_") + ext)
+
+# this function lists every partition as (season, season type, path), oldest season first
+# (from memory when the folders were walked in the last HISTORY_CHECK_SECONDS)
+def list_partitions(history_dir: str = GAME_HISTORY_DIR) -> list:
+    now = time.monotonic()
+    listing = _listings.get(history_dir)
+    if listing is None or now - listing["checked_at"] >= HISTORY_CHECK_SECONDS:
+        listing = {"checked_at": now, "parts": _scan_partitions(history_dir)}
+        _listings[history_dir] = listing
+    return listing["parts"]
+
+# this function walks the store folders for every partition on disk, oldest season first
+def _scan_partitions(history_dir: str) -> list:
+    if not os.path.isdir(history_dir):
+        return []
+    found = []
+    for season in sorted(os.listdir(history_dir)):
+        season_dir = os.path.join(history_dir, season)
+        if not os.path.isdir(season_dir):
+            continue
+        for name in sorted(os.listdir(season_dir)):
+            stem, ext = os.path.splitext(name)
+            if ext in (".parquet", ".csv") and not name.endswith(".tmp"):
+                found.append((season, stem.replace("_", " "), os.path.join(season_dir, name)))
+    return found
+
+# this function writes one partition by writing a temp file first and renaming it over the target
+def _write_partition(df: pd.DataFrame, path: str) -> None:
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    atomic_write_frame(df, path)
+    # this process sees its own writes right away
+    _listings.clear()
+    with _team_reads_lock:
+        _team_reads.clear()
+
+# this function returns the cache entry for one partition, reading the file only when it is new or changed
+def _partition_entry(path: str) -> dict:
+    mtime = os.path.getmtime(path)
+    entry = _partitions.get(path)
+    if entry is not None and entry["mtime"] == mtime:
+        return entry
+
+    with _partitions_lock:
+        entry = _partitions.get(path)
+        if entry is None or entry["mtime"] != mtime:
+            raw = pd.read_parquet(path) if path.endswith(".parquet") else pd.read_csv(path)
+            df = apply_game_log_schema(raw)
+            entry = {
+                "mtime": mtime,
+                "df": df,
+                "by_abbr": {abbr: positions for abbr, positions in df.groupby("TEAM ABBR", observed=True).indices.items()},
+            }
+            _partitions[path] = entry
+        return entry
+
+# this function reads one partition (typed), reusing the copy in memory until the file changes
+def _read_partition(path: str) -> pd.DataFrame:
+    return _partition_entry(path)["df"]
+
+# this function merges new rows into the partitions they belong to (deduped on TEAM ID + GAME DATE, new rows win)
+def write_history(rows: pd.DataFrame, history_dir: str = GAME_HISTORY_DIR, default_season_type: str = "Regular Season") -> list:
+    """
+    Only the partitions the rows fall in are rewritten. Rows without a
+    SEASON_TYPE get default_season_type. Returns the partition paths written.
+    """
+    rows = apply_game_log_schema(rows).dropna(subset=["GAME DATE"])
+    if "SEASON_TYPE" not in rows.columns:
+        rows["SEASON_TYPE"] = default_season_type
+    rows["SEASON_TYPE"] = rows["SEASON_TYPE"].astype(object).fillna(default_season_type)
+    seasons = rows["GAME DATE"].map(season_for_date)
+
+    written = []
+    for (season, season_type), part in rows.groupby([seasons, rows["SEASON_TYPE"]], sort=True, observed=True):
+        path = partition_path(season, season_type, history_dir)
+        if os.path.exists(path):
+            part = pd.concat([_read_partition(path).astype(object), part.astype(object)], ignore_index=True)
+        part = (
+            part.drop_duplicates(subset=["TEAM ID", "GAME DATE"], keep="last")
+            .sort_values(["GAME DATE", "TEAM ID"], kind="stable")
+            .reset_index(drop=True)
+        )
+        _write_partition(apply_game_log_schema(part), path)
+        written.append(path)
+    return written
+
+# this function builds the store from the overlapping csvs
+def build_history(csv_paths: list = None, history_dir: str = GAME_HISTORY_DIR) -> list:
+    """
+    The 2020-25 csv has no SEASON_TYPE column, but it only holds regular
+    season games (every season in it ends on its regular season's last day),
+    so its rows default to "Regular Season". Rows in earlier csvs of the list
+    win when two csvs have the same (TEAM ID, GAME DATE).
+    """
+    written = []
+    # write the lowest priority csv first so the higher priority rows overwrite it
+    for csv_path in reversed(csv_paths or HISTORY_SOURCE_CSVS):
+        written.extend(write_history(pd.read_csv(csv_path), history_dir))
+    return sorted(set(written))
+
+# this function returns the partitions a query touches, oldest first
+def _select_partitions(seasons=None, season_types=None, date_from=None, date_to=None, history_dir: str = GAME_HISTORY_DIR) -> list:
+    first = season_for_date(date_from) if date_from is not None else None
+    last = season_for_date(date_to) if date_to is not None else None
+    return [
+        (season, season_type, path)
+        for season, season_type, path in list_partitions(history_dir)
+        if (seasons is None or season in seasons)
+        and (season_types is None or season_type in season_types)
+        and (first is None or season >= first)
+        and (last is None or season <= last)
+    ]
+
+# this function orders partitions newest season first, playoffs before the regular season within a season
+def _newest_first(selected: list) -> list:
+    return sorted(selected, key=lambda p: (p[0], p[1] == "Playoffs"), reverse=True)
+
+# this function yields one frame per partition the query touches (newest first if newest_first), loading each only when reached
+def iter_history(seasons=None, season_types=None, columns: list = None, date_from=None, date_to=None, newest_first: bool = False, history_dir: str = GAME_HISTORY_DIR):
+    selected = _select_partitions(seasons, season_types, date_from, date_to, history_dir)
+    if newest_first:
+        selected = _newest_first(selected)
+    for season, season_type, path in selected:
+        df = _read_partition(path)
+        if date_from is not None:
+            df = df[df["GAME DATE"] >= pd.Timestamp(date_from)]
+        if date_to is not None:
+            df = df[df["GAME DATE"] <= pd.Timestamp(date_to)]
+        yield df[columns] if columns is not None else df
+
+# this function reads every row a query touches into one frame (sorted by date)
+def read_history(seasons=None, season_types=None, columns: list = None, date_from=None, date_to=None, history_dir: str = GAME_HISTORY_DIR) -> pd.DataFrame:
+    frames = list(iter_history(seasons, season_types, columns, date_from, date_to, history_dir=history_dir))
+    if not frames:
+        return pd.DataFrame(columns=columns)
+    # concat of categoricals with different categories gives object columns, so re-apply the schema
+    df = apply_game_log_schema(pd.concat(frames, ignore_index=True))
+    return df.sort_values("GAME DATE", kind="stable").reset_index(drop=True) if "GAME DATE" in df.columns else df
+
+# this function returns a team's games, newest first, reading partitions only until last_n games are found
+def read_team_history(team_abbr: str, last_n: int = None, seasons=None, history_dir: str = GAME_HISTORY_DIR) -> pd.DataFrame:
+    """
+    Older seasons are never opened once last_n games are found, so adding
+    seasons to the store doesn't slow this down. The result is shared between
+    callers: .copy() before changing it.
+    """
+    abbr = (team_abbr or "").strip().upper()
+    selected = _newest_first(_select_partitions(seasons, history_dir=history_dir))
+
+    key = (history_dir, abbr, last_n, tuple(seasons) if seasons is not None else None)
+    cached = _team_reads.get(key)
+    # only the partitions the last read opened matter: same ones still newest, and (once the check interval passes) unchanged
+    if cached is not None and tuple(path for _, _, path in selected[:len(cached["files"])]) == tuple(path for path, _ in cached["files"]):
+        now = time.monotonic()
+        if now - cached["checked_at"] < HISTORY_CHECK_SECONDS:
+            return cached["df"]
+        if _partition_mtimes(selected[:len(cached["files"])]) == cached["files"]:
+            cached["checked_at"] = now
+            return cached["df"]
+
+    df, files = _read_team_partitions(abbr, last_n, selected)
+    with _team_reads_lock:
+        _team_reads.pop(key, None)
+        _team_reads[key] = {"files": files, "checked_at": time.monotonic(), "df": df}
+        while len(_team_reads) > HISTORY_TEAM_READS_MAX:
+            del _team_reads[next(iter(_team_reads))]
+    return df
+
+# this function returns ((path, mtime), ...) for a list of partitions
+def _partition_mtimes(selected: list) -> tuple:
+    return tuple((path, os.path.getmtime(path)) for _, _, path in selected)
+
+# this function walks partitions newest first collecting a team's games until last_n are found
+# (returns the games and ((path, mtime), ...) for the partitions it opened)
+def _read_team_partitions(abbr: str, last_n: int, selected: list) -> tuple:
+    frames = []
+    found = 0
+    opened = []
+    for season, season_type, path in selected:
+        entry = _partition_entry(path)
+        opened.append((path, entry["mtime"]))
+        positions = entry["by_abbr"].get(abbr)
+        if positions is None:
+            continue
+        # partitions are sorted by date, so the team's newest games are its last positions
+        if last_n is not None:
+            positions = positions[-(last_n - found):]
+        frames.append(entry["df"].iloc[positions[::-1]])
+        found += len(positions)
+        if last_n is not None and found >= last_n:
+            break
+    if not frames:
+        return pd.DataFrame(), tuple(opened)
+    if len(frames) == 1:
+        return frames[0].reset_index(drop=True), tuple(opened)
+    # concat of categoricals with different categories gives object columns, so re-apply the schema
+    return apply_game_log_schema(pd.concat(frames, ignore_index=True)), tuple(opened)
+
+# this function returns True when the partitioned store has been built (uses the cached listing)
+def has_history(history_dir: str = GAME_HISTORY_DIR) -> bool:
+    return len(list_partitions(history_dir)) > 0
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] == "build":
+        for path in build_history(sys.argv[2:] or None):
+            print(f"wrote {path} ({len(_read_partition(path))} rows)")
+        sys.exit(0)
+
+    # benchmark: the partitions a team page touches vs a full scan
+    parts = list_partitions()
+    print(f"{len(parts)} partitions in {GAME_HISTORY_DIR}")
+    for label, fn in [
+        ("team last 20 games (cold)", lambda: read_team_history("BOS", last_n=20)),
+        ("team last 20 games (warm)", lambda: read_team_history("BOS", last_n=20)),
+        ("one season", lambda: read_history(seasons=["2024-25"])),
+        ("full scan", lambda: read_history()),
+    ]:
+        if "cold" in label:
+            _partitions.clear()
+            _team_reads.clear()
+            _listings.clear()
+        start = time.perf_counter()
+        result = fn()
+        print(f"{label:28s} {(time.perf_counter() - start) * 1000:7.1f} ms  {len(result)} rows, {len(_partitions)} partitions in memory")
@@ -0,0 +1,166 @@
+# import os for paths and stats
+import os
+# import time to stamp versions
+import time
+# import hashlib to fingerprint training data
+import hashlib
+# import threading so two requests don't load the same artifact (or train the same model) at once
+import threading
+# import contextmanager to build the training lock
+from contextlib import contextmanager
+# import fcntl for the lock file that keeps two processes from training the same model (not on windows)
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+# import joblib to save fitted sklearn models (numpy arrays can be memory-mapped on load)
+import joblib
+# import pandas to hash training frames
+import pandas as pd
+# import the shared atomic writers for artifacts and the LATEST pointer
+from atomic_write import atomic_write, atomic_write_text
+
+# where model artifacts are written, one folder per model name
+MODEL_REGISTRY_DIR = os.environ.get("MODEL_REGISTRY_DIR", "models")
+# how many versions of each model stay on disk (older ones are deleted after a publish)
+MODEL_KEEP_VERSIONS = int(os.environ.get("MODEL_KEEP_VERSIONS", 5))
+
+# this keeps the artifact each model name currently serves in this process
+# {name: {"pointer_mtime": int, "artifact": dict}}
+_loaded = {}
+_loaded_lock = threading.Lock()
+# held while a model is retrained, so threads of this process wait for one training instead of each running their own
+_train_lock = threading.Lock()
+
+# this function returns a short fingerprint of the rows a model is trained on
+def hash_training_data(X: pd.DataFrame, y: pd.Series = None) -> str:
+    h = hashlib.sha256()
+    h.update(",".join(map(str, X.columns)).encode())
+    h.update(pd.util.hash_pandas_object(X, index=False).values.tobytes())
+    if y is not None:
+        h.update(pd.util.hash_pandas_object(y, index=False).values.tobytes())
+    return h.hexdigest()[:16]
+
+# these functions return the model folder, the LATEST pointer and a version's artifact path
+def _model_dir(name: str) -> str:
+    return os.path.join(MODEL_REGISTRY_DIR, name)
+
+def _pointer_path(name: str) -> str:
+    return os.path.join(_model_dir(name), "LATEST")
+
+def _artifact_path(name: str, version: str) -> str:
+    return os.path.join(_model_dir(name), f"{version}.joblib")
+
+def _lock_path(name: str) -> str:
+    return os.path.join(_model_dir(name), "train.lock")
+
+# this context manager holds the training lock for a model: the in-process lock, then the lock file other processes share
+@contextmanager
+def _training_lock(name: str):
+    os.makedirs(_model_dir(name), exist_ok=True)
+    with _train_lock:
+        if fcntl is None:
+            yield
+            return
+        with open(_lock_path(name), "a") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+# this function deletes all but the newest keep versions of a model (never the one LATEST points at)
+def prune_versions(name: str, keep: int = MODEL_KEEP_VERSIONS) -> list:
+    try:
+        with open(_pointer_path(name), "r", encoding="utf-8") as f:
+            current = f.read().strip()
+        names = os.listdir(_model_dir(name))
+    except FileNotFoundError:
+        return []
+    # versions are "v<microseconds>", so sorting on the number puts them in publish order
+    versions = sorted((n[:-len(".joblib")] for n in names if n.startswith("v") and n.endswith(".joblib")), key=lambda v: int(v[1:]))
+    removed = []
+    for version in versions[:-keep] if keep > 0 else versions:
+        if version == current:
+            continue
+        try:
+            os.remove(_artifact_path(name, version))
+            removed.append(version)
+        except OSError as e:
+            print(f"[DEBUG] model registry: could not remove {name} {version} -> {e}")
+    return removed
+
+# this function saves a fitted model with its feature list, data hash and metrics, then points LATEST at it
+def publish_model(name: str, model, features, data_hash: str, metrics: dict) -> dict:
+    os.makedirs(_model_dir(name), exist_ok=True)
+    version = f"v{time.time_ns() // 1000}"
+    artifact = {
+        "name": name,
+        "version": version,
+        "model": model,
+        "features": list(features),
+        "data_hash": data_hash,
+        "metrics": dict(metrics),
+        "trained_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+    }
+
+    # write the artifact first, then flip the pointer, so readers never see a half-written model
+    atomic_write(_artifact_path(name, version), lambda p: joblib.dump(artifact, p))
+    atomic_write_text(_pointer_path(name), version)
+    prune_versions(name)
+    return artifact
+
+# this function loads one artifact (numpy arrays are memory-mapped read-only)
+def load_artifact(name: str, version: str) -> dict:
+    return joblib.load(_artifact_path(name, version), mmap_mode="r")
+
+# this function returns the latest published artifact for a model, or None if nothing is published
+def get_latest_model(name: str):
+    """
+    Reads LATEST only when its mtime changes, so the common case is one os.stat.
+    When a new version is published the next call swaps to it.
+    """
+    try:
+        pointer_mtime = os.stat(_pointer_path(name)).st_mtime_ns
+    except FileNotFoundError:
+        return None
+
+    entry = _loaded.get(name)
+    if entry is not None and entry["pointer_mtime"] == pointer_mtime:
+        return entry["artifact"]
+
+    with _loaded_lock:
+        entry = _loaded.get(name)
+        if entry is not None and entry["pointer_mtime"] == pointer_mtime:
+            return entry["artifact"]
+        try:
+            with open(_pointer_path(name), "r", encoding="utf-8") as f:
+                version = f.read().strip()
+            artifact = load_artifact(name, version)
+        except Exception as e:
+            print(f"[DEBUG] model registry: could not load {name} -> {e}")
+            # keep serving whatever we had before
+            return entry["artifact"] if entry else None
+        # one assignment, so other threads see either the old or the new artifact
+        _loaded[name] = {"pointer_mtime": pointer_mtime, "artifact": artifact}
+        return artifact
+
+# this function returns the latest artifact if it was trained on data_hash, otherwise trains and publishes a new one
+def get_or_train_model(name: str, data_hash: str, train_fn) -> dict:
+    """
+    train_fn() must return (model, features, metrics). Only one thread or
+    process trains a model at a time; the others wait and use what it published.
+    """
+    artifact = get_latest_model(name)
+    if artifact is not None and artifact["data_hash"] == data_hash:
+        return artifact
+
+    with _training_lock(name):
+        # someone else may have trained on this data while we waited for the lock
+        artifact = get_latest_model(name)
+        if artifact is not None and artifact["data_hash"] == data_hash:
+            return artifact
+
+        model, features, metrics = train_fn()
+        publish_model(name, model, features, data_hash, metrics)
+        return get_latest_model(name)
@@ -0,0 +1,249 @@
+# import os for env config
+import os
+# import json to build stable cache keys from call parameters
+import json
+# import pickle to store the returned dataframes as blobs
+import pickle
+# import sqlite3 for the on-disk store
+import sqlite3
+# import time for ttl bookkeeping
+import time
+# import threading for per-thread sqlite connections and counter locks
+import threading
+# import datetime to work out which season is current
+from datetime import datetime
+# import flask's request globals for the per-request memo
+from flask import g, has_request_context
+# import the upstream client (pooled session, per-host concurrency cap + rate limit, coalescing of identical calls)
+from upstream_client import call, call_async, install_nba_api_session, UPSTREAM_TIMEOUT
+# import endpoints we cache
+from nba_api.stats.endpoints import commonplayerinfo, playergamelog, playergamelogs, teaminfocommon, commonteamroster, playerindex
+
+# where cached nba_api responses are stored
+NBA_API_CACHE_PATH = os.environ.get("NBA_API_CACHE_PATH", "nba_api_cache.sqlite")
+# the host every nba_api endpoint talks to (its per-host limit lives in upstream_client)
+STATS_NBA_HOST = "stats.nba.com"
+
+# ttl values in seconds (None means the entry never expires)
+HOUR = 60 * 60
+DAY = 24 * HOUR
+CURRENT_SEASON_LOG_TTL = 3 * HOUR   # game logs for the season in progress
+PLAYER_INFO_TTL = DAY               # player bio / current team
+TEAM_INFO_TTL = 6 * HOUR            # team standings info (ranks move during the season)
+CURRENT_ROSTER_TTL = DAY            # roster for the season in progress
+
+# hit/miss counters per endpoint so we can size the cache
+# misses are upstream calls, memo_hits are repeats within one request
+# {"PlayerGameLog": {"hits": 0, "misses": 0, "memo_hits": 0}, ...}
+nba_api_cache_stats = {}
+_stats_lock = threading.Lock()
+
+# one sqlite connection per thread (sqlite connections can't be shared across threads)
+_local = threading.local()
+
+# nba_api requests go through the upstream client's pooled keep-alive session
+install_nba_api_session()
+
+# this function returns the season string (ex. "2025-26") for today
+def current_season_str(today=None) -> str:
+    today = today or datetime.now()
+    y = today.year
+    return f"{y}-{str(y+1)[-2:]}" if today.month >= 7 else f"{y-1}-{str(y)[-2:]}"
+
+# this function returns True if the season (ex. "2023-24") is over, so its data won't change
+def is_finished_season(season) -> bool:
+    if not isinstance(season, str) or len(season) < 4 or not season[:4].isdigit():
+        return False
+    return season < current_season_str()
+
+# these functions pick the ttl for each endpoint from its parameters
+def _player_game_log_ttl(params: dict):
+    return None if is_finished_season(params.get("season")) else CURRENT_SEASON_LOG_TTL
+
+def _league_player_logs_ttl(params: dict):
+    return None if is_finished_season(params.get("season_nullable")) else CURRENT_SEASON_LOG_TTL
+
+def _roster_ttl(params: dict):
+    return None if is_finished_season(params.get("season")) else CURRENT_ROSTER_TTL
+
+# endpoint name -> (nba_api endpoint class, ttl function)
+ENDPOINTS = {
+    "CommonPlayerInfo": (commonplayerinfo.CommonPlayerInfo, lambda params: PLAYER_INFO_TTL),
+    "PlayerGameLog": (playergamelog.PlayerGameLog, _player_game_log_ttl),
+    # every player's games for a season in one call
+    "PlayerGameLogs": (playergamelogs.PlayerGameLogs, _league_player_logs_ttl),
+    "TeamInfoCommon": (teaminfocommon.TeamInfoCommon, lambda params: TEAM_INFO_TTL),
+    "CommonTeamRoster": (commonteamroster.CommonTeamRoster, _roster_ttl),
+    # league-wide team + position for every player in one call
+    "PlayerIndex": (playerindex.PlayerIndex, lambda params: PLAYER_INFO_TTL),
+}
+
+# this function returns this thread's sqlite connection, creating the table on first use
+def _get_connection() -> sqlite3.Connection:
+    conn = getattr(_local, "conn", None)
+    if conn is None:
+        conn = sqlite3.connect(NBA_API_CACHE_PATH, timeout=10)
+        # wal lets several web workers read while one writes
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            " key TEXT PRIMARY KEY,"
+            " endpoint TEXT NOT NULL,"
+            " stored_at REAL NOT NULL,"
+            " expires_at REAL,"  # NULL means never expires
+            " payload BLOB NOT NULL)"
+        )
+        conn.commit()
+        _local.conn = conn
+    return conn
+
+# this function counts a hit or miss for an endpoint
+def _count(endpoint: str, kind: str) -> None:
+    with _stats_lock:
+        counters = nba_api_cache_stats.setdefault(endpoint, {"hits": 0, "misses": 0, "memo_hits": 0})
+        counters[kind] += 1
+
+# this function builds a stable key from the endpoint name and its parameters
+def make_cache_key(endpoint: str, params: dict) -> str:
+    return endpoint + ":" + json.dumps(params, sort_keys=True, default=str)
+
+# this function returns the endpoint's dataframes, from the cache when we have a fresh copy
+def fetch_endpoint_frames(endpoint: str, **params):
+    """
+    Same result as EndpointClass(**params).get_data_frames(), stored in sqlite
+    with a ttl chosen per endpoint. Errors from nba_api are raised, not cached.
+    Inside a flask request, repeated calls with the same parameters share one result.
+    """
+    key = make_cache_key(endpoint, params)
+
+    # same call earlier in this request: reuse it (shallow copies so callers can add columns)
+    memo = _request_memo()
+    if memo is not None and key in memo:
+        _count(endpoint, "memo_hits")
+        return [f.copy(deep=False) for f in memo[key]]
+
+    frames = _fetch_endpoint_frames_cached(endpoint, key, params)
+    if memo is not None:
+        memo[key] = frames
+        return [f.copy(deep=False) for f in frames]
+    return frames
+
+# this function returns the memo dict for the current flask request (or None outside a request)
+def _request_memo():
+    if not has_request_context():
+        return None
+    if "nba_api_memo" not in g:
+        g.nba_api_memo = {}
+        g.nba_api_upstream_calls = 0
+    return g.nba_api_memo
+
+# this function returns how many nba_api calls actually went upstream during the current request
+def get_request_upstream_calls() -> int:
+    if not has_request_context():
+        return 0
+    return g.get("nba_api_upstream_calls", 0)
+
+# this function returns the stored frames for key if they haven't expired (None on a miss)
+def _read_cached(endpoint: str, key: str):
+    try:
+        conn = _get_connection()
+        row = conn.execute("SELECT expires_at, payload FROM responses WHERE key = ?", (key,)).fetchone()
+    except sqlite3.Error as e:
+        print(f"[DEBUG] nba_api cache read failed: {e}")
+        row = None
+
+    if row is not None and (row[0] is None or row[0] > time.time()):
+        _count(endpoint, "hits")
+        return pickle.loads(row[1])
+    _count(endpoint, "misses")
+    return None
+
+# this function calls the api and stores the result with the endpoint's ttl (runs on the upstream client's io threads,
+# once per upstream call no matter how many callers share it)
+def _fetch_and_store(endpoint: str, key: str, params: dict):
+    endpoint_cls, ttl_for = ENDPOINTS[endpoint]
+    now = time.time()
+    # the client already holds a stats.nba.com slot for us; give up on the socket when the caller does
+    frames = endpoint_cls(**params, timeout=UPSTREAM_TIMEOUT).get_data_frames()
+
+    # store it with this endpoint's ttl
+    ttl = ttl_for(params)
+    expires_at = None if ttl is None else now + ttl
+    try:
+        conn = _get_connection()
+        conn.execute(
+            "INSERT OR REPLACE INTO responses (key, endpoint, stored_at, expires_at, payload) VALUES (?, ?, ?, ?, ?)",
+            (key, endpoint, now, expires_at, pickle.dumps(frames, protocol=pickle.HIGHEST_PROTOCOL)),
+        )
+        conn.commit()
+    except sqlite3.Error as e:
+        print(f"[DEBUG] nba_api cache write failed: {e}")
+    return frames
+
+# this function returns the endpoint's dataframes from sqlite or the api
+def _fetch_endpoint_frames_cached(endpoint: str, key: str, params: dict):
+    frames = _read_cached(endpoint, key)
+    if frames is not None:
+        return frames
+
+    # miss (or expired): call the api, sharing the call with any identical one already in flight
+    if has_request_context():
+        g.nba_api_upstream_calls = g.get("nba_api_upstream_calls", 0) + 1
+    frames = call(key, STATS_NBA_HOST, _fetch_and_store, endpoint, key, params)
+    # callers sharing one call each get their own frames (shallow copies, so adding columns is safe)
+    return [f.copy(deep=False) for f in frames]
+
+# this coroutine is fetch_endpoint_frames for async views: waiting on the api doesn't hold a thread
+async def fetch_endpoint_frames_async(endpoint: str, **params):
+    key = make_cache_key(endpoint, params)
+    frames = _read_cached(endpoint, key)
+    if frames is None:
+        frames = await call_async(key, STATS_NBA_HOST, _fetch_and_store, endpoint, key, params)
+    return [f.copy(deep=False) for f in frames]
+
+# these helpers wrap the endpoints app.py uses
+def get_common_player_info(player_id):
+    return fetch_endpoint_frames("CommonPlayerInfo", player_id=player_id)
+
+def get_player_game_log(player_id, season=None, season_type_all_star=None):
+    # only pass parameters that were given so the key matches the call nba_api actually makes
+    params = {"player_id": player_id}
+    if season is not None:
+        params["season"] = season
+    if season_type_all_star is not None:
+        params["season_type_all_star"] = season_type_all_star
+    return fetch_endpoint_frames("PlayerGameLog", **params)
+
+def get_league_player_game_logs(season, season_type):
+    return fetch_endpoint_frames("PlayerGameLogs", season_nullable=season, season_type_nullable=season_type)
+
+def get_team_info_common(team_id):
+    return fetch_endpoint_frames("TeamInfoCommon", team_id=team_id)
+
+def get_common_team_roster(team_id, season):
+    return fetch_endpoint_frames("CommonTeamRoster", team_id=team_id, season=season)
+
+def get_player_index(season):
+    return fetch_endpoint_frames("PlayerIndex", season=season)
+
+# this function returns the hit/miss counters plus how big the store is
+def get_nba_api_cache_stats() -> dict:
+    with _stats_lock:
+        counters = {k: dict(v) for k, v in nba_api_cache_stats.items()}
+    try:
+        rows = _get_connection().execute(
+            "SELECT endpoint, COUNT(*), SUM(LENGTH(payload)) FROM responses GROUP BY endpoint"
+        ).fetchall()
+    except sqlite3.Error:
+        rows = []
+    return {
+        "counters": counters,
+        "entries": {endpoint: {"rows": count, "bytes": size or 0} for endpoint, count, size in rows},
+    }
+
+# this function deletes expired rows so the file doesn't grow forever
+def purge_expired() -> int:
+    conn = _get_connection()
+    cur = conn.execute("DELETE FROM responses WHERE expires_at IS NOT NULL AND expires_at <= ?", (time.time(),))
+    conn.commit()
+    return cur.rowcount
@@ -0,0 +1,88 @@
+# import time for the refresh interval
+import time
+# import threading so only one request rebuilds the directory
+import threading
+# import the prebuilt player name search index
+from player_search import search_players
+# import the cached league-wide player index call
+from nba_api_cache import get_player_index, current_season_str, PLAYER_INFO_TTL
+
+# how many players the players page shows per page / per "load more"
+PLAYERS_PAGE_SIZE = 50
+# after a failed refresh, how long the old directory is served before we try again (seconds)
+PLAYER_DIRECTORY_RETRY_SECONDS = 5 * 60
+
+# PlayerIndex abbreviates positions, CommonPlayerInfo (what the page used to show) spells them out
+POSITION_NAMES = {
+    "G": "Guard",
+    "F": "Forward",
+    "C": "Center",
+    "G-F": "Guard-Forward",
+    "F-G": "Forward-Guard",
+    "F-C": "Forward-Center",
+    "C-F": "Center-Forward",
+}
+
+# this keeps team + position for every player in memory
+# {"built_at": float, "retry_at": float, "by_id": {player_id: {"team_name": str, "position": str}}}
+_directory = {"built_at": 0.0, "retry_at": 0.0, "by_id": None}
+_directory_lock = threading.Lock()
+
+# this function turns blank / missing values into "N/A" like the old per-player lookup did
+def _value_or_na(val) -> str:
+    if val is None:
+        return "N/A"
+    text = str(val).strip()
+    return text if text and text.lower() != "nan" else "N/A"
+
+# this function builds {player_id: {team_name, position}} from one league-wide call
+def _build_directory() -> dict:
+    df = get_player_index(current_season_str())[0]
+    by_id = {}
+    for pid, team_name, position in zip(df["PERSON_ID"], df["TEAM_NAME"], df["POSITION"]):
+        position = _value_or_na(position)
+        by_id[int(pid)] = {"team_name": _value_or_na(team_name), "position": POSITION_NAMES.get(position, position)}
+    return by_id
+
+# this function tells if the directory needs a rebuild (stale, and not backing off after a failed one)
+def _needs_refresh(now: float) -> bool:
+    if now < _directory["retry_at"]:
+        return False
+    return _directory["by_id"] is None or now - _directory["built_at"] >= PLAYER_INFO_TTL
+
+# this function returns the in-memory directory, refreshing it once a day
+def get_player_directory() -> dict:
+    if not _needs_refresh(time.time()):
+        return _directory["by_id"] or {}
+
+    with _directory_lock:
+        # another thread may have refreshed it (or failed to) while we waited
+        if _needs_refresh(time.time()):
+            try:
+                _directory["by_id"] = _build_directory()
+                _directory["built_at"] = time.time()
+                _directory["retry_at"] = 0.0
+            except Exception as e:
+                print(f"[DEBUG] player directory refresh failed: {e}")
+                # keep serving the old snapshot (or an empty one), and don't try again until the window passes
+                _directory["retry_at"] = time.time() + PLAYER_DIRECTORY_RETRY_SECONDS
+        return _directory["by_id"] or {}
+
+# this function returns the rows the players table shows for a list of static player dicts
+def build_player_cards(player_list) -> list:
+    directory = get_player_directory()
+    cards = []
+    for player in player_list:
+        info = directory.get(player["id"], {})
+        cards.append({
+            "id": player["id"],
+            "full_name": player["full_name"],
+            "team_name": info.get("team_name", "N/A"),
+            "position": info.get("position", "N/A"),
+        })
+    return cards
+
+# this function filters active players by name and returns one page of player cards
+def get_players_page(query: str = "", offset: int = 0, limit: int = PLAYERS_PAGE_SIZE) -> list:
+    # ranked matches from the search index (all active players if there is no query)
+    return build_player_cards(search_players(query, offset=offset, limit=limit))
@@ -0,0 +1,181 @@
+# import os for paths and mtimes
+import os
+# import sys for the command line
+import sys
+# import time for the benchmark
+import time
+# import threading so two requests never load the table at the same time
+import threading
+# import numpy for the row position arrays
+import numpy as np
+# import pandas to work with tabular data
+import pandas as pd
+# import the parquet engine check (csv fallback without pyarrow)
+from game_history import HAS_PARQUET
+# import the shared thread pool to fetch every season at once
+from fetch_pool import fetch_in_parallel
+# import the cached league-wide player game logs endpoint
+from nba_api_cache import get_league_player_game_logs, current_season_str
+# import the shared atomic writer
+from atomic_write import atomic_write_frame
+
+# where the league-wide player game log table lives
+PLAYER_GAME_LOG_PATH = os.environ.get("PLAYER_GAME_LOG_PATH", "player_game_logs.parquet" if HAS_PARQUET else "player_game_logs.csv")
+
+# the seasons and season types the table covers by default (same ones the player pages search)
+PLAYER_LOG_SEASONS = ["2024-25", "2023-24", "2022-23"]
+PLAYER_LOG_SEASON_TYPES = ["Playoffs", "Regular Season"]
+
+# the columns we keep (the ones the player pages show), plus the parsed opponent
+PLAYER_LOG_COLUMNS = [
+    "PLAYER_ID", "PLAYER_NAME", "TEAM_ABBREVIATION", "OPP_ABBR", "GAME_ID", "GAME_DATE", "MATCHUP",
+    "SEASON_TYPE", "WL", "MIN", "PTS", "REB", "AST", "STL", "BLK", "TOV",
+    "FG_PCT", "FG3M", "FG3_PCT", "FT_PCT", "PLUS_MINUS",
+]
+PLAYER_LOG_TYPES = {
+    "PLAYER_ID": "int32",
+    "PLAYER_NAME": "category",
+    "TEAM_ABBREVIATION": "category",
+    "OPP_ABBR": "category",
+    "SEASON_TYPE": "category",
+    "WL": "category",
+    "FG_PCT": "float32",
+    "FG3_PCT": "float32",
+    "FT_PCT": "float32",
+    "PLUS_MINUS": "float32",
+}
+
+# this keeps the loaded table and its index, reloaded only when the file changes
+# {path: {"mtime": float, "df": DataFrame, "by_matchup": {(player_id, opp): positions}}}
+_table = {}
+_table_lock = threading.Lock()
+
+# this function turns PlayerGameLogs rows (any number of seasons) into the table's typed columns
+def build_player_log_rows(logs: pd.DataFrame, season_type: str = None) -> pd.DataFrame:
+    logs = logs.dropna(subset=["MATCHUP"])
+    if "SEASON_TYPE" not in logs.columns:
+        logs = logs.assign(SEASON_TYPE=season_type)
+    # MATCHUP: "LAL vs. NYK" or "LAL @ BOS", opponent is always the last part
+    logs = logs.assign(OPP_ABBR=logs["MATCHUP"].astype(str).str.split().str[-1].str.upper())
+    return _apply_player_log_types(logs.reindex(columns=PLAYER_LOG_COLUMNS))
+
+# this function gives the table its column types (safe to run twice)
+def _apply_player_log_types(df: pd.DataFrame) -> pd.DataFrame:
+    df = df.copy()
+    if not pd.api.types.is_datetime64_any_dtype(df["GAME_DATE"]):
+        df["GAME_DATE"] = pd.to_datetime(df["GAME_DATE"], errors="coerce")
+    df["GAME_ID"] = df["GAME_ID"].astype(str).str.zfill(10)
+    for col, dtype in PLAYER_LOG_TYPES.items():
+        df[col] = df[col].astype(dtype) if dtype == "category" else pd.to_numeric(df[col], errors="coerce").astype(dtype)
+    # counting stats: int16 when complete, float32 if a value is missing
+    # (PlayerGameLogs gives decimal minutes, ex. 34.5667, PlayerGameLog whole ones, so MIN is rounded to match)
+    for col in ("MIN", "PTS", "REB", "AST", "STL", "BLK", "TOV", "FG3M"):
+        numeric = pd.to_numeric(df[col], errors="coerce").round()
+        df[col] = numeric.astype("float32") if numeric.isna().any() else numeric.astype("int16")
+    return df
+
+# this function fetches every season + season type in one parallel batch and returns the combined table
+def build_player_game_logs(seasons: list = None, season_types: list = None, fetch=get_league_player_game_logs) -> pd.DataFrame:
+    tasks = [(season, st) for season in (seasons or PLAYER_LOG_SEASONS) for st in (season_types or PLAYER_LOG_SEASON_TYPES)]
+    frames = []
+    for (season, st), (result, error) in zip(tasks, fetch_in_parallel(fetch, tasks)):
+        # a missing season would make lookups silently wrong, so don't write a partial table
+        if error is not None:
+            raise RuntimeError(f"could not fetch player game logs for {season} {st}") from error
+        logs = result[0]
+        if logs is not None and not logs.empty:
+            frames.append(build_player_log_rows(logs, st))
+    return _combine_player_logs(frames)
+
+# this function combines typed frames into one table (a later frame's row wins when two have the same player + game)
+def _combine_player_logs(frames: list) -> pd.DataFrame:
+    if not frames:
+        return _apply_player_log_types(pd.DataFrame(columns=PLAYER_LOG_COLUMNS))
+    df = pd.concat([f.astype({c: object for c, t in PLAYER_LOG_TYPES.items() if t == "category"}) for f in frames], ignore_index=True)
+    df = df.drop_duplicates(subset=["PLAYER_ID", "GAME_ID"], keep="last").sort_values(["GAME_DATE", "GAME_ID", "PLAYER_ID"], kind="stable")
+    return _apply_player_log_types(df.reset_index(drop=True))
+
+# this function refetches some seasons (the one in progress by default) and merges them into the table
+# (the collector runs this after each ingest, so new games show up without a full rebuild)
+def refresh_player_game_logs(seasons: list = None, path: str = PLAYER_GAME_LOG_PATH, fetch=get_league_player_game_logs) -> pd.DataFrame:
+    fresh = build_player_game_logs(seasons or [current_season_str()], fetch=fetch)
+    entry = _get_table(path)
+    df = _combine_player_logs([entry["df"], fresh]) if entry is not None else fresh
+    write_player_game_logs(df, path)
+    return df
+
+# this function writes the table by writing a temp file first and renaming it over the target
+def write_player_game_logs(df: pd.DataFrame, path: str = PLAYER_GAME_LOG_PATH) -> None:
+    atomic_write_frame(df, path)
+
+# this function builds the (player_id, opponent) -> row positions index (positions sorted by date, oldest first)
+def build_player_log_index(df: pd.DataFrame) -> dict:
+    order = np.argsort(df["GAME_DATE"].to_numpy(), kind="stable")
+    ordered = df.iloc[order]
+    groups = ordered.groupby([ordered["PLAYER_ID"], ordered["OPP_ABBR"]], sort=False, observed=True).indices
+    return {(int(pid), str(opp)): order[v] for (pid, opp), v in groups.items()}
+
+# this function returns the table entry for path (None if the table hasn't been built), reloading only when the file changes
+def _get_table(path: str = PLAYER_GAME_LOG_PATH):
+    if not os.path.exists(path):
+        return None
+    mtime = os.path.getmtime(path)
+    entry = _table.get(path)
+    if entry is not None and entry["mtime"] == mtime:
+        return entry
+
+    with _table_lock:
+        entry = _table.get(path)
+        if entry is None or entry["mtime"] != mtime:
+            raw = pd.read_parquet(path) if path.endswith(".parquet") else pd.read_csv(path)
+            df = _apply_player_log_types(raw)
+            entry = {"mtime": mtime, "df": df, "by_matchup": build_player_log_index(df)}
+            _table[path] = entry
+        return entry
+
+# this function returns True when the league-wide table has been built
+def has_player_game_logs(path: str = PLAYER_GAME_LOG_PATH) -> bool:
+    return os.path.exists(path)
+
+# this function returns a player's last n games vs an opponent, newest first, shaped like PlayerGameLog rows
+# (None when the table hasn't been built, so callers can fall back to the api)
+def get_player_last_n_vs_opponent_logs(player_id: int, opponent_abbr: str, n: int = 5, path: str = PLAYER_GAME_LOG_PATH):
+    entry = _get_table(path)
+    if entry is None:
+        return None
+    positions = entry["by_matchup"].get((int(player_id), str(opponent_abbr or "").upper()), [])
+    games = entry["df"].iloc[positions[::-1][:n]]
+    # PlayerGameLog dates look like "APR 13, 2025"
+    return games.assign(GAME_DATE=games["GAME_DATE"].dt.strftime("%b %d, %Y").str.upper())
+
+# this function loads the table ahead of time so the first request doesn't pay for it
+def preload_player_game_logs(path: str = PLAYER_GAME_LOG_PATH) -> None:
+    try:
+        _get_table(path)
+    except Exception as e:
+        print(f"[DEBUG] preload_player_game_logs: could not load {path} -> {e}")
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] == "refresh":
+        start = time.perf_counter()
+        df = refresh_player_game_logs(sys.argv[2:] or None)
+        print(f"refreshed {PLAYER_GAME_LOG_PATH}: {len(df)} rows in {time.perf_counter() - start:.1f}s")
+        sys.exit(0)
+    if len(sys.argv) > 1 and sys.argv[1] == "build":
+        start = time.perf_counter()
+        df = build_player_game_logs(sys.argv[2:] or None)
+        write_player_game_logs(df)
+        print(f"wrote {PLAYER_GAME_LOG_PATH}: {len(df)} rows, {df['PLAYER_ID'].nunique()} players in {time.perf_counter() - start:.1f}s")
+        sys.exit(0)
+
+    # benchmark: indexed lookups for every (player, opponent) pair in the table
+    start = time.perf_counter()
+    entry = _get_table()
+    if entry is None:
+        sys.exit(f"{PLAYER_GAME_LOG_PATH} not found, run: python player_game_logs.py build")
+    print(f"loaded {len(entry['df'])} rows, {len(entry['by_matchup'])} (player, opponent) pairs in {(time.perf_counter() - start) * 1000:.1f} ms")
+    pairs = list(entry["by_matchup"])[:2000]
+    start = time.perf_counter()
+    for pid, opp in pairs:
+        get_player_last_n_vs_opponent_logs(pid, opp, 5)
+    print(f"last 5 vs opponent: {(time.perf_counter() - start) / len(pairs) * 1e6:.0f} us per lookup")
@@ -0,0 +1,80 @@
+# import unicodedata to fold accents (Dončić -> doncic)
+import unicodedata
+# import threading so the index is only built once
+import threading
+# import lru_cache so repeated queries (typeahead, "load more") reuse their ranked list
+from functools import lru_cache
+# import list of NBA players
+from nba_api.stats.static import players
+
+# this keeps the prebuilt search index over active players
+_index = {"players": None, "folded": None, "trigrams": None}
+_index_lock = threading.Lock()
+
+# this function lowercases a name and strips accents so searches ignore them
+def fold_name(text: str) -> str:
+    decomposed = unicodedata.normalize("NFKD", text or "")
+    return "".join(ch for ch in decomposed if not unicodedata.combining(ch)).lower().strip()
+
+# this function returns every 3 letter chunk of a string
+def _trigrams(text: str) -> set:
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+# this function builds the index once: folded names plus trigram -> player positions
+def _get_index() -> dict:
+    if _index["players"] is not None:
+        return _index
+
+    with _index_lock:
+        if _index["players"] is None:
+            active = players.get_active_players()
+            folded = [fold_name(p["full_name"]) for p in active]
+            trigrams = {}
+            for pos, name in enumerate(folded):
+                for tri in _trigrams(name):
+                    trigrams.setdefault(tri, []).append(pos)
+            _index["folded"] = folded
+            _index["trigrams"] = trigrams
+            _index["players"] = active
+    return _index
+
+# this function ranks a match: full name starts with the query, then a first/last name does, then anywhere
+def _rank(name: str, q: str) -> int:
+    if name.startswith(q):
+        return 0
+    if any(token.startswith(q) for token in name.split()):
+        return 1
+    return 2
+
+# this function returns the positions of every active player matching the query, best matches first
+@lru_cache(maxsize=2048)
+def _search_positions(q: str) -> tuple:
+    index = _get_index()
+    folded = index["folded"]
+
+    # no query: everyone in the original order
+    if not q:
+        return tuple(range(len(folded)))
+
+    # 3+ letters: only check players that share every trigram with the query
+    if len(q) >= 3:
+        postings = [index["trigrams"].get(tri) for tri in _trigrams(q)]
+        if any(p is None for p in postings):
+            return ()
+        postings.sort(key=len)
+        candidates = set(postings[0]).intersection(*postings[1:])
+    # 1-2 letters: scan the prefolded names
+    else:
+        candidates = range(len(folded))
+
+    matches = [pos for pos in candidates if q in folded[pos]]
+    # sort by rank then original order so offsets stay stable between pages
+    matches.sort(key=lambda pos: (_rank(folded[pos], q), pos))
+    return tuple(matches)
+
+# this function returns static player dicts ({id, full_name, ...}) matching the query, ranked
+def search_players(query: str, offset: int = 0, limit: int = None) -> list:
+    active = _get_index()["players"]
+    positions = _search_positions(fold_name(query))
+    end = None if limit is None else offset + limit
+    return [active[pos] for pos in positions[offset:end]]
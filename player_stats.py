@@ -2,8 +2,8 @@
 from nba_api.stats.static import players
 # import endpoints to retrieve player stats
 from nba_api.stats.endpoints import playercareerstats, commonplayerinfo
-# import teams for team names
-from nba_api.stats.static import teams
+# import the shared team registry for team names
+from team_registry import get_team_by_id
 # import pandas to work with tabular data
 import pandas as pd
 
@@ -21,15 +21,10 @@ def find_player_id(player_name):
 
 # this function will find the name of the team using the team id
 def get_team_name(team_id):
-    # search for all teams that match the team id
-    all_teams = teams.get_teams()
-    # iterate through all team names
-    for team in all_teams:
-        # if the team id matches the team id from teams, return the full name
-        if team['id'] == team_id:
-            return team['full_name']
-    # otherwise return error message
-    return "team not found"
+    # constant time lookup by id in the shared registry
+    team = get_team_by_id(team_id)
+    # if the team id matches, return the full name otherwise return error message
+    return team['full_name'] if team else "team not found"
 
 # this function will find and display the stats the searched player
 def display_player_stats(player_name):
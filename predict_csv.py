@@ -1,11 +1,13 @@
-# import pandas to work with tabular data
-import pandas as pd
 from sklearn.model_selection import train_test_split
 from sklearn.linear_model import LogisticRegression
 from sklearn.metrics import accuracy_score
+# import the model registry so we only retrain when the csv changes
+from model_registry import get_or_train_model, hash_training_data
+# import the typed game log reader (reads the columnar copy of the csv when there is one)
+from game_history import read_game_history
 
-# load our csv
-df = pd.read_csv("nba_games_2023_to_2025.csv")
+# load our games
+df = read_game_history("nba_games_2023_to_2025.csv")
 
 # print out the columns in our dataset
 # print("columns in dataset:")
@@ -29,21 +31,28 @@ X = df[['POINTS', 'REBOUNDS', 'ASSISTS', 'TURNOVERS', 'HOME/AWAY']]
 # this is what we want to predict
 y = df['WIN']
 
-# split our data into training and testing
-X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42)
+# this function trains the model and tests it on a held out 20%
+def train_model():
+    # split our data into training and testing
+    X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42)
 
-# train our model (allow more iteration so it can learn)
-model = LogisticRegression(max_iter=1000)
-model.fit(X_train, y_train)
+    # train our model (allow more iteration so it can learn)
+    model = LogisticRegression(max_iter=1000)
+    model.fit(X_train, y_train)
 
-# test our model
-predictions = model.predict(X_test)
-accuracy = accuracy_score(y_test, predictions)
-print(f"\nmodel accuracy: {accuracy:.2f}")
+    # test our model
+    predictions = model.predict(X_test)
+    accuracy = accuracy_score(y_test, predictions)
+    return model, X.columns, {"test_accuracy": float(accuracy)}
+
+# reuse the published model if it was trained on this exact data, otherwise train and publish a new one
+artifact = get_or_train_model("predict_csv", hash_training_data(X, y), train_model)
+model = artifact["model"]
+print(f"\nmodel accuracy: {artifact['metrics']['test_accuracy']:.2f} (model {artifact['version']})")
 
 def predict_for_team(team_name):
     # filter the datafram for that inputted team
-    team_games = df[df['TEAM NAME'].str.lower() == team_name.lower()]
+    team_games = df[df['TEAM KEY'] == team_name.strip().lower()]
 
     # check if we found the games
     if team_games.empty:
@@ -0,0 +1,88 @@
+# import os and json to read the tuned blend config
+import os
+import json
+# import numpy so the blend works for one game or whole arrays of games
+import numpy as np
+
+# the file tune_blend.py writes its best configuration to
+BLEND_CONFIG_PATH = os.environ.get("BLEND_CONFIG_PATH", "blend_config.json")
+
+# blend weights used by api_predict (easy to adjust)
+blend_weights = {
+    "model": 0.80,       # main signal: the small logistic regression
+    "h2h": 0.15,         # recent head-to-head
+    "home_court": 0.05,  # constant home-court baseline
+    "rest": 0.05,        # rest days effect
+}
+
+# form window, head-to-head meetings and rest bump used by api_predict (easy to adjust)
+blend_settings = {
+    "form_games": 10,            # last n games averaged for each team's form
+    "h2h_meetings": 6,           # last n meetings for head-to-head
+    "rest_bump_per_day": 0.02,   # bump per extra day of rest (clamped to 3 days)
+}
+
+# this function returns the home court advantage value
+def get_home_court_baseline_bump() -> float:
+    return 0.05
+
+# this function converts rest-days into a small probability bump for the home team
+# (works for one game or a numpy array of games; per_day defaults to blend_settings)
+def convert_rest_difference_to_bump(home_minus_away_days, per_day: float = None):
+    # clamp the value between -3 and +3 days
+    rd = np.clip(home_minus_away_days, -3, 3)
+    # each extra rest day adds a small bump (2% by default)
+    return (blend_settings["rest_bump_per_day"] if per_day is None else per_day) * rd
+
+# this function blends model, head-to-head, home court and rest into home/away percentages
+# (works for one game or numpy arrays of games; weights defaults to blend_weights)
+def blend_home_away_probabilities(p_home_win, p_away_win, h2h_home_win_rate, rest_bump, weights: dict = None):
+    # constant home-court baseline (tiny tilt toward home team)
+    home_court = get_home_court_baseline_bump()
+    # away rate is the complement
+    h2h_away_win_rate = 1.0 - h2h_home_win_rate
+
+    w = weights or blend_weights
+    blended_home = (
+        w["model"]      * p_home_win +             # model probability for home
+        w["h2h"]        * h2h_home_win_rate +      # recent h2h for home
+        w["home_court"] * (0.5 + home_court) +     # turn 5% edge into 55/45 source
+        w["rest"]       * (0.5 + rest_bump)        # rest bump as another small source
+    )
+    blended_away = (
+        w["model"]      * p_away_win +             # model probability for away
+        w["h2h"]        * h2h_away_win_rate +      # recent h2h for away (complement)
+        w["home_court"] * (0.5 - home_court) +     # opposite of home source
+        w["rest"]       * (0.5 - rest_bump)        # opposite of rest source
+    )
+
+    # normalize to exactly two buckets that sum to 100% (50/50 safety fallback, shouldn't happen)
+    total = blended_home + blended_away
+    safe_total = np.where(total > 0, total, 1.0)
+    home_pct = np.where(total > 0, 100.0 * blended_home / safe_total, 50.0)
+    away_pct = np.where(total > 0, 100.0 * blended_away / safe_total, 50.0)
+    return home_pct, away_pct
+
+# this function loads a tuned configuration into blend_weights / blend_settings (keeps the defaults if there is none)
+def load_blend_config(path: str = BLEND_CONFIG_PATH) -> bool:
+    if not os.path.exists(path):
+        return False
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            config = json.load(f)
+        weights = {key: float(config["weights"][key]) for key in blend_weights}
+        settings = {
+            "form_games": int(config["form_games"]),
+            "h2h_meetings": int(config["h2h_meetings"]),
+            "rest_bump_per_day": float(config["rest_bump_per_day"]),
+        }
+    except Exception as e:
+        print(f"[DEBUG] could not load blend config {path} -> {e}")
+        return False
+    # update in place so every module that imported these dicts sees the tuned values
+    blend_weights.update(weights)
+    blend_settings.update(settings)
+    return True
+
+# use the tuned configuration when tune_blend.py has written one
+load_blend_config()
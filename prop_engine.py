@@ -0,0 +1,116 @@
+# import sys for the benchmark's player count
+import sys
+# import time for the benchmark
+import time
+# import warnings to quiet numpy about players with no games for a stat
+import warnings
+# import numpy so every player, stat and line is priced in one array operation
+import numpy as np
+# import pandas to turn game rows into a stat matrix
+import pandas as pd
+# import the normal distribution for over/under probabilities
+from scipy.stats import norm
+
+# the stats props are priced on, in matrix column order
+PROP_STATS = ["PTS", "3PM", "REB", "AST", "TOV"]
+
+# default lines when a request doesn't give its own (easy to adjust)
+DEFAULT_PROP_LINES = {
+    "PTS": [10, 15, 20],   # thresholds for points
+    "3PM": [2, 3, 4],      # 3-pointers made
+    "REB": [5, 7, 10],     # rebounds
+    "AST": [3, 5, 7],      # assists
+    "TOV": [2, 3, 5],      # turnovers
+}
+
+# this function turns game rows (dicts keyed by stat) into a games x stats float matrix, NaN where a value is missing
+def build_stat_matrix(rows: list, stats: list = PROP_STATS) -> np.ndarray:
+    frame = pd.DataFrame(list(rows), columns=stats)
+    return frame.apply(pd.to_numeric, errors="coerce").to_numpy(dtype=float).reshape(-1, len(stats))
+
+# this function stacks players' stat matrices into one players x games x stats array (short logs padded with NaN)
+def stack_stat_matrices(matrices: list, stats: list = PROP_STATS) -> np.ndarray:
+    most_games = max([len(m) for m in matrices] + [0])
+    stacked = np.full((len(matrices), most_games, len(stats)), np.nan)
+    for i, matrix in enumerate(matrices):
+        stacked[i, :len(matrix)] = matrix
+    return stacked
+
+# this function returns the mean, std and game count of every player's stats (players x stats arrays)
+def compute_stat_distributions(stacked: np.ndarray) -> tuple:
+    counts = (~np.isnan(stacked)).sum(axis=1)
+    with warnings.catch_warnings():
+        # players with no games for a stat give NaN here and are reported as "No data"
+        warnings.simplefilter("ignore", RuntimeWarning)
+        mean = np.nanmean(stacked, axis=1)
+        std = np.nanstd(stacked, axis=1)
+    # a stat that never changed has no spread, fall back to 1.0 like the old per-stat loop
+    std = np.where(std > 0, std, 1.0)
+    return mean, std, counts
+
+# this function returns the chance of going over every line (lines is players x stats x k, NaN where a player has fewer lines)
+def price_prop_lines(mean: np.ndarray, std: np.ndarray, lines: np.ndarray) -> np.ndarray:
+    # probability over threshold = 1 - CDF(line)
+    return 1 - norm.cdf(lines, loc=mean[..., None], scale=std[..., None])
+
+# this function builds the players x stats x k line array for each player's {stat: [lines]} (missing stats use the defaults)
+def build_line_array(lines_per_player: list, stats: list = PROP_STATS) -> tuple:
+    resolved = [{stat: list((lines or {}).get(stat, DEFAULT_PROP_LINES.get(stat, []))) for stat in stats} for lines in lines_per_player]
+    most_lines = max([len(v) for player in resolved for v in player.values()] + [0])
+    array = np.full((len(resolved), len(stats), most_lines), np.nan)
+    for i, player in enumerate(resolved):
+        for j, stat in enumerate(stats):
+            array[i, j, :len(player[stat])] = player[stat]
+    return array, resolved
+
+# this function prices every player's lines at once and returns, per player, {stat: [{"condition", "prob"}, ...]}
+def price_props(matrices: list, lines_per_player: list = None, stats: list = PROP_STATS) -> list:
+    """
+    matrices are games x stats arrays from build_stat_matrix (one per player).
+    lines_per_player is a {stat: [lines]} dict per player (None = the defaults).
+    """
+    if not matrices:
+        return []
+    lines_per_player = lines_per_player or [None] * len(matrices)
+
+    mean, std, counts = compute_stat_distributions(stack_stat_matrices(matrices, stats))
+    line_array, resolved = build_line_array(lines_per_player, stats)
+    over = price_prop_lines(mean, std, line_array)
+    p_over = np.round(100 * over, 1)
+    p_under = np.round(100 * (1 - over), 1)
+
+    # shape the arrays back into the per stat lists the frontend reads
+    results = []
+    for i, player in enumerate(resolved):
+        features = {}
+        for j, stat in enumerate(stats):
+            if counts[i, j] == 0:
+                features[stat] = [{"condition": "N/A", "prob": "No data"}]
+                continue
+            feature_probs = []
+            for k, line in enumerate(player[stat]):
+                feature_probs.append({"condition": f"Over {line}", "prob": float(p_over[i, j, k])})
+                feature_probs.append({"condition": f"Under {line}", "prob": float(p_under[i, j, k])})
+            features[stat] = feature_probs
+        results.append(features)
+    return results
+
+if __name__ == "__main__":
+    # benchmark: a whole slate of players (5 recent games each), one player at a time vs one array call
+    players = int(sys.argv[1]) if len(sys.argv) > 1 else 300
+    rng = np.random.default_rng(0)
+    matrices = [rng.poisson([18, 2, 6, 4, 2], size=(5, len(PROP_STATS))).astype(float) for _ in range(players)]
+
+    start = time.perf_counter()
+    one_at_a_time = [price_props([m])[0] for m in matrices]
+    single_ms = (time.perf_counter() - start) * 1000
+
+    start = time.perf_counter()
+    batched = price_props(matrices)
+    batch_ms = (time.perf_counter() - start) * 1000
+
+    assert batched == one_at_a_time
+    lines = players * sum(len(v) for v in DEFAULT_PROP_LINES.values())
+    print(f"{players} players, {lines} lines")
+    print(f"one player per call: {single_ms:7.1f} ms")
+    print(f"one batch call:      {batch_ms:7.1f} ms ({single_ms / batch_ms:.1f}x faster)")
@@ -0,0 +1,137 @@
+# import os for env config
+import os
+# import time for ttl bookkeeping
+import time
+# import hashlib to build ETags from response bodies
+import hashlib
+# import threading to guard the cache table
+import threading
+# import functools to keep the view's name on the wrapper
+import functools
+# import flask pieces to key on the request and build conditional responses
+from flask import request, current_app, Response
+# import the shared game log so entries can tell when a team's games changed
+from game_log_store import get_game_log, get_game_log_index
+
+# how long each route's responses are served before they are rebuilt (seconds, easy to adjust)
+RESPONSE_CACHE_TTLS = {
+    "team_stats": 15 * 60,
+    "game_page": 5 * 60,
+    "players_stats_page": 30 * 60,
+    "api_predict": 10 * 60,
+    "api_player_predict": 10 * 60,
+}
+# ttl for a route missing from the table above
+RESPONSE_CACHE_DEFAULT_TTL = 5 * 60
+# most responses kept in memory
+RESPONSE_CACHE_MAX_ENTRIES = int(os.environ.get("RESPONSE_CACHE_MAX_ENTRIES", 2000))
+
+# counters per route: hits (served from memory), misses (built), invalidated (dropped because a team's games or
+# the model changed), not_modified (304s, from memory or after a rebuild that came out the same)
+# {"team_stats": {"hits": 0, "misses": 0, "invalidated": 0, "not_modified": 0}, ...}
+response_cache_stats = {}
+
+# this keeps one response per (route, url arguments, query string)
+# {key: {"body": bytes, "status": int, "headers": list, "etag": str, "expires_at": float, "stamp": tuple}}
+_responses = {}
+_responses_lock = threading.Lock()
+
+# this function counts an event for a route (call with _responses_lock held)
+def _count(route: str, kind: str) -> None:
+    counters = response_cache_stats.setdefault(route, {"hits": 0, "misses": 0, "invalidated": 0, "not_modified": 0})
+    counters[kind] += 1
+
+# this function returns the counters per route
+def get_response_cache_stats() -> dict:
+    with _responses_lock:
+        return {"entries": len(_responses), "routes": {route: dict(c) for route, c in response_cache_stats.items()}}
+
+# this function returns what a team's cached pages depend on: how many games it has in the shared game log and the newest one
+# (an ingest that adds games for the team changes it, other teams' stamps stay the same)
+def team_stamp(team_abbr: str) -> tuple:
+    index = get_game_log_index(get_game_log())
+    positions = index["by_abbr"].get((team_abbr or "").upper(), [])
+    if len(positions) == 0:
+        return (0, None)
+    return (len(positions), str(index["dates"][positions[-1]]))
+
+# this function forgets cached responses (all of them, or only one route's)
+def clear_response_cache(route: str = None) -> None:
+    with _responses_lock:
+        for key in [k for k in _responses if route is None or k[0] == route]:
+            del _responses[key]
+
+# this function drops expired entries, then the oldest ones, until the table fits (call with _responses_lock held)
+def _prune(now: float) -> None:
+    if len(_responses) <= RESPONSE_CACHE_MAX_ENTRIES:
+        return
+    for key in [k for k, e in _responses.items() if e["expires_at"] <= now]:
+        del _responses[key]
+    while len(_responses) > RESPONSE_CACHE_MAX_ENTRIES:
+        del _responses[next(iter(_responses))]
+
+# this function returns a response for the cached body that answers 304 when the browser already has it
+def _conditional(body: bytes, status: int, headers: list, etag: str) -> Response:
+    response = Response(body, status=status, headers=headers)
+    response.set_etag(etag)
+    # let browsers and proxies keep a copy, but revalidate it every time (cheap 304s, and invalidation is honored)
+    response.headers["Cache-Control"] = "no-cache"
+    return response.make_conditional(request)
+
+# this decorator caches a GET route's response per url arguments and query string
+def cached_response(teams=None, model_version=None):
+    """
+    teams(**view_args) returns the team abbreviations the response is built
+    from; the entry is dropped once any of their games change. model_version()
+    returns the version of the model behind the response; the entry is dropped
+    when it changes. The ttl comes from RESPONSE_CACHE_TTLS (by view name).
+    Only 200 responses are stored.
+    """
+    def decorator(view):
+        route = view.__name__
+        ttl = RESPONSE_CACHE_TTLS.get(route, RESPONSE_CACHE_DEFAULT_TTL)
+
+        @functools.wraps(view)
+        def wrapper(**view_args):
+            key = (route, tuple(sorted(view_args.items())), tuple(sorted(request.args.items(multi=True))))
+            stamp = (
+                tuple((abbr, team_stamp(abbr)) for abbr in (teams(**view_args) if teams else [])),
+                model_version() if model_version else None,
+            )
+            now = time.monotonic()
+
+            with _responses_lock:
+                entry = _responses.get(key)
+                if entry is not None and entry["expires_at"] > now and entry["stamp"] != stamp:
+                    _count(route, "invalidated")
+                    entry = None
+                if entry is not None and entry["expires_at"] > now:
+                    _count(route, "hits")
+                else:
+                    _count(route, "misses")
+                    entry = None
+
+            if entry is None:
+                built = current_app.make_response(view(**view_args))
+                body = built.get_data()
+                entry = {
+                    "body": body,
+                    "status": built.status_code,
+                    "headers": [(k, v) for k, v in built.headers.items() if k.lower() not in ("content-length", "etag", "cache-control")],
+                    "etag": hashlib.sha1(body).hexdigest(),
+                    "expires_at": now + ttl,
+                    "stamp": stamp,
+                }
+                if built.status_code != 200:
+                    return built
+                with _responses_lock:
+                    _responses[key] = entry
+                    _prune(now)
+
+            response = _conditional(entry["body"], entry["status"], entry["headers"], entry["etag"])
+            if response.status_code == 304:
+                with _responses_lock:
+                    _count(route, "not_modified")
+            return response
+        return wrapper
+    return decorator
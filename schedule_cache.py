@@ -0,0 +1,309 @@
+# import os for env config and file checks
+import os
+# import json to parse and persist the schedule
+import json
+# import time for ttl bookkeeping
+import time
+# import threading so only one request revalidates at a time
+import threading
+# import datetime and zoneinfo to normalize tip-off times once
+from datetime import datetime
+from zoneinfo import ZoneInfo
+# import the upstream client to download the schedule from the nba cdn (pooled, identical downloads shared)
+from upstream_client import http_get
+# import the shared atomic writer for the on-disk copy
+from atomic_write import atomic_write_text
+
+# where the schedule comes from, a local file path (or file://) can stand in for the cdn
+SCHEDULE_URL = os.environ.get(
+    "NBA_SCHEDULE_URL", "https://cdn.nba.com/static/json/staticData/scheduleLeagueV2.json"
+)
+# where the last good copy is kept on disk so restarts don't need the network
+SCHEDULE_CACHE_PATH = os.environ.get("NBA_SCHEDULE_CACHE_PATH", "schedule_cache.json")
+# how long a cached schedule is served before we revalidate it (seconds)
+SCHEDULE_TTL_SECONDS = float(os.environ.get("NBA_SCHEDULE_TTL_SECONDS", 15 * 60))
+# after a failed revalidation, how long the last good copy is served before we try the cdn again (seconds)
+SCHEDULE_RETRY_SECONDS = float(os.environ.get("NBA_SCHEDULE_RETRY_SECONDS", 60))
+
+# this keeps the parsed schedule in memory along with its validators
+_cache = {
+    "data": None,           # parsed json
+    "etag": None,           # ETag from the last 200 response
+    "last_modified": None,  # Last-Modified from the last 200 response
+    "fetched_at": 0.0,      # when we last got a 200 or 304
+}
+_cache_lock = threading.Lock()
+# when the next revalidation may run after a failed one (0 = no failure pending), kept out of the on-disk copy
+_backoff = {"retry_at": 0.0}
+
+# counters so we can see how often we actually hit the network
+schedule_cache_stats = {"hits": 0, "revalidated": 0, "downloads": 0, "stale_served": 0, "errors": 0}
+
+# this function tells if the source is a local file instead of a url
+def _local_source_path(source: str):
+    if source.startswith("file://"):
+        return source[len("file://"):]
+    if "://" not in source:
+        return source
+    return None
+
+# this function fetches the schedule, returns (status, data, etag, last_modified)
+# status is 200 for a new body or 304 if our copy is still current
+def _fetch_schedule(source: str, etag, last_modified, timeout: float):
+    local_path = _local_source_path(source)
+
+    # local file stand-in: use the file's mtime as its Last-Modified validator
+    if local_path is not None:
+        mtime = str(os.path.getmtime(local_path))
+        if last_modified == mtime:
+            return 304, None, etag, last_modified
+        with open(local_path, "r", encoding="utf-8") as f:
+            return 200, json.load(f), None, mtime
+
+    # uses user agent so nba.com doesn't reject the request
+    headers = {"User-Agent": "Mozilla/5.0"}
+    if etag:
+        headers["If-None-Match"] = etag
+    if last_modified:
+        headers["If-Modified-Since"] = last_modified
+
+    resp = http_get(source, headers=headers, timeout=timeout)
+    if resp.status_code == 304:
+        return 304, None, etag, last_modified
+    resp.raise_for_status()
+    return 200, resp.json(), resp.headers.get("ETag"), resp.headers.get("Last-Modified")
+
+# this function loads the last good schedule from disk into memory (if we have nothing yet)
+def _load_from_disk(path: str) -> None:
+    if _cache["data"] is not None or not os.path.exists(path):
+        return
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            saved = json.load(f)
+        _cache.update({
+            "data": saved.get("data"),
+            "etag": saved.get("etag"),
+            "last_modified": saved.get("last_modified"),
+            "fetched_at": float(saved.get("fetched_at", 0.0)),
+        })
+    except Exception as e:
+        print(f"[DEBUG] schedule cache: could not read {path} -> {e}")
+
+# this function saves the schedule and its validators to disk (write temp file then rename)
+def _save_to_disk(path: str) -> None:
+    try:
+        atomic_write_text(path, json.dumps(_cache))
+    except Exception as e:
+        print(f"[DEBUG] schedule cache: could not write {path} -> {e}")
+
+# this function returns the parsed schedule json, downloading it only when the ttl has passed
+def get_schedule(timeout: float = 6.0, ttl_seconds: float = None):
+    """
+    Returns the parsed scheduleLeagueV2 json (or None if we have never been able to get it).
+    Fresh copies come from memory, stale ones are revalidated with ETag/If-Modified-Since,
+    and if the cdn is down the last good copy is served (retrying at most once per
+    SCHEDULE_RETRY_SECONDS).
+    """
+    ttl = SCHEDULE_TTL_SECONDS if ttl_seconds is None else ttl_seconds
+
+    # fast path: fresh copy in memory, no network
+    if _cache["data"] is not None and time.time() - _cache["fetched_at"] < ttl:
+        schedule_cache_stats["hits"] += 1
+        return _cache["data"]
+
+    # backing off after a failure: serve what we have without waiting on the lock
+    if time.time() < _backoff["retry_at"]:
+        schedule_cache_stats["stale_served"] += 1
+        return _cache["data"]
+
+    with _cache_lock:
+        # after a restart, pick up the copy saved on disk
+        _load_from_disk(SCHEDULE_CACHE_PATH)
+
+        # another thread may have refreshed it while we waited
+        if _cache["data"] is not None and time.time() - _cache["fetched_at"] < ttl:
+            schedule_cache_stats["hits"] += 1
+            return _cache["data"]
+        # another thread already retried in this window (and failed)
+        if time.time() < _backoff["retry_at"]:
+            schedule_cache_stats["stale_served"] += 1
+            return _cache["data"]
+
+        try:
+            status, data, etag, last_modified = _fetch_schedule(
+                SCHEDULE_URL, _cache["etag"], _cache["last_modified"], timeout
+            )
+        except Exception as e:
+            print("[DEBUG] schedule fetch failed:", e)
+            schedule_cache_stats["errors"] += 1
+            # serve stale data when the cdn is down, and don't try again until the window passes
+            _backoff["retry_at"] = time.time() + SCHEDULE_RETRY_SECONDS
+            if _cache["data"] is not None:
+                schedule_cache_stats["stale_served"] += 1
+            return _cache["data"]
+
+        if status == 304 and _cache["data"] is not None:
+            schedule_cache_stats["revalidated"] += 1
+        else:
+            schedule_cache_stats["downloads"] += 1
+            _cache.update({"data": data, "etag": etag, "last_modified": last_modified})
+        _cache["fetched_at"] = time.time()
+        _backoff["retry_at"] = 0.0
+        _save_to_disk(SCHEDULE_CACHE_PATH)
+        return _cache["data"]
+
+# this function returns the list of gameDate blocks from the schedule (or [] if unavailable)
+def get_schedule_game_dates(timeout: float = 6.0):
+    data = get_schedule(timeout=timeout)
+    if not data:
+        return []
+    return data.get("leagueSchedule", {}).get("gameDates", [])
+
+# this keeps the index built from the schedule currently in memory
+_index = {"data": None, "index": None}
+_index_lock = threading.Lock()
+
+# this helper function takes any value and ensures its a clean string
+def _clean(val):
+    # if its not a string, return ""
+    if not isinstance(val, str):
+        return ""
+    # if its TBD, (TBD) or empty, return "" otherwise return stripped string
+    v = val.strip()
+    return "" if v in {"", "TBD", "(TBD)"} else v
+
+# this function parses one schedule game into the fields our routes use
+def _normalize_game(g: dict, ET: ZoneInfo) -> dict:
+    # extract homeTeam and awayTeam blocks from json or {} if missing
+    home = (g.get("homeTeam") or {})
+    away = (g.get("awayTeam") or {})
+    home_tri = home.get("teamTricode")
+    away_tri = away.get("teamTricode")
+    home_abbr = home_tri.upper() if isinstance(home_tri, str) else ""
+    away_abbr = away_tri.upper() if isinstance(away_tri, str) else ""
+    game_id = str(g.get("gameId", ""))
+
+    # builds full name of teams by combining city and name
+    home_full = f"{(home.get('teamCity') or '').strip()} {(home.get('teamName') or '').strip()}".strip()
+    away_full = f"{(away.get('teamCity')  or '').strip()} {(away.get('teamName')  or '').strip()}".strip()
+
+    # convert the tip off time from iso string to utc datetime and eastern date once
+    when = None
+    date_et = ""
+    date_iso = ""
+    dt_str = g.get("gameDateTimeUTC")
+    if isinstance(dt_str, str) and dt_str:
+        try:
+            when = datetime.fromisoformat(dt_str.replace("Z", "+00:00"))
+            date_et = when.astimezone(ET).strftime("%B %d, %Y")
+            date_iso = when.astimezone(ET).strftime("%Y-%m-%d")
+        except Exception:
+            when = None
+
+    # extract match type and week/game info
+    game_label = (g.get("gameLabel") or "").strip()
+    game_sub   = (g.get("gameSubLabel") or "").strip()
+    week_name  = (g.get("weekName") or "").strip()
+    label_part = f"{game_label} : {game_sub}" if (game_label and game_sub) else game_label
+
+    # figures out the type of game, falling back to the gameId prefix
+    label = _clean(g.get("gameLabel"))
+    game_type = label or {
+        "001": "Preseason",
+        "002": "Regular Season",
+        "003": "All-Star",
+        "004": "Playoffs",
+        "005": "Play-In",
+    }.get(game_id[:3], "Unknown")
+
+    # notes for the upcoming games table (week name plus label, using game type if no label)
+    label_for_notes = label or game_type
+    sub_clean = _clean(g.get("gameSubLabel"))
+    upcoming_label = f"{label_for_notes} : {sub_clean}" if (label_for_notes and sub_clean) else label_for_notes
+    upcoming_notes = ", ".join([x for x in (_clean(g.get("weekName")), upcoming_label) if x])
+
+    return {
+        "game_id": game_id,
+        "when": when,
+        "date_iso": date_iso,  # eastern date as YYYY-MM-DD
+        # shape returned by find_game_in_schedule
+        "meta": {
+            "home_full": home_full or (home.get("teamTricode") or "Home Team"),
+            "away_full": away_full or (away.get("teamTricode") or "Away Team"),
+            "home_abbr": home_abbr,
+            "away_abbr": away_abbr,
+            "arena": (g.get("arenaName") or "").strip(),
+            "date_et": date_et,
+            "time_et_text": (g.get("gameStatusText") or "").upper().strip(),
+            "label": game_label,
+            "sub_label": game_sub,
+            "notes": ", ".join([x for x in (week_name, label_part) if x]),
+        },
+        # shape returned by get_upcoming_games (is_home is added per team)
+        "upcoming": {
+            "game_id": game_id,
+            "date": date_et,
+            "time_et": _clean(g.get("gameStatusText")) or "(TBD)",
+            "home_abbr": home_abbr,
+            "away_abbr": away_abbr,
+            "game_type": game_type,
+            "arena": _clean(g.get("arenaName")) or "(TBD)",
+            "notes": upcoming_notes,
+        },
+    }
+
+# this function builds lookups by game id and by team tricode from the schedule json
+def build_schedule_index(data: dict) -> dict:
+    """
+    by_id maps gameId -> normalized game, by_team maps tricode -> games sorted by
+    tip-off time and team_whens holds the matching tip-off times for bisect.
+    by_date maps an eastern YYYY-MM-DD date -> that day's games and all_games
+    holds every timed game sorted by tip-off.
+    """
+    ET = ZoneInfo("America/New_York")
+    by_id = {}
+    by_team = {}
+
+    game_dates = (data or {}).get("leagueSchedule", {}).get("gameDates", [])
+    for gd in game_dates:
+        for g in gd.get("games", []):
+            game = _normalize_game(g, ET)
+            by_id.setdefault(game["game_id"], game)
+
+            # only games with both teams and a valid tip-off time go in the per-team lists
+            home = game["upcoming"]["home_abbr"]
+            away = game["upcoming"]["away_abbr"]
+            if not home or not away or game["when"] is None:
+                continue
+            by_team.setdefault(home, []).append(game)
+            by_team.setdefault(away, []).append(game)
+
+    for team_games in by_team.values():
+        team_games.sort(key=lambda x: x["when"])
+
+    # every game with a tip-off time, in order, plus the same games grouped by eastern date
+    all_games = sorted((x for x in by_id.values() if x["when"] is not None), key=lambda x: x["when"])
+    by_date = {}
+    for game in all_games:
+        by_date.setdefault(game["date_iso"], []).append(game)
+
+    return {
+        "by_id": by_id,
+        "by_team": by_team,
+        "team_whens": {t: [x["when"] for x in team_games] for t, team_games in by_team.items()},
+        "by_date": by_date,
+        "all_games": all_games,
+        "all_whens": [x["when"] for x in all_games],
+    }
+
+# this function returns the index for the schedule currently cached, rebuilding it only when the schedule changes
+def get_schedule_index(timeout: float = 6.0) -> dict:
+    data = get_schedule(timeout=timeout)
+    if _index["data"] is data and _index["index"] is not None:
+        return _index["index"]
+
+    with _index_lock:
+        if _index["data"] is not data or _index["index"] is None:
+            _index["index"] = build_schedule_index(data)
+            _index["data"] = data
+        return _index["index"]
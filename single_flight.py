@@ -0,0 +1,139 @@
+# import os for env config
+import os
+# import sys for the benchmark's client count
+import sys
+# import time for the linger window and the benchmark
+import time
+# import threading for the in-flight table and the wait events
+import threading
+# import functools to keep the view's name on the wrapper
+import functools
+# import flask pieces to key on the request and rebuild responses for every waiter
+from flask import request, current_app, Response
+# import the per-request upstream call counter
+from nba_api_cache import get_request_upstream_calls
+
+# how long a finished response keeps answering identical requests (seconds, 0 = only while in flight)
+SINGLE_FLIGHT_LINGER_SECONDS = float(os.environ.get("SINGLE_FLIGHT_LINGER_SECONDS", 2))
+# how long a waiter waits for the request it joined before computing on its own (seconds)
+SINGLE_FLIGHT_WAIT_SECONDS = float(os.environ.get("SINGLE_FLIGHT_WAIT_SECONDS", 30))
+
+# counters per route: computed (ran the view), waits (joined one in flight), hits (served a lingering result),
+# upstream_calls (nba_api calls the computed requests made)
+# {"game_page": {"computed": 0, "waits": 0, "hits": 0, "upstream_calls": 0}, ...}
+single_flight_stats = {}
+
+# this keeps one entry per key: in flight ({"done": Event}) or finished ({"done": set Event, "response": ..., "expires_at": ...})
+_flights = {}
+_flights_lock = threading.Lock()
+
+# this function counts an event for a route (call with _flights_lock held)
+def _count(route: str, kind: str, amount: int = 1) -> None:
+    counters = single_flight_stats.setdefault(route, {"computed": 0, "waits": 0, "hits": 0, "upstream_calls": 0})
+    counters[kind] += amount
+
+# this function returns the counters per route
+def get_single_flight_stats() -> dict:
+    with _flights_lock:
+        return {route: dict(counters) for route, counters in single_flight_stats.items()}
+
+# this function returns the key for the current request: route, its url arguments and its query string
+def _request_key(route: str, view_args: dict) -> tuple:
+    return (route, tuple(sorted(view_args.items())), tuple(sorted(request.args.items(multi=True))))
+
+# this function freezes a view's return value into (body, status, headers) so every waiter can get its own copy
+def _freeze(rv) -> tuple:
+    response = current_app.make_response(rv)
+    return response.get_data(), response.status_code, list(response.headers.items())
+
+# this function builds a fresh response from a frozen one
+def _thaw(frozen: tuple) -> Response:
+    body, status, headers = frozen
+    return Response(body, status=status, headers=headers)
+
+# this decorator makes identical concurrent requests to a GET route share one computation
+def single_flight(view):
+    """
+    The first request for a key runs the view; identical requests that arrive
+    while it runs wait for its response instead of repeating the schedule
+    download and nba_api fetches. The response keeps answering for
+    SINGLE_FLIGHT_LINGER_SECONDS after it finishes. Errors are not shared:
+    waiters whose leader failed run the view themselves.
+    """
+    route = view.__name__
+
+    @functools.wraps(view)
+    def wrapper(**view_args):
+        key = _request_key(route, view_args)
+        now = time.monotonic()
+
+        with _flights_lock:
+            flight = _flights.get(key)
+            if flight is not None and flight["done"].is_set() and flight["expires_at"] <= now:
+                flight = None
+            if flight is None:
+                flight = {"done": threading.Event(), "response": None, "expires_at": 0.0}
+                _flights[key] = flight
+                leader = True
+            else:
+                leader = False
+                _count(route, "hits" if flight["done"].is_set() else "waits")
+
+        if not leader:
+            if flight["done"].wait(SINGLE_FLIGHT_WAIT_SECONDS) and flight["response"] is not None:
+                return _thaw(flight["response"])
+            # the leader failed or is taking too long: compute our own copy (not shared)
+            return view(**view_args)
+
+        frozen = None
+        try:
+            frozen = _freeze(view(**view_args))
+            return _thaw(frozen)
+        finally:
+            with _flights_lock:
+                _count(route, "computed")
+                _count(route, "upstream_calls", get_request_upstream_calls())
+                flight["response"] = frozen
+                flight["expires_at"] = time.monotonic() + SINGLE_FLIGHT_LINGER_SECONDS
+                # failed or not worth keeping: drop it so the next request computes again
+                if frozen is None or SINGLE_FLIGHT_LINGER_SECONDS <= 0:
+                    if _flights.get(key) is flight:
+                        del _flights[key]
+                # forget expired results so the table doesn't grow forever
+                cutoff = time.monotonic()
+                for stale in [k for k, f in _flights.items() if f["done"].is_set() and f["expires_at"] <= cutoff]:
+                    del _flights[stale]
+                flight["done"].set()
+    return wrapper
+
+# quick benchmark: many clients opening the same slow page at once, with and without single-flight
+if __name__ == "__main__":
+    from concurrent.futures import ThreadPoolExecutor
+    from flask import Flask
+
+    clients = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+    work_seconds = 0.3
+    bench = Flask(__name__)
+    runs = {"count": 0}
+    runs_lock = threading.Lock()
+
+    def slow_page(game_id):
+        with runs_lock:
+            runs["count"] += 1
+        # stands in for the schedule download and nba_api fetches
+        time.sleep(work_seconds)
+        return f"<h1>game {game_id}</h1>"
+
+    bench.add_url_rule("/plain/<game_id>", "plain_page", slow_page)
+    bench.add_url_rule("/game/<game_id>", "game_page", single_flight(slow_page))
+    client = bench.test_client()
+
+    for label, path in [("without single-flight", "/plain/0022500001"), ("with single-flight", "/game/0022500001")]:
+        runs["count"] = 0
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=clients) as pool:
+            bodies = list(pool.map(lambda _: client.get(path).data, range(clients)))
+        elapsed = time.perf_counter() - start
+        assert len(set(bodies)) == 1
+        print(f"{clients} identical requests {label:22s} {elapsed:5.2f}s, view ran {runs['count']} times")
+    print(get_single_flight_stats())
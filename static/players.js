@@ -1,11 +1,11 @@
-// keep track of how many players we've already loaded
-let offset = 5;
-
 document.addEventListener("DOMContentLoaded", function () {
     // get the button and table body from the html
     const loadButton = document.querySelector(".load-players-button");
     const tableBody = document.querySelector("table tbody");
 
+    // keep track of how many players we've already loaded (the first page is rendered by the server)
+    let offset = tableBody.rows.length;
+
     // read current search query (empty string if none)
     const currentQuery = loadButton?.dataset?.query || "";
 
@@ -16,7 +16,7 @@ document.addEventListener("DOMContentLoaded", function () {
         // shows loading text
         loadButton.textContent = "Loading...";
 
-        // ask server for next 5 players
+        // ask server for the next page of players
         fetch(`/load_players?offset=${offset}&q=${encodeURIComponent(currentQuery)}`).then(response => response.json()).then(data => {
             // for each player we get back
             data.forEach(player => {
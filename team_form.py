@@ -0,0 +1,134 @@
+# import threading so two requests never build the same table at the same time
+import threading
+# import numpy for the column arrays and binary searches
+import numpy as np
+# import pandas for the groupby-rolling pass
+import pandas as pd
+# import the shared game log index (row positions per team / matchup, oldest first)
+from game_log_store import get_game_log_index
+# import the form window / head-to-head settings api_predict uses (tuned by tune_blend.py)
+from prediction_blend import blend_settings
+
+# how many recent games make up a team's form, and how many meetings make up head-to-head
+FORM_GAMES = 10
+H2H_MEETINGS = 6
+# the stats averaged over the last FORM_GAMES games (same order the win model is trained on)
+FORM_STATS = ["POINTS", "REBOUNDS", "ASSISTS", "TURNOVERS"]
+
+# this keeps the table built for the game log currently loaded
+# {"df": DataFrame, "table": dict}
+_tables = {"df": None, "table": None}
+_tables_lock = threading.Lock()
+
+# this function computes rolling form, rest days and head-to-head for every row of the game log
+def build_team_form_table(df: pd.DataFrame, n: int = FORM_GAMES, meetings: int = H2H_MEETINGS) -> dict:
+    """
+    Every array is aligned with df's rows, and each value is "as of the end of
+    that game": form is the mean of the team's last n games up to and including
+    it, h2h is the team's win rate over its last `meetings` games against that
+    opponent including it, and rest_days is how many days the team rested
+    before it (0 for its first game).
+    """
+    index = get_game_log_index(df)
+    # stable sort by date, same order the game log index uses
+    order = np.argsort(index["dates"], kind="stable")
+
+    # a small frame in date order holding only what the rolling pass needs, indexed by df position
+    work = pd.DataFrame({
+        "NAME": df["TEAM KEY"].to_numpy()[order],
+        "TEAM ABBR": df["TEAM ABBR"].to_numpy()[order],
+        "OPP ABBR": df["OPP ABBR"].to_numpy()[order],
+        "GAME DATE": index["dates"][order],
+        "WIN": pd.to_numeric(df["WIN"], errors="coerce").to_numpy(dtype=float)[order],
+        **{stat: pd.to_numeric(df[stat], errors="coerce").to_numpy(dtype=float)[order] for stat in FORM_STATS},
+    }, index=order)
+
+    # rolling last-n means per team name (min_periods=1 so early games average what exists)
+    form = (
+        work.groupby("NAME", sort=False)[FORM_STATS]
+        .rolling(n, min_periods=1).mean()
+        .reset_index(level=0, drop=True)
+    )
+    # rolling win rate per (team, opponent) pair
+    h2h = (
+        work.groupby(["TEAM ABBR", "OPP ABBR"], sort=False)["WIN"]
+        .rolling(meetings, min_periods=1).mean()
+        .reset_index(level=[0, 1], drop=True)
+    )
+    # full days since the team's previous game
+    day = work["GAME DATE"].dt.normalize()
+    rest = (day - day.groupby(work["TEAM ABBR"], sort=False).shift()).dt.days.fillna(0)
+
+    # back to df row order, stored as plain column arrays
+    positions = np.arange(len(df))
+    return {
+        "n": n,
+        "meetings": meetings,
+        "form": form.reindex(positions).to_numpy(dtype=float),
+        "h2h": h2h.reindex(positions).to_numpy(dtype=float),
+        "rest_days": rest.reindex(positions).to_numpy(dtype=np.int16),
+    }
+
+# this function returns the form table for df, building it once per loaded game log (with the blend settings' window)
+def get_team_form_table(df: pd.DataFrame) -> dict:
+    if _tables["df"] is df:
+        return _tables["table"]
+
+    with _tables_lock:
+        if _tables["df"] is not df:
+            _tables["table"] = build_team_form_table(df, blend_settings["form_games"], blend_settings["h2h_meetings"])
+            _tables["df"] = df
+        return _tables["table"]
+
+# this function returns the last position in a date sorted group strictly before as_of (or the last one if as_of is None)
+def _position_before(dates: np.ndarray, positions, as_of=None):
+    if positions is None or len(positions) == 0:
+        return None
+    if as_of is None:
+        return positions[-1]
+    cut = np.searchsorted(dates[positions], np.datetime64(as_of), side="left")
+    return positions[cut - 1] if cut > 0 else None
+
+# this function returns a team's last n game averages (plus its abbreviation) before as_of, or None if it has no games
+def get_team_form(df: pd.DataFrame, team_name: str, as_of: pd.Timestamp = None):
+    index = get_game_log_index(df)
+    pos = _position_before(index["dates"], index["by_name"].get((team_name or "").strip().lower()), as_of)
+    if pos is None:
+        return None
+
+    averages = dict(zip(FORM_STATS, get_team_form_table(df)["form"][pos].tolist()))
+    averages["TEAM ABBR"] = df["TEAM ABBR"].iat[pos]
+    return averages
+
+# this function returns team_abbr's win rate over its last meetings with opp_abbr before as_of (50% if they never met)
+def get_head_to_head_win_rate(df: pd.DataFrame, team_abbr: str, opp_abbr: str, as_of: pd.Timestamp = None) -> float:
+    index = get_game_log_index(df)
+    key = ((team_abbr or "").upper(), (opp_abbr or "").upper())
+    pos = _position_before(index["dates"], index["by_matchup"].get(key), as_of)
+    if pos is None:
+        return 0.5
+    return float(get_team_form_table(df)["h2h"][pos])
+
+# this function returns how many full days before as_of the team last played (0 if it never did)
+def get_rest_days(df: pd.DataFrame, team_abbr: str, as_of: pd.Timestamp) -> int:
+    index = get_game_log_index(df)
+    pos = _position_before(index["dates"], index["by_abbr"].get((team_abbr or "").upper()), as_of)
+    if pos is None:
+        return 0
+    return int((as_of.normalize() - pd.Timestamp(index["dates"][pos]).normalize()).days)
+
+# this function returns every team's latest form as a frame indexed by lowercase team name
+def get_latest_team_forms(df: pd.DataFrame) -> pd.DataFrame:
+    index = get_game_log_index(df)
+    names = list(index["by_name"])
+    last = np.array([index["by_name"][name][-1] for name in names], dtype=np.intp)
+    forms = pd.DataFrame(get_team_form_table(df)["form"][last], index=names, columns=FORM_STATS)
+    forms["TEAM ABBR"] = df["TEAM ABBR"].to_numpy()[last]
+    return forms
+
+# this function returns every (team, opponent) pair's latest head-to-head win rate
+def get_latest_head_to_head(df: pd.DataFrame) -> pd.Series:
+    index = get_game_log_index(df)
+    pairs = list(index["by_matchup"])
+    last = np.array([index["by_matchup"][pair][-1] for pair in pairs], dtype=np.intp)
+    return pd.Series(get_team_form_table(df)["h2h"][last], index=pd.MultiIndex.from_tuples(pairs, names=["TEAM ABBR", "OPP ABBR"]))
@@ -1,5 +1,5 @@
-# import list of nba teams
-from nba_api.stats.static import teams
+# import the shared team registry
+from team_registry import find_team
 # import game finder to find specific games between two teams
 from nba_api.stats.endpoints import leaguegamefinder
 # import pandas to work with tabular data
@@ -9,16 +9,9 @@ from datetime import datetime
 
 # this function will find the teams name
 def find_team_id(team_name):
-    # search for teams matching the given input
-    all_teams = teams.get_teams()
-
-    # iterate through all team names
-    for team in all_teams:
-        # if the team name inputted matches the team name found, return the team name
-        if team_name.lower() in team['full_name'].lower():
-            return team
-    # otherwise return none
-    return None
+    # look the team up in the shared registry (full name, nickname, abbreviation or partial name)
+    # returns none if nothing matches
+    return find_team(team_name)
 
 # this function returns the last 5 games for each inputted team separartely
 def get_recent_games(team_id, num_games = 5):
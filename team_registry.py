@@ -0,0 +1,65 @@
+# import MappingProxyType so nobody can change the shared team records
+from types import MappingProxyType
+# import list of nba teams
+from nba_api.stats.static import teams
+
+# this function turns team name into images/team_name_logo.png
+def _logo_filename_for(team_name: str) -> str:
+    return f"images/{team_name.lower().replace(' ', '_')}_logo.png"
+
+# this function builds one read-only team record (nba_api fields + precomputed logo)
+def _make_record(team: dict):
+    record = dict(team)
+    record["logo_filename"] = _logo_filename_for(team["full_name"])
+    return MappingProxyType(record)
+
+# every team, built once at import time
+TEAMS = tuple(_make_record(t) for t in teams.get_teams())
+
+# lookups by id, abbreviation (upper), full name (lower) and nickname (lower)
+TEAMS_BY_ID = MappingProxyType({t["id"]: t for t in TEAMS})
+TEAMS_BY_ABBR = MappingProxyType({t["abbreviation"].upper(): t for t in TEAMS})
+TEAMS_BY_FULL_NAME = MappingProxyType({t["full_name"].lower(): t for t in TEAMS})
+TEAMS_BY_NICKNAME = MappingProxyType({t["nickname"].lower(): t for t in TEAMS})
+
+# logo file for every name we know a team by (full name plus "City Nickname" as the schedule spells it)
+_LOGOS_BY_NAME = MappingProxyType({
+    **{t["full_name"].lower(): t["logo_filename"] for t in TEAMS},
+    **{f"{t['city']} {t['nickname']}".lower(): _logo_filename_for(f"{t['city']} {t['nickname']}") for t in TEAMS},
+})
+
+# this function returns the team for an id (or None)
+def get_team_by_id(team_id):
+    try:
+        return TEAMS_BY_ID.get(int(team_id))
+    except (TypeError, ValueError):
+        return None
+
+# this function returns the team for an abbreviation like "bos" or "BOS" (or None)
+def get_team_by_abbr(abbr: str):
+    return TEAMS_BY_ABBR.get((abbr or "").strip().upper())
+
+# this function returns the team for a full name like "Boston Celtics" (or None)
+def get_team_by_full_name(full_name: str):
+    return TEAMS_BY_FULL_NAME.get((full_name or "").strip().lower())
+
+# this function finds a team from whatever the user typed ("Lakers", "lal", "golden state", ...)
+def find_team(name: str):
+    key = (name or "").strip().lower()
+    if not key:
+        return None
+
+    # exact matches first: full name, nickname, abbreviation
+    team = TEAMS_BY_FULL_NAME.get(key) or TEAMS_BY_NICKNAME.get(key) or TEAMS_BY_ABBR.get(key.upper())
+    if team:
+        return team
+
+    # otherwise the first team whose full name contains the text
+    for team in TEAMS:
+        if key in team["full_name"].lower():
+            return team
+    return None
+
+# this function returns the logo path for a team name, using the precomputed one when we know the team
+def build_logo_filename(team_name: str) -> str:
+    return _LOGOS_BY_NAME.get((team_name or "").strip().lower()) or _logo_filename_for(team_name or "")
@@ -1,20 +1,13 @@
-# import list of nba teams
-from nba_api.stats.static import teams
+# import the shared team registry
+from team_registry import find_team
 # import endpoints to retrieve team stats/info
 from nba_api.stats.endpoints import teamyearbyyearstats, teaminfocommon
 
 # this function will find the teams name
 def find_team_id(team_name):
-    # search for teams matching the given input
-    all_teams = teams.get_teams()
-
-    # iterate through all team names
-    for team in all_teams:
-        # if the team name inputted matches the team name found, return the team name
-        if team_name.lower() in team['full_name'].lower():
-            return team
-    # otherwise return none
-    return None
+    # look the team up in the shared registry (full name, nickname, abbreviation or partial name)
+    # returns none if nothing matches
+    return find_team(team_name)
 
 # this function will find the name of the team using team_name
 def display_team_stats(team_name):
@@ -0,0 +1,103 @@
+# import os to point every cache at a temp folder before the app is imported
+import os
+# import tempfile for that folder
+import tempfile
+# import collections to count upstream calls per endpoint
+from collections import Counter
+# import pytest for fixtures
+import pytest
+# import pandas to build the stub endpoint frames
+import pandas as pd
+
+# keep the tests off the real sqlite cache, history store, player table and rate limiter
+_tmp = tempfile.mkdtemp(prefix="upstream_calls_")
+os.environ["NBA_API_CACHE_PATH"] = os.path.join(_tmp, "nba_api_cache.sqlite")
+os.environ["GAME_HISTORY_DIR"] = os.path.join(_tmp, "game_history")
+os.environ["PLAYER_GAME_LOG_PATH"] = os.path.join(_tmp, "player_game_logs.parquet")
+os.environ["MODEL_REGISTRY_DIR"] = os.path.join(_tmp, "models")
+os.environ["NBA_SCHEDULE_CACHE_PATH"] = os.path.join(_tmp, "schedule_cache.json")
+os.environ["NBA_STATS_MIN_INTERVAL"] = "0"
+
+import app
+import nba_api_cache
+from response_cache import clear_response_cache
+
+PLAYER_ID = 2544
+GAME_ID = "0022500001"
+
+# the frames each stubbed endpoint returns (just the columns the routes read)
+STUB_FRAMES = {
+    "CommonPlayerInfo": pd.DataFrame([{
+        "DISPLAY_FIRST_LAST": "LeBron James", "TEAM_NAME": "Lakers", "TEAM_ID": 1610612747, "TEAM_ABBREVIATION": "LAL",
+        "JERSEY": "23", "POSITION": "Forward", "HEIGHT": "6-9", "WEIGHT": "250", "SCHOOL": None, "LAST_AFFILIATION": "St. Vincent-St. Mary HS (OH)",
+        "COUNTRY": "USA", "BIRTHDATE": "1984-12-30T00:00:00", "SEASON_EXP": 21, "DRAFT_YEAR": "2003", "DRAFT_ROUND": "1", "DRAFT_NUMBER": "1",
+    }]),
+    "PlayerGameLog": pd.DataFrame([{
+        "Team_ID": 1610612747, "GAME_ID": "0022400100", "GAME_DATE": "APR 13, 2025", "MATCHUP": "LAL vs. BOS", "WL": "W", "MIN": 35,
+        "PTS": 28, "REB": 8, "AST": 9, "STL": 1, "BLK": 1, "TOV": 3, "FG3M": 2,
+        "FG_PCT": 0.5, "FG3_PCT": 0.4, "FT_PCT": 0.8, "PLUS_MINUS": 7,
+    }]),
+    "TeamInfoCommon": pd.DataFrame([{
+        "TEAM_CITY": "Boston", "TEAM_CONFERENCE": "East", "TEAM_DIVISION": "Atlantic", "CONF_RANK": 2, "DIV_RANK": 1,
+    }]),
+    "CommonTeamRoster": pd.DataFrame([{
+        "PLAYER_ID": 1628369, "PLAYER": "Jayson Tatum", "NUM": "0", "POSITION": "F", "HEIGHT": "6-8", "WEIGHT": "210",
+        "BIRTH_DATE": "MAR 03, 1998", "AGE": 27.0, "EXP": "7", "SCHOOL": "Duke",
+    }]),
+}
+
+# the scheduled game the player routes look up
+STUB_GAME = {
+    "game_id": GAME_ID, "home_abbr": "LAL", "away_abbr": "BOS", "home_full": "Los Angeles Lakers", "away_full": "Boston Celtics",
+    "date_et": "2025-10-22", "time_et_text": "7:30 PM ET", "arena": "Crypto.com Arena", "notes": "",
+}
+
+# this function returns a stub endpoint class that records every call it gets instead of going to stats.nba.com
+def stub_endpoint(name: str, calls: list):
+    class StubEndpoint:
+        def __init__(self, **params):
+            calls.append((name, tuple(sorted(params.items()))))
+
+        def get_data_frames(self):
+            return [STUB_FRAMES[name].copy()]
+    return StubEndpoint
+
+# this fixture stubs every endpoint, turns off the sqlite hits (so only the per-request memo can save a call)
+# and returns the list the stubs record their calls in
+@pytest.fixture
+def upstream_calls(monkeypatch):
+    calls = []
+    for name, (_, ttl_for) in list(nba_api_cache.ENDPOINTS.items()):
+        monkeypatch.setitem(nba_api_cache.ENDPOINTS, name, (stub_endpoint(name, calls), ttl_for))
+    monkeypatch.setattr(nba_api_cache, "_read_cached", lambda endpoint, key: None)
+    monkeypatch.setattr(app, "find_game_in_schedule", lambda game_id, timeout=6.0: dict(STUB_GAME) if game_id == GAME_ID else None)
+    monkeypatch.setattr(app, "get_upcoming_games", lambda team_abbr, n=5: [])
+    monkeypatch.setattr(app, "has_player_game_logs", lambda: False)
+    monkeypatch.setattr(app, "get_player_last_n_vs_opponent_logs", lambda *args, **kwargs: None)
+    clear_response_cache()
+    return calls
+
+# each route's expected upstream calls per endpoint: one per distinct (endpoint, parameters) the page needs
+@pytest.mark.parametrize("path, expected", [
+    # profile + averages (5 seasons) + recent games (2 seasons x 2 season types); CommonPlayerInfo used to go out 3 times
+    (f"/player_stats/{PLAYER_ID}", {"CommonPlayerInfo": 1, "PlayerGameLog": 9}),
+    # name + team, then 3 seasons x 2 season types vs the opponent; CommonPlayerInfo used to go out 2 times
+    (f"/player_game/{PLAYER_ID}/{GAME_ID}", {"CommonPlayerInfo": 1, "PlayerGameLog": 6}),
+    (f"/api/player_predict/{PLAYER_ID}/{GAME_ID}", {"CommonPlayerInfo": 1, "PlayerGameLog": 6}),
+    ("/team/BOS", {"TeamInfoCommon": 1, "CommonTeamRoster": 1}),
+])
+def test_route_upstream_calls(upstream_calls, path, expected):
+    response = app.app.test_client().get(path)
+    assert response.status_code == 200
+
+    per_endpoint = Counter(name for name, _ in upstream_calls)
+    assert dict(per_endpoint) == expected
+    # no (endpoint, parameters) pair went upstream twice in one request
+    assert len(set(upstream_calls)) == len(upstream_calls)
+
+# the memo only lives for one request: a second request makes its own calls
+def test_memo_is_per_request(upstream_calls):
+    client = app.app.test_client()
+    client.get(f"/player_game/{PLAYER_ID}/{GAME_ID}")
+    client.get(f"/player_game/{PLAYER_ID}/{GAME_ID}")
+    assert Counter(name for name, _ in upstream_calls)["CommonPlayerInfo"] == 2
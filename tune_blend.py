@@ -0,0 +1,137 @@
+# import os for the core count
+import os
+# import sys to read an optional csv path from the command line
+import sys
+# import json to write the best configuration
+import json
+# import time to stamp the config and time the search
+import time
+# import itertools to build the weight grid
+import itertools
+# import a process pool so candidates run on every core
+from concurrent.futures import ProcessPoolExecutor
+# import pandas to work with tabular data
+import pandas as pd
+# import the shared game log loader
+from game_log_store import get_game_log
+# import the walk-forward backtester pieces
+from backtest import (
+    BACKTEST_CSV, REFIT_DAYS, build_pregame_games, fit_walk_forward_models,
+    add_walk_forward_model_probabilities, sweep_blend_weights, evaluate_blend,
+)
+# import the current blend so the report can compare against it
+from prediction_blend import BLEND_CONFIG_PATH, blend_weights, blend_settings
+# import the shared atomic writer for the config file
+from atomic_write import atomic_write_text
+
+# the search space (the form window and meetings change the features, the rest is a vectorized sweep)
+TUNE_WINDOWS = [5, 7, 10, 12, 15, 20]
+TUNE_MEETINGS = [2, 4, 6, 8, 10]
+TUNE_REST_BUMPS = [0.0, 0.01, 0.02, 0.03]
+TUNE_WEIGHTS = {
+    "model": [0.6, 0.7, 0.8, 0.9],
+    "h2h": [0.0, 0.05, 0.1, 0.15, 0.2, 0.25, 0.3],
+    "home_court": [0.0, 0.05, 0.1, 0.15, 0.2, 0.25, 0.3],
+    "rest": [0.0, 0.05, 0.1, 0.15, 0.2],
+}
+# the last season is held out: candidates are ranked on the seasons before it and the winner is reported on it
+TUNE_HOLDOUT_SEASONS = 1
+
+# this keeps what every candidate in a worker process shares: the game log and the walk-forward models
+_worker = {"csv_path": None, "models": None}
+
+# this function sets up a worker process once (the models are pickled to each worker one time, not per task)
+def _init_worker(csv_path: str, models: list) -> None:
+    _worker["csv_path"] = csv_path
+    _worker["models"] = models
+
+# this function returns every weight set in the grid
+def build_weight_sets() -> list:
+    keys = list(TUNE_WEIGHTS)
+    return [dict(zip(keys, values)) for values in itertools.product(*(TUNE_WEIGHTS[k] for k in keys))]
+
+# this function returns the pre-game table for every meetings setting of one form window
+def _games_for_window(df: pd.DataFrame, n: int, meetings_list: list) -> dict:
+    # the model probabilities only depend on the form window, so score them once and reuse them
+    base = add_walk_forward_model_probabilities(df, build_pregame_games(df, n, meetings_list[0]), models=_worker["models"])
+    games = {meetings_list[0]: base}
+    for meetings in meetings_list[1:]:
+        # only head-to-head changes between meetings settings (same games in the same order)
+        games[meetings] = base.assign(H2H_HOME=build_pregame_games(df, n, meetings)["H2H_HOME"].to_numpy())
+    return games
+
+# this function scores every meetings / rest bump / weight candidate for one form window (runs in a worker)
+def _tune_window(n: int, meetings_list: list, rest_bumps: list, weight_sets: list, tune_seasons: list) -> list:
+    df = get_game_log(_worker["csv_path"])
+    results = []
+    for meetings, games in _games_for_window(df, n, meetings_list).items():
+        tune_games = games[games["SEASON"].isin(tune_seasons)]
+        for bump in rest_bumps:
+            best = sweep_blend_weights(tune_games, weight_sets, bump).iloc[0]
+            results.append({
+                "form_games": n,
+                "h2h_meetings": meetings,
+                "rest_bump_per_day": bump,
+                "weights": {key: float(best[key]) for key in blend_weights},
+                "accuracy": float(best["accuracy"]),
+                "log_loss": float(best["log_loss"]),
+                "brier": float(best["brier"]),
+            })
+    return results
+
+# this function searches every candidate on a process pool and returns them best first (lowest log-loss)
+def tune(csv_path: str = BACKTEST_CSV, workers: int = None) -> tuple:
+    df = get_game_log(csv_path)
+
+    # fit the walk-forward models once; the games (and so the refit blocks) are the same for every candidate
+    games = build_pregame_games(df)
+    models = fit_walk_forward_models(df, games["GAME DATE"].to_numpy(), REFIT_DAYS)
+
+    seasons = sorted(games["SEASON"].unique())
+    tune_seasons = seasons[:-TUNE_HOLDOUT_SEASONS] if len(seasons) > TUNE_HOLDOUT_SEASONS else seasons
+    weight_sets = build_weight_sets()
+
+    results = []
+    with ProcessPoolExecutor(max_workers=workers or os.cpu_count(), initializer=_init_worker, initargs=(csv_path, models)) as pool:
+        futures = [pool.submit(_tune_window, n, TUNE_MEETINGS, TUNE_REST_BUMPS, weight_sets, tune_seasons) for n in TUNE_WINDOWS]
+        for future in futures:
+            results.extend(future.result())
+    results.sort(key=lambda r: r["log_loss"])
+    return results, models, tune_seasons
+
+# this function returns the per season report for one configuration (reusing the walk-forward models)
+def report_for(df: pd.DataFrame, models: list, config: dict) -> pd.DataFrame:
+    games = add_walk_forward_model_probabilities(df, build_pregame_games(df, config["form_games"], config["h2h_meetings"]), models=models)
+    return evaluate_blend(games, config["weights"], config["rest_bump_per_day"])
+
+# this function writes the winning configuration where api_predict loads it from
+def write_blend_config(config: dict, path: str = BLEND_CONFIG_PATH) -> None:
+    atomic_write_text(path, json.dumps(config, indent=2))
+
+if __name__ == "__main__":
+    csv_path = sys.argv[1] if len(sys.argv) > 1 else BACKTEST_CSV
+
+    start = time.perf_counter()
+    results, models, tune_seasons = tune(csv_path)
+    candidates = len(results) * len(build_weight_sets())
+    print(f"searched {candidates} candidates on {os.cpu_count()} cores in {time.perf_counter() - start:.1f}s")
+
+    best = results[0]
+    current = {"weights": dict(blend_weights), **blend_settings}
+    df = get_game_log(csv_path)
+    print("\ncurrent configuration:")
+    print(report_for(df, models, current).round(4).to_string())
+    best_report = report_for(df, models, best)
+    print(f"\nbest configuration (ranked on {', '.join(tune_seasons)}): {json.dumps({k: best[k] for k in ('form_games', 'h2h_meetings', 'rest_bump_per_day', 'weights')})}")
+    print(best_report.round(4).to_string())
+
+    write_blend_config({
+        "form_games": best["form_games"],
+        "h2h_meetings": best["h2h_meetings"],
+        "rest_bump_per_day": best["rest_bump_per_day"],
+        "weights": best["weights"],
+        "tuned_on": list(tune_seasons),
+        "metrics": best_report.to_dict(orient="index"),
+        "tuned_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+    })
+    print(f"\nwrote {BLEND_CONFIG_PATH}")
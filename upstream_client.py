@@ -0,0 +1,237 @@
+# import os for env config
+import os
+# import sys for the benchmark's request count
+import sys
+# import time for the benchmark
+import time
+# import asyncio for the background event loop that schedules every upstream call
+import asyncio
+# import threading to run the event loop off the web workers and to guard shared state
+import threading
+# import functools to hand blocking calls with arguments to the io threads
+import functools
+# import concurrent.futures for the io thread pool and the bridge's timeout error
+import concurrent.futures
+# import urlparse to find the host a url belongs to
+from urllib.parse import urlparse
+# import requests for the pooled keep-alive session
+import requests
+from requests.adapters import HTTPAdapter
+
+# how long a web worker waits on one upstream call, queueing included, before giving up (seconds);
+# nba_api calls get it as their socket timeout too, so an abandoned call doesn't hold its slot much longer
+UPSTREAM_TIMEOUT = float(os.environ.get("UPSTREAM_TIMEOUT", 10))
+# threads that actually sit on sockets (never more per host than its limit below)
+UPSTREAM_IO_WORKERS = int(os.environ.get("UPSTREAM_IO_WORKERS", 16))
+# max simultaneous calls to stats.nba.com from this process (this client is the only place it is enforced)
+NBA_STATS_MAX_CONCURRENCY = int(os.environ.get("NBA_STATS_MAX_CONCURRENCY", 4))
+# min seconds between the start of two stats.nba.com calls (0 turns rate limiting off)
+NBA_STATS_MIN_INTERVAL = float(os.environ.get("NBA_STATS_MIN_INTERVAL", 0.1))
+# max calls in flight per host, anything else waits its turn on the event loop (not in a web worker's thread pool)
+UPSTREAM_HOST_LIMITS = {
+    "stats.nba.com": NBA_STATS_MAX_CONCURRENCY,
+    "cdn.nba.com": 8,
+}
+UPSTREAM_DEFAULT_HOST_LIMIT = int(os.environ.get("UPSTREAM_DEFAULT_HOST_LIMIT", 8))
+# min seconds between the start of two calls to a host (hosts not listed aren't rate limited)
+UPSTREAM_HOST_MIN_INTERVALS = {
+    "stats.nba.com": NBA_STATS_MIN_INTERVAL,
+}
+
+# counters per host: calls that went out, callers that shared someone else's call, errors and bridge timeouts
+# {"stats.nba.com": {"calls": 0, "coalesced": 0, "errors": 0, "timeouts": 0}, ...}
+upstream_client_stats = {}
+_stats_lock = threading.Lock()
+
+# the event loop thread, io threads and http session, created on first use
+_state = {"loop": None, "executor": None, "session": None}
+_state_lock = threading.Lock()
+
+# these are only touched from the event loop thread, so they need no lock
+# {key: asyncio.Task} for calls in flight, {host: asyncio.Semaphore}, {host: loop time the next call may start}
+_inflight = {}
+_host_semaphores = {}
+_host_next_start = {}
+
+# this function counts an event for a host
+def _count(host: str, kind: str) -> None:
+    with _stats_lock:
+        counters = upstream_client_stats.setdefault(host, {"calls": 0, "coalesced": 0, "errors": 0, "timeouts": 0})
+        counters[kind] += 1
+
+# this function returns the counters per host
+def get_upstream_client_stats() -> dict:
+    with _stats_lock:
+        return {host: dict(counters) for host, counters in upstream_client_stats.items()}
+
+# this function returns the host a url points at (used as the concurrency group)
+def host_of(url: str) -> str:
+    return urlparse(url).hostname or url
+
+# this function returns the shared keep-alive session (one connection pool per host, sized to the io threads)
+def get_http_session() -> requests.Session:
+    session = _state["session"]
+    if session is None:
+        with _state_lock:
+            session = _state["session"]
+            if session is None:
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=16, pool_maxsize=UPSTREAM_IO_WORKERS)
+                session.mount("https://", adapter)
+                session.mount("http://", adapter)
+                _state["session"] = session
+    return session
+
+# this function makes nba_api send its requests through the shared session instead of opening a new connection each call
+def install_nba_api_session() -> None:
+    from nba_api.stats.library.http import NBAStatsHTTP
+    NBAStatsHTTP.set_session(get_http_session())
+
+# this function returns the background event loop, starting its thread (and the io threads) the first time
+def get_upstream_loop() -> asyncio.AbstractEventLoop:
+    loop = _state["loop"]
+    if loop is not None:
+        return loop
+    with _state_lock:
+        if _state["loop"] is None:
+            loop = asyncio.new_event_loop()
+            _state["executor"] = concurrent.futures.ThreadPoolExecutor(max_workers=UPSTREAM_IO_WORKERS, thread_name_prefix="upstream")
+            threading.Thread(target=loop.run_forever, name="upstream-loop", daemon=True).start()
+            _state["loop"] = loop
+        return _state["loop"]
+
+# this function returns the semaphore that caps calls in flight to host (event loop thread only)
+def _host_semaphore(host: str) -> asyncio.Semaphore:
+    semaphore = _host_semaphores.get(host)
+    if semaphore is None:
+        semaphore = asyncio.Semaphore(UPSTREAM_HOST_LIMITS.get(host, UPSTREAM_DEFAULT_HOST_LIMIT))
+        _host_semaphores[host] = semaphore
+    return semaphore
+
+# this coroutine waits until host's rate limit lets another call start (event loop thread only, no thread is held)
+async def _wait_for_host_interval(host: str) -> None:
+    interval = UPSTREAM_HOST_MIN_INTERVALS.get(host, 0)
+    if interval <= 0:
+        return
+    now = asyncio.get_running_loop().time()
+    start = max(now, _host_next_start.get(host, 0.0))
+    _host_next_start[host] = start + interval
+    if start > now:
+        await asyncio.sleep(start - now)
+
+# this function runs one blocking call on the io threads once host has a free slot (and its rate limit allows it)
+async def _run_upstream(host: str, fn, args: tuple):
+    async with _host_semaphore(host):
+        await _wait_for_host_interval(host)
+        _count(host, "calls")
+        try:
+            return await asyncio.get_running_loop().run_in_executor(_state["executor"], functools.partial(fn, *args))
+        except Exception:
+            _count(host, "errors")
+            raise
+
+# this coroutine runs fn(*args) against host, sharing one call between everyone asking for the same key at the same time
+async def call_async(key, host: str, fn, *args):
+    """
+    fn is a blocking function (an nba_api endpoint, a requests call); it runs on
+    the io threads with at most UPSTREAM_HOST_LIMITS[host] in flight. Callers with
+    the same key while it runs get its result (or its exception) instead of a new
+    call; key=None never coalesces. Can be awaited from any event loop.
+    """
+    loop = get_upstream_loop()
+    if asyncio.get_running_loop() is not loop:
+        # awaited from another loop (ex. an async flask view): hop over to ours
+        return await asyncio.wrap_future(asyncio.run_coroutine_threadsafe(call_async(key, host, fn, *args), loop))
+
+    task = _inflight.get(key) if key is not None else None
+    if task is not None:
+        _count(host, "coalesced")
+    else:
+        task = loop.create_task(_run_upstream(host, fn, args))
+        if key is not None:
+            _inflight[key] = task
+            task.add_done_callback(lambda _: _inflight.pop(key, None))
+    # shield so a caller that gives up (timeout) doesn't cancel the call for everyone else sharing it
+    return await asyncio.shield(task)
+
+# this function is the sync bridge: runs call_async on the background loop and waits up to timeout seconds for it
+def call(key, host: str, fn, *args, timeout: float = None):
+    future = asyncio.run_coroutine_threadsafe(call_async(key, host, fn, *args), get_upstream_loop())
+    try:
+        return future.result(timeout=UPSTREAM_TIMEOUT if timeout is None else timeout)
+    except concurrent.futures.TimeoutError:
+        _count(host, "timeouts")
+        # frees this worker; the upstream call itself finishes (or times out) on its io thread
+        future.cancel()
+        raise TimeoutError(f"upstream call to {host} timed out") from None
+
+# this function GETs a url through the shared session (identical concurrent GETs share one response)
+def http_get(url: str, headers: dict = None, timeout: float = 10.0) -> requests.Response:
+    key = ("GET", url, tuple(sorted((headers or {}).items())))
+    return call(key, host_of(url), _session_get, url, headers, timeout, timeout=timeout + 1)
+
+# this function is the blocking GET run on the io threads (reads the whole body before the connection goes back to the pool)
+def _session_get(url: str, headers: dict, timeout: float) -> requests.Response:
+    resp = get_http_session().get(url, headers=headers, timeout=timeout)
+    resp.content
+    return resp
+
+# quick benchmark against a local http stub with artificial latency
+if __name__ == "__main__":
+    from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+    latency = {"seconds": 0.2}
+    clients = int(sys.argv[1]) if len(sys.argv) > 1 else 64
+    stub_hits = {"count": 0}
+    stub_lock = threading.Lock()
+
+    class StubHandler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+        disable_nagle_algorithm = True
+
+        def do_GET(self):
+            with stub_lock:
+                stub_hits["count"] += 1
+            time.sleep(latency["seconds"])
+            body = b'{"ok": true}'
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    ThreadingHTTPServer.request_queue_size = 256
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base = f"http://127.0.0.1:{server.server_address[1]}"
+    UPSTREAM_HOST_LIMITS["127.0.0.1"] = 8
+
+    def run(label, fn, urls, workers):
+        stub_hits["count"] = 0
+        start = time.perf_counter()
+        with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as web_workers:
+            results = list(web_workers.map(fn, urls))
+        elapsed = time.perf_counter() - start
+        assert all(r.status_code == 200 for r in results)
+        print(f"{label:44s} {elapsed:5.2f}s  {len(urls) / elapsed:7.1f} req/s  {stub_hits['count']} upstream hits")
+
+    plain_get = lambda u: requests.get(u, timeout=10)
+    print(f"{clients} concurrent web requests, stub latency {latency['seconds']}s")
+    same = [f"{base}/schedule"] * clients
+    run("plain requests.get, same url", plain_get, same, clients)
+    run("client, same url (coalesced)", http_get, same, clients)
+    distinct = [f"{base}/player/{i}" for i in range(clients)]
+    run("plain requests.get, distinct urls", plain_get, distinct, clients)
+    run("client, distinct urls (8 in flight per host)", http_get, distinct, clients)
+
+    # connection reuse: no latency, one web worker, so the cost is connecting
+    latency["seconds"] = 0.0
+    print(f"\n{clients * 4} sequential requests, no stub latency")
+    sequential = [f"{base}/team/{i}" for i in range(clients * 4)]
+    run("plain requests.get (new connection each)", plain_get, sequential, 1)
+    run("client (pooled keep-alive)", http_get, sequential, 1)
+    print()
+    print(get_upstream_client_stats())